@@ -63,9 +63,19 @@ def main() -> None:
     )
     parser.add_argument(
         "command",
-        choices=["clean", "eda", "models", "all", "play", "train", "ui"],
+        choices=["clean", "eda", "models", "all", "play", "train", "ui", "serve", "bench"],
         help="Which step to run",
     )
+    parser.add_argument("--host", default="127.0.0.1", help="serve: bind address")
+    parser.add_argument("--port", type=int, default=8000, help="serve: port")
+    parser.add_argument("--journal", action="store_true", help="serve: journal sessions to sessions/<id>/")
+    parser.add_argument("--store", default=None, help="serve: SQLite file for idle sessions, or 'memory' to keep all in memory")
+    parser.add_argument("--timesteps", type=int, default=5000, help="train: PPO timesteps")
+    parser.add_argument("--n-envs", type=int, default=None, help="train: parallel envs (default 16 numpy, one per CPU subproc, 1 dummy)")
+    parser.add_argument("--vec-backend", choices=["numpy", "dummy", "subproc"], default="numpy", help="train: how envs are stepped")
+    parser.add_argument("--seed", type=int, default=None, help="train: base seed; env i gets seed + i")
+    parser.add_argument("--update-baseline", action="store_true", help="bench: store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="bench: fail when a metric regresses by more than this fraction")
     args = parser.parse_args()
 
     if args.command == "clean":
@@ -84,11 +94,20 @@ def main() -> None:
     elif args.command == "train":
         # short PPO training run as a placeholder
         from src.rl.train_ppo import train_ppo
-        train_ppo(total_timesteps=5000)
+        train_ppo(total_timesteps=args.timesteps, n_envs=args.n_envs, vec_backend=args.vec_backend, seed=args.seed)
     elif args.command == "ui":
         # Launch Streamlit UI
         import subprocess
         subprocess.run([sys.executable, "-m", "streamlit", "run", os.path.join(REPO_ROOT, "src", "ui", "app.py")])
+    elif args.command == "serve":
+        # Headless asyncio HTTP/WebSocket game server
+        from src.server.api import serve
+        serve(args.host, args.port, journal=args.journal, store=args.store)
+    elif args.command == "bench":
+        cmd = [sys.executable, os.path.join(REPO_ROOT, "src", "tools", "bench_suite.py"), "--threshold", str(args.threshold)]
+        if args.update_baseline:
+            cmd.append("--update-baseline")
+        run_step("Benchmark suite", cmd)
 
 
 if __name__ == "__main__":
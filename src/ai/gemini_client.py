@@ -1,53 +1,89 @@
 import os
-from typing import Optional
+from typing import Iterator, Optional
 
+from .llm_client import get_client
+from .narration_cache import fingerprint, get_cache
 
-_client = None
-_model = None
 
+# Per-request deadline handed to the API; callers may enforce a stricter one
+DM_REPLY_TIMEOUT_S = float(os.environ.get("DM_REPLY_TIMEOUT_S", "10"))
 
-def _init_client():
-    global _client, _model
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        return None
-    try:
-        import google.generativeai as genai
-        genai.configure(api_key=api_key)
-        _client = genai
-        _model = genai.GenerativeModel("gemini-1.5-flash")
-        return _model
-    except Exception:
-        return None
 
+SYSTEM_PROMPT = (
+    "You are an AI Dungeon Master. Keep responses concise (2-5 sentences), descriptive, and actionable. "
+    "Respect world state and intent guidance. If combat is ongoing, keep turns tight. Avoid meta-talk. "
+    "Tone follows the monster alignment: evil -> aggressive; neutral -> cautious; good -> measured and fair."
+)
 
-def generate_dm_reply(state_summary: str, user_input: str, intent: str, monster_alignment: Optional[str]) -> Optional[str]:
-    global _model
-    if _model is None:
-        _model = _init_client()
-    if _model is None:
-        return None
 
-    system_prompt = (
-        "You are an AI Dungeon Master. Keep responses concise (2-5 sentences), descriptive, and actionable. "
-        "Respect world state and intent guidance. If combat is ongoing, keep turns tight. Avoid meta-talk."
-    )
-    guidance = (
-        f"Intent: {intent}. "
-        f"Monster alignment (if any): {monster_alignment or 'unknown'}. "
-        "Tone: If alignment is evil -> aggressive; neutral -> cautious; good -> measured and fair."
-    )
-    prompt = (
+def _build_prompt(state_summary: str, user_input: str, intent: str, monster_alignment: Optional[str]) -> str:
+    # Only the per-turn part; SYSTEM_PROMPT goes out as the system prefix
+    return (
         f"World State: {state_summary}\n"
         f"Player: {user_input}\n"
-        f"Guidance: {guidance}\n"
+        f"Intent: {intent}. Monster alignment: {monster_alignment or 'unknown'}.\n"
         "DM:"
     )
+
+
+def generate_dm_reply(
+    state_summary: str,
+    user_input: str,
+    intent: str,
+    monster_alignment: Optional[str],
+    timeout: Optional[float] = None,
+) -> Optional[str]:
+    client = get_client()
+    if client is None:
+        return None
+
+    # state_summary already carries location, flags and party, so it doubles as the state part of the key
+    cache = get_cache()
+    key = fingerprint(user_input.strip(), location=state_summary, intent=intent, extra=monster_alignment or "")
+    cached = cache.get(key)
+    if cached:
+        return cached
+
+    prompt = _build_prompt(state_summary, user_input, intent, monster_alignment)
     try:
-        resp = _model.generate_content([system_prompt, prompt])
-        text = resp.text.strip()
-        return text
+        text = client.generate(prompt, timeout=DM_REPLY_TIMEOUT_S if timeout is None else timeout, system=SYSTEM_PROMPT).strip()
     except Exception:
         return None
+    if text:
+        cache.put(key, text)
+    return text or None
+
 
+def stream_dm_reply(
+    state_summary: str,
+    user_input: str,
+    intent: str,
+    monster_alignment: Optional[str],
+    timeout: Optional[float] = None,
+) -> Iterator[str]:
+    """Like generate_dm_reply, but yields text chunks as the model streams them.
 
+    Yields nothing when Gemini is unavailable. Only a complete reply is cached.
+    """
+    client = get_client()
+    if client is None:
+        return
+
+    cache = get_cache()
+    key = fingerprint(user_input.strip(), location=state_summary, intent=intent, extra=monster_alignment or "")
+    cached = cache.get(key)
+    if cached:
+        yield cached
+        return
+
+    parts = []
+    prompt = _build_prompt(state_summary, user_input, intent, monster_alignment)
+    try:
+        for chunk in client.stream(prompt, timeout=DM_REPLY_TIMEOUT_S if timeout is None else timeout, system=SYSTEM_PROMPT):
+            parts.append(chunk)
+            yield chunk
+    except Exception:
+        return
+    text = "".join(parts).strip()
+    if text:
+        cache.put(key, text)
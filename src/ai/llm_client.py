@@ -0,0 +1,418 @@
+import http.client
+import json
+import os
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+
+
+Prompt = Union[str, List[str]]
+
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE_S = float(os.environ.get("LLM_BACKOFF_BASE_S", "0.2"))
+LLM_BACKOFF_MAX_S = float(os.environ.get("LLM_BACKOFF_MAX_S", "2.0"))
+LLM_TIMEOUT_S = float(os.environ.get("LLM_TIMEOUT_S", "10"))
+LLM_BREAKER_THRESHOLD = int(os.environ.get("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_COOLDOWN_S = float(os.environ.get("LLM_BREAKER_COOLDOWN_S", "15"))
+
+# google.api_core exception names worth retrying; matched by name so the SDK stays optional
+_TRANSIENT_SDK_ERRORS = {
+    "DeadlineExceeded", "ServiceUnavailable", "ResourceExhausted",
+    "InternalServerError", "TooManyRequests", "GatewayTimeout", "Aborted",
+}
+
+
+class LLMError(Exception):
+    pass
+
+
+class TransientLLMError(LLMError):
+    """Worth retrying: timeouts, dropped connections, 429 and 5xx responses."""
+
+
+class CircuitOpenError(LLMError):
+    """The breaker is open; the backend is not called until the cool-off ends."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, TransientLLMError):
+        return True
+    if isinstance(exc, LLMError):
+        return False
+    if isinstance(exc, (TimeoutError, ConnectionError, http.client.HTTPException, OSError)):
+        return True
+    return type(exc).__name__ in _TRANSIENT_SDK_ERRORS
+
+
+class CircuitBreaker:
+    """closed -> open after `threshold` consecutive transient failures;
+    open -> half-open after `cooldown` seconds, where one trial call decides
+    between closing again and another cool-off."""
+
+    def __init__(self, threshold: int = LLM_BREAKER_THRESHOLD, cooldown: float = LLM_BREAKER_COOLDOWN_S):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return False
+                self.state = "half_open"
+                self._trial = False
+            if self.state == "half_open":
+                if self._trial:
+                    return False
+                self._trial = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    self.opens += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._trial = False
+
+    def abandon(self) -> None:
+        """The call was dropped before it finished (the caller stopped reading); it
+        decides nothing, so a half-open breaker lets the next call be the trial."""
+        with self._lock:
+            self._trial = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at)) if self.state == "open" else 0.0
+            return {"state": self.state, "consecutive_failures": self.failures, "opens": self.opens, "retry_in_s": retry_in}
+
+
+class GeminiBackend:
+    name = "gemini"
+
+    def __init__(self, api_key: str, model: str = "gemini-1.5-flash"):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        self._model_name = model
+        # One model object per system prefix. system_instruction is still sent with every
+        # request: context caching needs a prefix far larger than the narration instructions
+        self._models: Dict[Optional[str], Any] = {}
+
+    def _model(self, system: Optional[str]) -> Any:
+        model = self._models.get(system)
+        if model is None:
+            model = self._genai.GenerativeModel(self._model_name, system_instruction=system)
+            self._models[system] = model
+        return model
+
+    def generate(self, prompt: Prompt, timeout: float, system: Optional[str] = None) -> str:
+        resp = self._model(system).generate_content(prompt, request_options={"timeout": timeout})
+        return resp.text
+
+    def stream(self, prompt: Prompt, timeout: float, system: Optional[str] = None) -> Iterator[str]:
+        resp = self._model(system).generate_content(prompt, stream=True, request_options={"timeout": timeout})
+        for chunk in resp:
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+
+
+class HTTPBackend:
+    """Plain HTTP narration backend (e.g. src/tools/llm_standin.py or a proxy).
+
+    POST <url> with {"system": ..., "prompt": ..., "stream": bool}; `system` is
+    the fixed instruction prefix, identical across calls. A non-streaming reply is
+    {"text": ...}; a streaming reply is newline-delimited {"text": chunk}
+    objects. Keep-alive connections are pooled and reused across sessions.
+    """
+
+    name = "http"
+
+    def __init__(self, url: str, pool_size: int = LLM_MAX_CONCURRENCY):
+        parts = urlsplit(url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if self.https else 80)
+        self.path = parts.path or "/"
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=max(1, pool_size))
+        self._stats = {"connections_created": 0, "connections_reused": 0}
+        self._stats_lock = threading.Lock()  # connections are taken from many narration threads
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _connect(self, timeout: float) -> http.client.HTTPConnection:
+        try:
+            conn = self._idle.get_nowait()
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            self._count("connections_reused")
+            return conn
+        except queue.Empty:
+            pass
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        self._count("connections_created")
+        return cls(self.host, self.port, timeout=timeout)
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _post(self, conn: http.client.HTTPConnection, prompt: Prompt, stream: bool, system: Optional[str]) -> http.client.HTTPResponse:
+        body = json.dumps({"system": system, "prompt": prompt, "stream": stream}).encode("utf-8")
+        conn.request("POST", self.path, body=body, headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        if resp.status != 200:
+            detail = resp.read()[:200].decode("utf-8", "replace")
+            error = TransientLLMError if resp.status == 429 or resp.status >= 500 else LLMError
+            raise error(f"HTTP {resp.status}: {detail}")
+        return resp
+
+    def generate(self, prompt: Prompt, timeout: float, system: Optional[str] = None) -> str:
+        conn = self._connect(timeout)
+        try:
+            resp = self._post(conn, prompt, False, system)
+            text = json.loads(resp.read()).get("text", "")
+        except LLMError:
+            # Error status with its body read in full: the connection is still usable
+            self._release(conn)
+            raise
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn)
+        return text
+
+    def stream(self, prompt: Prompt, timeout: float, system: Optional[str] = None) -> Iterator[str]:
+        conn = self._connect(timeout)
+        done = False
+        try:
+            try:
+                resp = self._post(conn, prompt, True, system)
+            except LLMError:
+                done = True
+                raise
+            for line in resp:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk = json.loads(line).get("text", "")
+                if chunk:
+                    yield chunk
+            done = True
+        finally:
+            if done:
+                self._release(conn)
+            else:
+                conn.close()
+
+
+class LLMClient:
+    """Shared narration client: bounded concurrency, retries with exponential
+    backoff and full jitter, and a circuit breaker in front of one backend."""
+
+    def __init__(
+        self,
+        backend: Any,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE_S,
+        backoff_max: float = LLM_BACKOFF_MAX_S,
+        timeout: float = LLM_TIMEOUT_S,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.backend = backend
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._metrics = {
+            "requests": 0, "successes": 0, "failures": 0, "retries": 0,
+            "rejected_open": 0, "pool_timeouts": 0, "in_flight": 0, "max_in_flight": 0,
+            "latency_s_total": 0.0, "prompt_chars_total": 0, "prompt_chars_last": 0, "system_chars": 0,
+        }
+
+    def _bump(self, key: str, amount: float = 1) -> None:
+        with self._lock:
+            self._metrics[key] += amount
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0.0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _acquire(self, deadline: float) -> None:
+        if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            self._bump("pool_timeouts")
+            raise TransientLLMError("LLM worker pool exhausted")
+        with self._lock:
+            self._metrics["in_flight"] += 1
+            self._metrics["max_in_flight"] = max(self._metrics["max_in_flight"], self._metrics["in_flight"])
+
+    def _release(self) -> None:
+        with self._lock:
+            self._metrics["in_flight"] -= 1
+        self._slots.release()
+
+    def _attempts(self, timeout: Optional[float]) -> Iterator[float]:
+        """Yield the per-attempt timeout; sleeps the backoff between attempts."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                self._bump("rejected_open")
+                raise CircuitOpenError("LLM backend circuit is open")
+            if attempt:
+                self._bump("retries")
+            yield max(0.01, deadline - time.monotonic())
+            delay = self._backoff(attempt)
+            if attempt == self.max_retries or time.monotonic() + delay >= deadline:
+                return
+            time.sleep(delay)
+
+    def _record_prompt(self, prompt: Prompt, system: Optional[str]) -> None:
+        # Per-call size of what changes between calls; the fixed system prefix is tracked apart
+        size = len(prompt) if isinstance(prompt, str) else sum(len(p) for p in prompt)
+        with self._lock:
+            self._metrics["requests"] += 1
+            self._metrics["prompt_chars_total"] += size
+            self._metrics["prompt_chars_last"] = size
+            self._metrics["system_chars"] = len(system or "")
+
+    def generate(self, prompt: Prompt, timeout: Optional[float] = None, system: Optional[str] = None) -> str:
+        self._record_prompt(prompt, system)
+        last: Optional[BaseException] = None
+        started = time.monotonic()
+        for remaining in self._attempts(timeout):
+            self._acquire(time.monotonic() + remaining)
+            try:
+                text = self.backend.generate(prompt, remaining, system)
+            except Exception as exc:
+                if not is_transient(exc):
+                    # The backend answered, it just refused this request
+                    self.breaker.record_success()
+                    self._bump("failures")
+                    raise
+                self.breaker.record_failure()
+                last = exc
+                continue
+            finally:
+                self._release()
+            self.breaker.record_success()
+            self._bump("successes")
+            self._bump("latency_s_total", time.monotonic() - started)
+            return text
+        self._bump("failures")
+        raise TransientLLMError(f"LLM request failed after retries: {last}") from last
+
+    def stream(self, prompt: Prompt, timeout: Optional[float] = None, system: Optional[str] = None) -> Iterator[str]:
+        """Yield chunks; a failure before the first chunk is retried, one after it is raised."""
+        self._record_prompt(prompt, system)
+        last: Optional[BaseException] = None
+        started = time.monotonic()
+        for remaining in self._attempts(timeout):
+            self._acquire(time.monotonic() + remaining)
+            yielded = False
+            try:
+                for chunk in self.backend.stream(prompt, remaining, system):
+                    yielded = True
+                    yield chunk
+            except GeneratorExit:
+                self.breaker.abandon()
+                raise
+            except Exception as exc:
+                if not is_transient(exc):
+                    self.breaker.record_success()
+                    self._bump("failures")
+                    raise
+                self.breaker.record_failure()
+                if yielded:
+                    self._bump("failures")
+                    raise
+                last = exc
+                continue
+            finally:
+                self._release()
+            self.breaker.record_success()
+            self._bump("successes")
+            self._bump("latency_s_total", time.monotonic() - started)
+            return
+        self._bump("failures")
+        raise TransientLLMError(f"LLM stream failed after retries: {last}") from last
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            data: Dict[str, Any] = dict(self._metrics)
+        data["backend"] = getattr(self.backend, "name", type(self.backend).__name__)
+        data["max_concurrency"] = self.max_concurrency
+        data["mean_latency_s"] = data["latency_s_total"] / data["successes"] if data["successes"] else 0.0
+        data["mean_prompt_chars"] = data["prompt_chars_total"] / data["requests"] if data["requests"] else 0.0
+        data["breaker"] = self.breaker.snapshot()
+        data.update(getattr(self.backend, "stats", {}))
+        return data
+
+
+_CLIENT: Optional[LLMClient] = None
+_CLIENT_RESOLVED = False
+_CLIENT_LOCK = threading.Lock()
+
+
+def _make_backend() -> Optional[Any]:
+    url = os.environ.get("NARRATION_BACKEND_URL")
+    if url:
+        return HTTPBackend(url)
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if api_key:
+        try:
+            return GeminiBackend(api_key)
+        except Exception:
+            return None
+    return None
+
+
+def get_client() -> Optional[LLMClient]:
+    """Process-wide client shared by every session; None when no backend is configured."""
+    global _CLIENT, _CLIENT_RESOLVED
+    with _CLIENT_LOCK:
+        if not _CLIENT_RESOLVED:
+            backend = _make_backend()
+            _CLIENT = LLMClient(backend) if backend is not None else None
+            _CLIENT_RESOLVED = True
+        return _CLIENT
+
+
+def reset_client() -> None:
+    """Forget the shared client so the next get_client() re-reads the environment."""
+    global _CLIENT, _CLIENT_RESOLVED
+    with _CLIENT_LOCK:
+        _CLIENT = None
+        _CLIENT_RESOLVED = False
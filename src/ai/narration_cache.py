@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.game.narrative import strip_flavor
+
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("NARRATION_CACHE_SIZE", "512"))
+DEFAULT_TTL = float(os.environ.get("NARRATION_CACHE_TTL", "3600"))
+DEFAULT_VARIETY = int(os.environ.get("NARRATION_CACHE_VARIETY", "3"))
+DEFAULT_DISK_DIR = os.environ.get("NARRATION_CACHE_DIR") or None
+
+
+def fingerprint(
+    action_summary: str,
+    location: str = "",
+    flags: Iterable[str] = (),
+    intent: Optional[str] = None,
+    extra: str = "",
+) -> str:
+    """Stable key for "the same situation": engine outcome without its random
+    flavor, where it happened, which world flags are set and what the player meant."""
+    payload = json.dumps(
+        [strip_flavor(action_summary).lower(), location or "", sorted(flags), intent or "", extra or ""],
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def state_fingerprint(game_state: Dict[str, Any], action_summary: str, intent: Optional[str] = None) -> str:
+    world = game_state.get("world", {}) or {}
+    flags = [name for name, value in (world.get("flags") or {}).items() if value]
+    return fingerprint(action_summary, world.get("location", ""), flags, intent)
+
+
+class NarrationCache:
+    """LRU + TTL cache of LLM narrations with an optional on-disk tier.
+
+    Each key holds up to `variety` narration variants. `get()` misses until
+    that many variants have been collected, then returns one at random, so
+    repeated situations stop costing LLM calls without reading identically.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        variety: int = DEFAULT_VARIETY,
+        disk_dir: Optional[str] = DEFAULT_DISK_DIR,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.variety = max(1, variety)
+        self.disk_dir = disk_dir
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._entries: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "disk_hits": 0, "expired": 0, "evictions": 0, "stores": 0}
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl > 0 and time.time() - created > self.ttl
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _load_disk(self, key: str) -> Optional[Tuple[float, List[str]]]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                data = json.load(f)
+            entry = (float(data["created"]), list(data["variants"]))
+        except (OSError, ValueError, KeyError):
+            return None
+        if self._expired(entry[0]):
+            return None
+        return entry
+
+    def _store_disk(self, key: str, entry: Tuple[float, List[str]]) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"created": entry[0], "variants": entry[1]}, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def _lookup(self, key: str) -> Optional[Tuple[float, List[str]]]:
+        entry = self._entries.get(key)
+        if entry is not None and self._expired(entry[0]):
+            del self._entries[key]
+            self.stats["expired"] += 1
+            entry = None
+        if entry is None:
+            entry = self._load_disk(key)
+            if entry is not None:
+                self.stats["disk_hits"] += 1
+                self._insert(key, entry)
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _insert(self, key: str, entry: Tuple[float, List[str]]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None or len(entry[1]) < self.variety:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            return random.choice(entry[1])
+
+    def put(self, key: str, text: str) -> None:
+        if not text:
+            return
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                entry = (time.time(), [])
+            variants = entry[1]
+            if text not in variants:
+                variants.append(text)
+                del variants[:-self.variety]
+            self._insert(key, entry)
+            self.stats["stores"] += 1
+        self._store_disk(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_CACHE: Optional[NarrationCache] = None
+
+
+def get_cache() -> NarrationCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = NarrationCache()
+    return _CACHE
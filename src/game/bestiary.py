@@ -0,0 +1,189 @@
+import csv
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .spells import TOKEN_RE
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+# The raw file keeps "135 (18d10+36)" style HP and AC that the cleaned CSV drops to NaN
+RAW_MONSTERS_PATH = os.path.join(DATA_DIR, "raw", "Dd5e_monsters.csv")
+CLEAN_MONSTERS_PATH = os.path.join(DATA_DIR, "processed", "Dd5e_monsters_clean.csv")
+
+# Feature weights: a word of the name counts most, creature type and traits less, trigrams
+# only catch near misses ("goblins", "vampiric")
+NAME_WEIGHT = 1.0
+TYPE_WEIGHT = 0.6
+TRAIT_WEIGHT = 0.4
+GRAM_WEIGHT = 0.25
+MIN_SIMILARITY = 0.2  # cosine below this is not a match; the default guardian is used instead
+SEED_CACHE_SIZE = 256
+
+STOP_WORDS = {
+    "a", "an", "the", "of", "and", "or", "in", "on", "at", "to", "by", "with", "under", "over", "from",
+    "into", "its", "his", "her", "their", "is", "are", "who", "that", "this", "any", "race", "ft",
+}
+TRAITS = ("fly", "swim", "burrow", "climb", "hover")
+_NUMBER_RE = re.compile(r"\d+")
+
+
+@dataclass(frozen=True)
+class Monster:
+    name: str
+    size: str
+    kind: str
+    alignment: str
+    hit_points: Optional[float]
+    armor_class: Optional[float]
+    challenge_rating: Optional[float]
+    speed: str = ""
+
+
+# What encounters used before there was an index; still the answer for an empty or unmatched seed
+DEFAULT_MONSTER = Monster("Forest Guardian", "Large", "fey", "Unaligned", 45.0, 14.0, 3.0)
+
+
+def _leading_number(text: str) -> Optional[float]:
+    m = _NUMBER_RE.search(text or "")
+    return float(m.group(0)) if m else None
+
+
+def parse_cr(text: str) -> Optional[float]:
+    cr = (text or "").split(" ", 1)[0]
+    try:
+        if "/" in cr:
+            num, denom = cr.split("/", 1)
+            return float(num) / float(denom)
+        return float(cr)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _tokens(text: str) -> List[str]:
+    return [tok for tok in TOKEN_RE.findall((text or "").lower()) if tok not in STOP_WORDS and not tok.isdigit()]
+
+
+def _stem(token: str) -> str:
+    # Plural folding only: "goblins" -> "goblin", "wolves" -> "wolf", "harpies" -> "harpy"
+    if len(token) > 4 and token.endswith("ves"):
+        return token[:-3] + "f"
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def _grams(token: str) -> List[str]:
+    padded = f"#{token}#"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _vector(name: str, kind: str = "", traits: Tuple[str, ...] = ()) -> Dict[str, float]:
+    vec: Dict[str, float] = {}
+    for tok in _tokens(name):
+        word = f"w:{_stem(tok)}"
+        vec[word] = vec.get(word, 0.0) + NAME_WEIGHT
+        for gram in _grams(tok):
+            vec[f"g:{gram}"] = vec.get(f"g:{gram}", 0.0) + GRAM_WEIGHT
+    for tok in _tokens(kind):
+        # Type words share the "w:" space so "a dragon" finds dragons by type as well as name
+        word = f"w:{_stem(tok)}"
+        vec[word] = vec.get(word, 0.0) + TYPE_WEIGHT
+    for trait in traits:
+        vec[f"w:{trait}"] = vec.get(f"w:{trait}", 0.0) + TRAIT_WEIGHT
+    return vec
+
+
+def _normalize(vec: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    return {k: v / norm for k, v in vec.items()}
+
+
+def _parse_row(row: Dict[str, str]) -> Monster:
+    kind, _, alignment = (row.get("Race + alignment") or row.get("alignment") or "").partition(", ")
+    return Monster(
+        name=(row.get("Name") or row.get("name") or "").strip(),
+        size=(row.get("Size") or row.get("size") or "Medium").strip(),
+        kind=kind.strip(),
+        alignment=alignment.strip(),
+        hit_points=_leading_number(row.get("HP") or row.get("hit_points") or ""),
+        armor_class=_leading_number(row.get("Armor") or row.get("armor_class") or ""),
+        challenge_rating=parse_cr(row.get("Challenge rating  (XP)") or row.get("challenge_rating") or ""),
+        speed=(row.get("Speed") or row.get("speed") or "").strip(),
+    )
+
+
+class SeedIndex:
+    """Sparse nearest-neighbour index from free text to bestiary rows.
+
+    Each monster is an L2-normalised sparse vector of name words, creature
+    type, movement traits and name trigrams; an inverted index over the
+    features makes a query one pass over the postings of its own features.
+    """
+
+    def __init__(self, monsters: List[Monster]):
+        self.monsters = monsters
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        for i, monster in enumerate(monsters):
+            traits = tuple(t for t in TRAITS if t in monster.speed.lower())
+            for feature, weight in _normalize(_vector(monster.name, monster.kind, traits)).items():
+                self.postings.setdefault(feature, []).append((i, weight))
+
+    @classmethod
+    def from_csv(cls, path: Optional[str] = None) -> "SeedIndex":
+        path = path or (RAW_MONSTERS_PATH if os.path.exists(RAW_MONSTERS_PATH) else CLEAN_MONSTERS_PATH)
+        monsters: List[Monster] = []
+        seen = set()
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                monster = _parse_row(row)
+                if monster.name and monster.name.lower() not in seen:
+                    seen.add(monster.name.lower())
+                    monsters.append(monster)
+        return cls(monsters)
+
+    def nearest(self, text: str, k: int = 1) -> List[Tuple[Monster, float]]:
+        """Top-k (monster, cosine similarity) pairs for free text."""
+        query = _normalize(_vector(text))
+        scores: Dict[int, float] = {}
+        for feature, q in query.items():
+            for i, weight in self.postings.get(feature, ()):
+                scores[i] = scores.get(i, 0.0) + q * weight
+        ranked = sorted(scores, key=lambda i: (-scores[i], i))[:k]
+        return [(self.monsters[i], scores[i]) for i in ranked]
+
+    def match(self, text: str) -> Optional[Monster]:
+        best = self.nearest(text, 1)
+        if not best or best[0][1] < MIN_SIMILARITY:
+            return None
+        return best[0][0]
+
+
+_INDEX: Optional[SeedIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_seed_index() -> Optional[SeedIndex]:
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None and (os.path.exists(RAW_MONSTERS_PATH) or os.path.exists(CLEAN_MONSTERS_PATH)):
+            try:
+                _INDEX = SeedIndex.from_csv()
+            except Exception:
+                return None
+        return _INDEX
+
+
+@lru_cache(maxsize=SEED_CACHE_SIZE)
+def encounter_monster(story_seed: str) -> Monster:
+    """The bestiary row a story seed describes best, or DEFAULT_MONSTER. Cached per seed."""
+    index = get_seed_index() if story_seed and story_seed.strip() else None
+    if index is None:
+        return DEFAULT_MONSTER
+    return index.match(story_seed) or DEFAULT_MONSTER
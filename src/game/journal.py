@@ -0,0 +1,240 @@
+import atexit
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import weakref
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .state import GameState
+
+
+JOURNAL_DIR = os.environ.get(
+    "DM_JOURNAL_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "sessions"),
+)
+
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+# Events compacted into a snapshot move here, so the full turn history stays exportable
+HISTORY_FILE = "history.jsonl"
+
+SESSION_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+_OPEN_JOURNALS: "weakref.WeakSet[SessionJournal]" = weakref.WeakSet()
+
+
+def new_session_id() -> str:
+    return uuid.uuid4().hex
+
+
+def is_valid_session_id(session_id: Optional[str]) -> bool:
+    # Session ids become directory names, so only accept our own uuid4 hex format
+    return bool(session_id) and bool(SESSION_ID_RE.match(session_id))
+
+
+class SessionJournal:
+    """Append-only, per-session event journal with periodic compact snapshots.
+
+    Events are buffered and written in batches (every `flush_every` events or
+    `flush_interval` seconds, whichever comes first) with a plain write+flush,
+    so a turn never waits on fsync. `fsync` only happens when a snapshot is
+    taken or the journal is closed. Each event carries the turn's state diff
+    (`GameState.end_turn()`), so resuming is "load snapshot, apply the tail".
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        root: str = JOURNAL_DIR,
+        snapshot_every: int = 50,
+        flush_every: int = 8,
+        flush_interval: float = 2.0,
+    ):
+        self.session_id = session_id
+        self.dir = os.path.join(root, session_id)
+        self.journal_path = os.path.join(self.dir, JOURNAL_FILE)
+        self.snapshot_path = os.path.join(self.dir, SNAPSHOT_FILE)
+        self.snapshot_every = snapshot_every
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        os.makedirs(self.dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._buffer: list[str] = []
+        self._timer: Optional[threading.Timer] = None
+        self.meta: Dict[str, Any] = {}
+        self._seq, self._snapshot_seq = self._scan_seq()
+        self._repair_tail()
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+        _OPEN_JOURNALS.add(self)
+
+    def _scan_seq(self) -> Tuple[int, int]:
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, encoding="utf-8") as f:
+                    data = json.load(f)
+                snapshot_seq = int(data.get("seq", 0))
+                self.meta.update(data.get("meta") or {})
+            except (OSError, ValueError):
+                snapshot_seq = 0
+        seq = snapshot_seq
+        for event in _read_events(self.journal_path):
+            seq = max(seq, int(event.get("seq", 0)))
+            self.meta.update(event.get("meta") or {})
+        return seq, snapshot_seq
+
+    def _repair_tail(self) -> None:
+        # Drop a torn final line so new appends do not merge into it
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    @property
+    def seq(self) -> int:
+        return self._seq
+
+    def record(self, event: Dict[str, Any], state: Optional[GameState] = None) -> int:
+        """Buffer one event; `state` lets the journal compact itself periodically."""
+        with self._lock:
+            self._seq += 1
+            payload = {"seq": self._seq, "ts": time.time(), **event}
+            self.meta.update(event.get("meta") or {})
+            self._buffer.append(json.dumps(payload, separators=(",", ":")))
+            if len(self._buffer) >= self.flush_every:
+                self._flush_locked()
+            elif self._timer is None and self.flush_interval > 0:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            seq = self._seq
+        if state is not None and seq - self._snapshot_seq >= self.snapshot_every:
+            self.snapshot(state)
+        return seq
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer or self._file.closed:
+            return
+        self._file.write("\n".join(self._buffer) + "\n")
+        self._file.flush()
+        self._buffer.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def snapshot(self, state: GameState, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Write a compact snapshot atomically and truncate the journal behind it."""
+        with self._lock:
+            self._flush_locked()
+            self.meta.update(meta or {})
+            data = {"seq": self._seq, "ts": time.time(), "meta": self.meta, "state": state.snapshot()}
+            tmp = self.snapshot_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            # Events up to `seq` now live in the snapshot; a crash before the
+            # truncate is harmless because resume skips seq <= snapshot seq
+            # (and history readers skip seqs they have already seen).
+            self._file.close()
+            with open(self.journal_path, "rb") as src, open(os.path.join(self.dir, HISTORY_FILE), "ab") as dst:
+                shutil.copyfileobj(src, dst)
+            self._file = open(self.journal_path, "w", encoding="utf-8")
+            self._snapshot_seq = self._seq
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if not self._file.closed:
+                os.fsync(self._file.fileno())
+                self._file.close()
+        _OPEN_JOURNALS.discard(self)
+
+
+def _read_events(path: str) -> Iterator[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Torn final write from a crash; everything before it is intact
+                return
+
+
+def journal_exists(session_id: str, root: str = JOURNAL_DIR) -> bool:
+    session_dir = os.path.join(root, session_id)
+    return os.path.exists(os.path.join(session_dir, SNAPSHOT_FILE)) or os.path.exists(os.path.join(session_dir, JOURNAL_FILE))
+
+
+def iter_events(session_id: str, root: str = JOURNAL_DIR) -> Iterator[Dict[str, Any]]:
+    """Events still in the journal (i.e. newer than the last snapshot)."""
+    return _read_events(os.path.join(root, session_id, JOURNAL_FILE))
+
+
+def iter_history(session_id: str, root: str = JOURNAL_DIR) -> Iterator[Dict[str, Any]]:
+    """Every event the session ever journaled, oldest first, one line at a time."""
+    last = 0
+    session_dir = os.path.join(root, session_id)
+    for name in (HISTORY_FILE, JOURNAL_FILE):
+        for event in _read_events(os.path.join(session_dir, name)):
+            seq = int(event.get("seq", 0))
+            if seq > last:
+                last = seq
+                yield event
+
+
+def resume(session_id: str, root: str = JOURNAL_DIR) -> Optional[Tuple[GameState, Dict[str, Any]]]:
+    """Rebuild (state, meta) from the latest snapshot plus the journal tail.
+
+    `meta` merges the snapshot meta with the `meta` of every replayed event, so
+    UI bookkeeping (ended, active player, ...) survives alongside the state.
+    """
+    session_dir = os.path.join(root, session_id)
+    snapshot_path = os.path.join(session_dir, SNAPSHOT_FILE)
+    state = GameState()
+    meta: Dict[str, Any] = {}
+    snapshot_seq = 0
+    found = False
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, encoding="utf-8") as f:
+            data = json.load(f)
+        state = GameState.from_dict(data["state"])
+        meta.update(data.get("meta") or {})
+        snapshot_seq = int(data.get("seq", 0))
+        found = True
+    for event in _read_events(os.path.join(session_dir, JOURNAL_FILE)):
+        if int(event.get("seq", 0)) <= snapshot_seq:
+            continue
+        state.apply_changes(event.get("changes") or {})
+        meta.update(event.get("meta") or {})
+        found = True
+    if not found:
+        return None
+    state.end_turn()
+    return state, meta
+
+
+@atexit.register
+def _flush_open_journals() -> None:
+    for journal in list(_OPEN_JOURNALS):
+        try:
+            journal.close()
+        except Exception:
+            pass
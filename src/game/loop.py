@@ -1,10 +1,22 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from typing import Tuple
 from .state import GameState
 from .policies.rule_based import decide_response
 from .align_predictor import predict_alignment
+from .bestiary import encounter_monster
 from src.ai.gemini_client import generate_dm_reply
 
 
+# Turns never wait longer than this for the LLM; the rule engine's text is used instead
+DM_REPLY_BUDGET_S = float(os.environ.get("DM_REPLY_BUDGET_S", "3.0"))
+_DM_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dm-reply")
+DM_REPLY_STATS = {"calls": 0, "timeouts": 0, "late": 0}
+# Late replies are counted from a dm-reply worker while the CLI loop may be counting the next call
+_DM_STATS_LOCK = threading.Lock()
+
+
 HELP_TEXT = "You hesitate. Would you like to (A) explore, (B) fight, (C) talk, or (D) inspect surroundings?"
 
 
@@ -57,6 +69,12 @@ def _summarize_state(state: GameState) -> str:
     return "; ".join(parts)
 
 
+def _count_late_reply(future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        with _DM_STATS_LOCK:
+            DM_REPLY_STATS["late"] += 1
+
+
 def dm_step(state: GameState, user_input: str) -> Tuple[str, bool]:
     intent = infer_intent(user_input)
     dm_text, end_game = decide_response(state, user_input)
@@ -70,9 +88,26 @@ def dm_step(state: GameState, user_input: str) -> Tuple[str, bool]:
         monster_alignment = None
         if state.world.boss_active:
             # Predict alignment for encounter flavor
-            seed_name = state.world.story_seed.split(" ")[0] or "Forest Guardian"
-            monster_alignment = predict_alignment(seed_name, "Large", 45.0, 14.0, 3.0)
-        ai_text = generate_dm_reply(_summarize_state(state), user_input, intent or "unknown", monster_alignment)
+            monster = encounter_monster(state.world.story_seed)
+            monster_alignment = predict_alignment(monster.name, monster.size, monster.hit_points, monster.armor_class, monster.challenge_rating)
+        future = _DM_EXECUTOR.submit(
+            generate_dm_reply,
+            _summarize_state(state),
+            user_input,
+            intent or "unknown",
+            monster_alignment,
+            DM_REPLY_BUDGET_S,
+        )
+        with _DM_STATS_LOCK:
+            DM_REPLY_STATS["calls"] += 1
+        try:
+            ai_text = future.result(timeout=DM_REPLY_BUDGET_S)
+        except FutureTimeout:
+            with _DM_STATS_LOCK:
+                DM_REPLY_STATS["timeouts"] += 1
+            # The reply still finishes in the background; count it as late once it does
+            future.add_done_callback(_count_late_reply)
+            ai_text = None
         if ai_text:
             return (ai_text, end_game)
     except Exception:
@@ -0,0 +1,258 @@
+import csv
+import hashlib
+import math
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import joblib
+except Exception:
+    joblib = None
+
+from .spells import FILLER_WORDS, tokenize
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "processed")
+MONSTERS_PATH = os.path.join(DATA_DIR, "Dd5e_monsters_clean.csv")
+SPELLS_PATH = os.path.join(DATA_DIR, "dnd_spells_clean.csv")
+INDEX_PATH = os.environ.get("LORE_INDEX_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "reports", "artifacts", "lore_index.joblib"
+)
+LORE_TOP_K = int(os.environ.get("LORE_TOP_K", "3"))  # 0 disables lore in prompts
+SNIPPET_CHARS = 140
+INDEX_VERSION = 1  # bump when the document format changes; saved indexes are then rebuilt
+
+# BM25 parameters (Robertson/Sparck Jones defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+NAME_REPEAT = 3  # name tokens count this many times in a document
+MIN_SCORE = 1.0  # below this a "match" is only common words
+CONTEXT_WEIGHT = 0.4  # location/boss terms count less than the player's own words
+
+STOP_WORDS = FILLER_WORDS | {
+    "to", "of", "and", "or", "in", "on", "at", "for", "with", "is", "are", "be", "that", "this",
+    "its", "their", "your", "can", "up", "ft", "feet", "go", "look", "around", "back", "me", "us",
+}
+# Thematic terms per location, so "look around" in the forest still finds forest lore
+LOCATION_TERMS: Dict[str, Tuple[str, ...]] = {
+    "village": ("humanoid", "commoner", "guard", "bandit"),
+    "forest": ("beast", "wolf", "bandit", "plant", "druid"),
+    "ruins": ("undead", "skeleton", "construct", "darkness", "ghost"),
+}
+BOSS_TERMS = ("shadow", "fiend")
+
+
+@dataclass(frozen=True)
+class LoreEntry:
+    kind: str  # "monster" | "spell"
+    name: str
+    snippet: str
+
+
+def _clip(text: str, limit: int = SNIPPET_CHARS) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _fix_text(text: str) -> str:
+    # The spell CSV carries UTF-8 read as cp1252 ("itâ€™s"); undo it where it round-trips
+    try:
+        return text.encode("cp1252").decode("utf-8")
+    except UnicodeError:
+        return text
+
+
+def _first_sentence(text: str) -> str:
+    text = " ".join((text or "").split())
+    end = text.find(". ")
+    return text if end < 0 else text[: end + 1]
+
+
+def _monster_doc(row: Dict[str, str]) -> Tuple[LoreEntry, str]:
+    name = (row.get("name") or "").strip()
+    kind, _, alignment = (row.get("alignment") or "").partition(", ")
+    cr = (row.get("challenge_rating") or "").split(" (", 1)[0]
+    parts = [f"{row.get('size', '')} {kind}".strip()]
+    if alignment:
+        parts.append(alignment)
+    if cr:
+        parts.append(f"CR {cr}")
+    if row.get("armor_class"):
+        parts.append(f"AC {row['armor_class'].split('.', 1)[0]}")
+    if row.get("speed"):
+        parts.append(f"speed {row['speed']}")
+    snippet = _clip(f"{name} ({', '.join(parts)})")
+    text = " ".join([name] * NAME_REPEAT + [row.get("size", ""), row.get("alignment", ""), row.get("speed", "")])
+    return LoreEntry("monster", name, snippet), text
+
+
+def _spell_doc(row: Dict[str, str]) -> Tuple[LoreEntry, str]:
+    name = (row.get("name") or "").strip()
+    level = row.get("level") or "0"
+    label = "cantrip" if level == "0" else f"level {level}"
+    head = f"{name} ({label} {row.get('school', '')}, {row.get('range', '')})".replace(" ,", ",")
+    snippet = _clip(f"{head}: {_first_sentence(_fix_text(row.get('description') or ''))}")
+    text = " ".join([name] * NAME_REPEAT + [row.get("school", ""), row.get("description", "")])
+    return LoreEntry("spell", name, snippet), text
+
+
+def _source_digest(paths: Sequence[str]) -> str:
+    digest = hashlib.sha1(str(INDEX_VERSION).encode())
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class LoreIndex:
+    """BM25 index over bestiary and spell rows, returning short prompt snippets.
+
+    Postings map token -> {doc id: term frequency}; idf and document length
+    norms are precomputed, so a query costs a handful of dict walks. The
+    index is plain data and pickles as is for `save`/`load`.
+    """
+
+    def __init__(self, entries: List[LoreEntry], texts: List[str], source: str = ""):
+        self.entries = entries
+        self.source = source
+        self.postings: Dict[str, Dict[int, int]] = {}
+        lengths: List[int] = []
+        for i, text in enumerate(texts):
+            tokens = [tok for tok in tokenize(text) if tok not in STOP_WORDS]
+            lengths.append(len(tokens))
+            for tok in tokens:
+                postings = self.postings.setdefault(tok, {})
+                postings[i] = postings.get(i, 0) + 1
+        n = max(1, len(entries))
+        avg = sum(lengths) / n if lengths else 1.0
+        self.idf = {tok: math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5)) for tok, ids in self.postings.items()}
+        # k1 * (1 - b + b * len / avg), the per-document part of the BM25 denominator
+        self.norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / (avg or 1.0)) for length in lengths]
+
+    @classmethod
+    def from_csv(cls, monsters_path: str = MONSTERS_PATH, spells_path: str = SPELLS_PATH) -> "LoreIndex":
+        entries: List[LoreEntry] = []
+        texts: List[str] = []
+        seen = set()
+        for path, build in ((monsters_path, _monster_doc), (spells_path, _spell_doc)):
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    entry, text = build(row)
+                    key = (entry.kind, entry.name.lower())
+                    if not entry.name or key in seen:
+                        continue
+                    seen.add(key)
+                    entries.append(entry)
+                    texts.append(text)
+        return cls(entries, texts, _source_digest([monsters_path, spells_path]))
+
+    def scores(
+        self, query: str, weight: float = 1.0, scores: Optional[Dict[int, float]] = None, kind: Optional[str] = None
+    ) -> Dict[int, float]:
+        scores = {} if scores is None else scores
+        for tok in set(tokenize(query)):
+            postings = self.postings.get(tok)
+            if not postings or tok in STOP_WORDS:
+                continue
+            idf = weight * self.idf[tok]
+            for i, tf in postings.items():
+                if kind is not None and self.entries[i].kind != kind:
+                    continue
+                scores[i] = scores.get(i, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + self.norms[i])
+        return scores
+
+    def search(self, query: str, k: int = LORE_TOP_K, kind: Optional[str] = None, context: str = "") -> List[LoreEntry]:
+        """Top-k entries for free text, best first; weak matches are left out.
+
+        `context` (location themes) is down-weighted and only ranks monsters:
+        a spell has to be named or described by the query itself.
+        """
+        scores = self.scores(query)
+        if context:
+            self.scores(context, CONTEXT_WEIGHT, scores, kind="monster")
+        ranked = sorted(
+            (i for i, score in scores.items() if score >= MIN_SCORE and (kind is None or self.entries[i].kind == kind)),
+            key=lambda i: (-scores[i], i),
+        )
+        if kind is not None or k < 2:
+            return [self.entries[i] for i in ranked[:k]]
+        # Mixed results: one kind (four wolves) may not crowd out the other (the spell being cast)
+        picked: List[int] = []
+        per_kind: Dict[str, int] = {}
+        kinds = {self.entries[i].kind for i in ranked}
+        for i in ranked:
+            entry_kind = self.entries[i].kind
+            if len(kinds) > 1 and per_kind.get(entry_kind, 0) >= k - 1:
+                continue
+            picked.append(i)
+            per_kind[entry_kind] = per_kind.get(entry_kind, 0) + 1
+            if len(picked) == k:
+                break
+        return [self.entries[i] for i in picked]
+
+    def save(self, path: str = INDEX_PATH) -> bool:
+        if joblib is None:
+            return False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        joblib.dump(self, path)
+        return True
+
+    @classmethod
+    def load(cls, path: str = INDEX_PATH, source: Optional[str] = None) -> Optional["LoreIndex"]:
+        """The saved index, or None if missing, unreadable or built from other data."""
+        if joblib is None or not os.path.exists(path):
+            return None
+        try:
+            index = joblib.load(path)
+        except Exception:
+            return None
+        if not isinstance(index, cls) or (source is not None and index.source != source):
+            return None
+        return index
+
+
+def build_index(path: str = INDEX_PATH, rebuild: bool = False) -> LoreIndex:
+    """Load the persisted index if it matches the CSVs, else build and save it."""
+    source = _source_digest([MONSTERS_PATH, SPELLS_PATH])
+    index = None if rebuild else LoreIndex.load(path, source)
+    if index is None:
+        index = LoreIndex.from_csv()
+        try:
+            index.save(path)
+        except OSError:
+            pass
+    return index
+
+
+_INDEX: Optional[LoreIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_lore_index() -> Optional[LoreIndex]:
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None and os.path.exists(MONSTERS_PATH) and os.path.exists(SPELLS_PATH):
+            try:
+                _INDEX = build_index()
+            except Exception:
+                return None
+        return _INDEX
+
+
+def lore_context(location: str, boss_active: bool = False) -> str:
+    terms = [location, *LOCATION_TERMS.get(location, ())]
+    if boss_active:
+        terms.extend(BOSS_TERMS)
+    return " ".join(terms)
+
+
+def lore_for(location: str, action: str, boss_active: bool = False, k: int = LORE_TOP_K) -> List[str]:
+    """Up to k short lore snippets relevant to the action at this location."""
+    if k <= 0:
+        return []
+    index = get_lore_index()
+    if index is None:
+        return []
+    return [entry.snippet for entry in index.search(action, k, context=lore_context(location, boss_active))]
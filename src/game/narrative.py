@@ -1,4 +1,5 @@
 import random
+import re
 from typing import Optional
 
 
@@ -44,3 +45,23 @@ def craft_narration(scene: str, base: str, roll: Optional[int] = None) -> str:
     return " " .join(parts)
 
 
+_SENSE_PATTERNS = [
+    re.escape(t).replace(r"\{smell\}", "(?:" + "|".join(map(re.escape, SMELLS)) + ")")
+    .replace(r"\{sound\}", "(?:" + "|".join(map(re.escape, SOUNDS)) + ")")
+    .replace(r"\{sight\}", "(?:" + "|".join(map(re.escape, SIGHTS)) + ")")
+    for t in SENSES
+]
+_FLAVOR_RE = re.compile(
+    r"[^.:]*? feels (?:" + "|".join(map(re.escape, ADJECTIVES)) + r")\.\s*"
+    r"|\s*(?:" + "|".join(_SENSE_PATTERNS) + r")"
+    r"|\s*\(DM rolls d20: \d+\)"
+)
+
+
+def strip_flavor(text: str) -> str:
+    """Remove the random decoration added by `craft_narration`, leaving the outcome.
+
+    Two engine results that differ only in flavor map to the same string, which
+    makes the outcome usable as a cache key.
+    """
+    return " ".join(_FLAVOR_RE.sub(" ", text or "").split())
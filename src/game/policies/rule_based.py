@@ -2,11 +2,45 @@ from typing import Tuple
 from ..state import GameState
 from ..narrative import craft_narration
 from ..align_predictor import predict_alignment
+from ..bestiary import encounter_monster
+from ..spells import Spell, find_spell
+
+
+def _roll_dice(state: GameState, count: int, sides: int, bonus: int = 0) -> int:
+    return sum(state.roll(sides) for _ in range(count)) + bonus
+
+
+def _spell_dc(spell: Spell) -> int:
+    # Higher-level spells hit harder but are harder to land
+    return 10 + spell.level // 2
+
+
+def _spell_desc(spell: Spell) -> str:
+    if spell.level == 0:
+        return f"{spell.name} ({spell.school} cantrip)"
+    return f"{spell.name} ({spell.level_label} {spell.school})"
+
+
+def _cast_spell(state: GameState, spell: Spell, text: str) -> Tuple[str, bool]:
+    """Spells cast outside of the boss fight."""
+    scene = {"village": "the village square", "forest": "the forest", "ruins": "the ruins"}.get(state.world.location, "the road")
+    if spell.heal_dice:
+        healed = _roll_dice(state, *spell.heal_dice)
+        state.players[0].hp += healed
+        return (craft_narration(scene, f"You cast {_spell_desc(spell)}. Warmth knits your wounds (+{healed} HP)."), False)
+    if spell.damage_dice and state.world.location == "forest" and "bandit" in text:
+        roll = state.roll()
+        if roll >= _spell_dc(spell):
+            return (craft_narration("the thicket", f"Your {spell.name} ({spell.dice} {spell.damage_type or 'magic'}) scatters a lurking bandit. You find a silver coin.", roll=roll), False)
+        return (craft_narration("the thicket", f"Your {spell.name} fizzles and a bandit ambushes you. You lose 2 HP.", roll=roll), False)
+    return (craft_narration(scene, f"You cast {_spell_desc(spell)}. Magic crackles in the air, then settles."), False)
 
 
 def decide_response(state: GameState, player_input: str, predicted_intent: str = None, intent_confidence: float = 0.0, monster_behavior: dict = None) -> Tuple[str, bool]:
     """Return (dm_text, end_game). Very simple rule-based logic with dice.
     Uses predicted_intent when text is ambiguous (intent_confidence >= 0.7).
+    Spells named in the input ("cast firebal at the bandit") are resolved through
+    the spell index; their level sets the d20 target and their dice the damage.
     """
     text = player_input.strip().lower()
     state.world.turn += 1
@@ -17,6 +51,10 @@ def decide_response(state: GameState, player_input: str, predicted_intent: str =
     if text in {"quit", "exit"}:
         return ("The adventure ends for now. Farewell!", True)
 
+    spell = find_spell(text)
+    if spell is not None and not (state.world.location == "forest" and state.world.boss_active):
+        return _cast_spell(state, spell, text)
+
     # Location-specific simple rules
     if state.world.location == "village":
         # Use intent prediction if high confidence
@@ -45,17 +83,26 @@ def decide_response(state: GameState, player_input: str, predicted_intent: str =
     if state.world.location == "forest":
         if state.world.boss_active:
             # Combat loop - use intent prediction if high confidence
-            should_attack = (use_intent and predicted_intent == "attack") or any(k in text for k in ["attack", "strike", "swing", "hit", "fight", "use sword"])
+            should_attack = spell is not None or (use_intent and predicted_intent == "attack") or any(k in text for k in ["attack", "strike", "swing", "hit", "fight", "use sword"])
             should_flee = (use_intent and predicted_intent == "flee") or any(k in text for k in ["leave", "run", "escape", "south"])
             
             if should_attack:
+                if spell is not None and spell.heal_dice:
+                    healed = _roll_dice(state, *spell.heal_dice)
+                    state.players[0].hp += healed
+                    return (craft_narration("the clearing", f"You cast {_spell_desc(spell)} mid-fight (+{healed} HP). The foe presses closer."), False)
                 roll = state.roll()
                 damage = 0
-                if roll >= 15:
+                if spell is not None:
+                    if spell.damage_dice and roll >= _spell_dc(spell):
+                        damage = _roll_dice(state, *spell.damage_dice)
+                    elif not spell.damage_dice:
+                        return (craft_narration("the clearing", f"You cast {_spell_desc(spell)}. The foe shakes off the glamour and circles you.", roll=roll), False)
+                elif roll >= 15:
                     damage = 6
                 elif roll >= 10:
                     damage = 3
-                else:
+                if damage == 0:
                     # Monster behavior affects counterattack
                     monster_action = monster_behavior.get("action", "attack") if monster_behavior else "attack"
                     if monster_action == "defend":
@@ -100,8 +147,8 @@ def decide_response(state: GameState, player_input: str, predicted_intent: str =
                 state.world.boss_active = True
                 state.world.boss_hp = 10
                 # Use alignment predictor to flavor encounter
-                seed_name = state.world.story_seed.split(" ")[0] or "Forest Guardian"
-                align = predict_alignment(seed_name, "Large", 45.0, 14.0, 3.0)
+                monster = encounter_monster(state.world.story_seed)
+                align = predict_alignment(monster.name, monster.size, monster.hit_points, monster.armor_class, monster.challenge_rating)
                 if align == "good":
                     return (craft_narration("the clearing", "A guardian steps forth, bidding caution: 'Prove your intent before you pass.'"), False)
                 if align == "neutral":
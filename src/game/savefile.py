@@ -0,0 +1,286 @@
+import os
+import struct
+import sys
+import zlib
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .state import GameState, Player, TrackedDict, TrackedList, WorldState
+
+
+# Binary save layout (little-endian), version 1:
+#
+#   header   HEADER struct below; enough to list/filter saves without parsing the body
+#   payload  string table:  u32 count, u32[count] code-point lengths, u32 blob size,
+#                           utf-8 blob of the strings joined by NUL
+#            players:       per player u32 name, i32 hp, u32 n_items, u32[n_items] items
+#            world:         u32 location, u32 quest, u32 story_seed,
+#                           u32 known-flags-false bitset, u32 n_extra, (u32 name, u8 value)[n_extra]
+#            dice_log, log: u32 count, u32[count] string ids
+#
+# Every string is interned once in the table, so repeated inventory items,
+# dice results and log lines cost four bytes per use. The CRC32 covers the payload.
+
+MAGIC = b"DMSV"
+FORMAT_VERSION = 1
+SAVE_EXT = ".dmsave"
+
+HEADER = struct.Struct("<4sHHIIIiHHIIB3x")
+HEADER_BOSS_ACTIVE = 0x1
+
+# Bit positions are part of the format: append new flags, never reorder
+KNOWN_FLAGS = ("rumor_bandits", "found_tracks", "boss_defeated", "amulet_found")
+KNOWN_LOCATIONS = ("village", "forest", "ruins")
+UNKNOWN_LOCATION = 255
+
+_U32 = struct.Struct("<I")
+_PLAYER = struct.Struct("<IiI")
+_WORLD = struct.Struct("<IIIII")
+_EXTRA_FLAG = struct.Struct("<IB")
+
+
+class SaveFormatError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SaveHeader:
+    version: int
+    payload_size: int
+    checksum: int
+    turn: int
+    boss_active: bool
+    boss_hp: int
+    danger_level: int
+    num_players: int
+    flags: Tuple[str, ...]
+    log_size: int
+    location: Optional[str]
+
+
+def _u32_array(values: List[int]) -> bytes:
+    arr = array("I", values)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self.ids[value] = idx
+            self.strings.append(value)
+        return idx
+
+    def encode(self) -> bytes:
+        blob = "\x00".join(self.strings).encode("utf-8")
+        lengths = [len(s) for s in self.strings]
+        return _U32.pack(len(lengths)) + _u32_array(lengths) + _U32.pack(len(blob)) + blob
+
+
+def dumps(state: GameState) -> bytes:
+    table = _StringTable()
+    intern = table.intern
+    body: List[bytes] = []
+
+    body.append(_U32.pack(len(state.players)))
+    for p in state.players:
+        body.append(_PLAYER.pack(intern(p.name), int(p.hp), len(p.inventory)))
+        body.append(_u32_array([intern(item) for item in p.inventory]))
+
+    world = state.world
+    set_bits = 0
+    false_bits = 0
+    extra: List[Tuple[int, bool]] = []
+    for name, value in world.flags.items():
+        if name in KNOWN_FLAGS:
+            bit = 1 << KNOWN_FLAGS.index(name)
+            if value:
+                set_bits |= bit
+            else:
+                false_bits |= bit
+        else:
+            extra.append((intern(name), bool(value)))
+    body.append(_WORLD.pack(intern(world.location), intern(world.quest), intern(world.story_seed), false_bits, len(extra)))
+    body.extend(_EXTRA_FLAG.pack(idx, value) for idx, value in extra)
+
+    for entries in (state.dice_log, state.log):
+        body.append(_U32.pack(len(entries)))
+        body.append(_u32_array([intern(e) for e in entries]))
+
+    payload = table.encode() + b"".join(body)
+    location_code = KNOWN_LOCATIONS.index(world.location) if world.location in KNOWN_LOCATIONS else UNKNOWN_LOCATION
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        HEADER_BOSS_ACTIVE if world.boss_active else 0,
+        len(payload),
+        zlib.crc32(payload),
+        int(world.turn),
+        int(world.boss_hp),
+        int(world.danger_level),
+        len(state.players),
+        set_bits,
+        len(state.log),
+        location_code,
+    )
+    return header + payload
+
+
+def _check_header(buf: bytes) -> tuple:
+    if len(buf) < HEADER.size:
+        raise SaveFormatError("truncated save header")
+    fields = HEADER.unpack_from(buf)
+    if fields[0] != MAGIC:
+        raise SaveFormatError("not a dungeon master save file")
+    if fields[1] > FORMAT_VERSION:
+        raise SaveFormatError(f"save format v{fields[1]} is newer than supported v{FORMAT_VERSION}")
+    return fields
+
+
+def _parse_header(buf: bytes) -> SaveHeader:
+    (_, version, hflags, payload_size, checksum, turn, boss_hp, danger, n_players, set_bits, log_size, loc) = _check_header(buf)
+    return SaveHeader(
+        version=version,
+        payload_size=payload_size,
+        checksum=checksum,
+        turn=turn,
+        boss_active=bool(hflags & HEADER_BOSS_ACTIVE),
+        boss_hp=boss_hp,
+        danger_level=danger,
+        num_players=n_players,
+        flags=tuple(name for i, name in enumerate(KNOWN_FLAGS) if set_bits & (1 << i)),
+        log_size=log_size,
+        location=KNOWN_LOCATIONS[loc] if loc < len(KNOWN_LOCATIONS) else None,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _u32s(count: int) -> struct.Struct:
+    """Compiled "<countI" layout for a run of string ids."""
+    return struct.Struct(f"<{count}I")
+
+
+def loads(buf: bytes) -> GameState:
+    (_, _, hflags, payload_size, checksum, turn, boss_hp, danger, _, set_bits, _, _) = _check_header(buf)
+    payload = memoryview(buf)[HEADER.size:HEADER.size + payload_size]
+    if len(payload) != payload_size:
+        raise SaveFormatError("truncated save payload")
+    if zlib.crc32(payload) != checksum:
+        raise SaveFormatError("save checksum mismatch")
+    try:
+        return _load_payload(payload, hflags, turn, boss_hp, danger, set_bits)
+    except (struct.error, IndexError, UnicodeDecodeError) as exc:
+        # Written by a buggy or foreign encoder: the checksum matches but the layout does not
+        raise SaveFormatError(f"malformed save payload: {exc}") from exc
+
+
+def _load_payload(payload: memoryview, hflags: int, turn: int, boss_hp: int, danger: int, set_bits: int) -> GameState:
+    # One unpack per run of u32s and objects built through __setstate__, skipping the
+    # change-tracking __setattr__ that only matters once the state is live
+    (count,) = _U32.unpack_from(payload, 0)
+    offset = 4 + 4 * count  # code-point lengths, only needed when a string holds a NUL
+    (blob_size,) = _U32.unpack_from(payload, offset)
+    offset += 4
+    text = str(payload[offset:offset + blob_size], "utf-8")
+    offset += blob_size
+    strings = text.split("\x00") if count else []
+    if len(strings) != count:
+        bounds = list(accumulate((n + 1 for n in _u32s(count).unpack_from(payload, 4)), initial=0))
+        strings = [text[bounds[i]:bounds[i + 1] - 1] for i in range(count)]
+    string = strings.__getitem__
+
+    (n_players,) = _U32.unpack_from(payload, offset)
+    offset += 4
+    players: List[Player] = []
+    for _ in range(n_players):
+        name_idx, hp, n_items = _PLAYER.unpack_from(payload, offset)
+        offset += _PLAYER.size
+        items = _u32s(n_items).unpack_from(payload, offset)
+        offset += 4 * n_items
+        player = Player.__new__(Player)
+        player.__setstate__({"name": string(name_idx), "hp": hp, "inventory": TrackedList(map(string, items))})
+        players.append(player)
+
+    location_idx, quest_idx, seed_idx, false_bits, n_extra = _WORLD.unpack_from(payload, offset)
+    offset += _WORLD.size
+    flags: Dict[str, bool] = {}
+    for i, name in enumerate(KNOWN_FLAGS):
+        if set_bits & (1 << i):
+            flags[name] = True
+        elif false_bits & (1 << i):
+            flags[name] = False
+    for _ in range(n_extra):
+        name_idx, value = _EXTRA_FLAG.unpack_from(payload, offset)
+        offset += _EXTRA_FLAG.size
+        flags[string(name_idx)] = bool(value)
+
+    logs: List[List[str]] = []
+    for _ in range(2):
+        (n,) = _U32.unpack_from(payload, offset)
+        logs.append(list(map(string, _u32s(n).unpack_from(payload, offset + 4))))
+        offset += 4 + 4 * n
+
+    world = WorldState.__new__(WorldState)
+    world.__setstate__({
+        "location": string(location_idx),
+        "quest": string(quest_idx),
+        "danger_level": danger,
+        "turn": turn,
+        "flags": TrackedDict(flags),
+        "story_seed": string(seed_idx),
+        "boss_active": bool(hflags & HEADER_BOSS_ACTIVE),
+        "boss_hp": boss_hp,
+    })
+    state = GameState.__new__(GameState)
+    state.__setstate__({"players": players, "world": world, "log": logs[1], "dice_log": logs[0]})
+    return state
+
+
+def save(state: GameState, path: str) -> None:
+    data = dumps(state)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def load(path: str) -> GameState:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def read_header(path: str) -> SaveHeader:
+    with open(path, "rb") as f:
+        return _parse_header(f.read(HEADER.size))
+
+
+def scan_saves(directory: str) -> Iterator[Tuple[str, SaveHeader]]:
+    """Yield (path, header) for every save in `directory`, reading headers only."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith(SAVE_EXT):
+                try:
+                    yield entry.path, read_header(entry.path)
+                except (OSError, SaveFormatError):
+                    continue
+
+
+def load_many(directory: str) -> Iterator[Tuple[str, GameState]]:
+    """Yield (path, state) for every valid save in `directory`; corrupt files are skipped."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith(SAVE_EXT):
+                try:
+                    yield entry.path, load(entry.path)
+                except (OSError, SaveFormatError):
+                    continue
@@ -0,0 +1,241 @@
+import bisect
+import csv
+import difflib
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+
+SPELLS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "processed", "dnd_spells_clean.csv")
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+DAMAGE_RE = re.compile(r"(\d+)d(\d+)(?:\s*\+\s*(\d+))?\s+(?:([a-z]+)\s+)?damage")
+HEAL_RE = re.compile(r"regains?\s+(?:a\s+number\s+of\s+)?hit\s+points\s+equal\s+to\s+(\d+)d(\d+)")
+
+CAST_WORDS = {"cast", "casts", "casting", "invoke", "channel"}
+# Words that end the spell name in "cast <spell> at the bandit"
+TARGET_WORDS = {"at", "on", "to", "toward", "towards", "against", "upon", "into", "onto", "over", "with", "and", "then"}
+FILLER_WORDS = {"a", "an", "the", "my", "spell", "spells", "i", "we", "you", "it"}
+
+NAME_WEIGHT = 3.0
+FUZZY_CUTOFF = 0.75
+
+
+@dataclass(frozen=True)
+class Spell:
+    name: str
+    level: int
+    school: str
+    range: str
+    casting_time: str
+    damage_dice: Optional[Tuple[int, int, int]] = None  # (count, sides, flat bonus)
+    damage_type: Optional[str] = None
+    heal_dice: Optional[Tuple[int, int]] = None
+
+    @property
+    def dice(self) -> Optional[str]:
+        if self.damage_dice is None:
+            return None
+        count, sides, bonus = self.damage_dice
+        return f"{count}d{sides}" + (f"+{bonus}" if bonus else "")
+
+    @property
+    def level_label(self) -> str:
+        if self.level == 0:
+            return "cantrip"
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(self.level, "th")
+        return f"{self.level}{suffix}-level"
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _parse_spell(row: Dict[str, str]) -> Spell:
+    desc = (row.get("description") or "").lower()
+    damage = None
+    damage_type = None
+    m = DAMAGE_RE.search(desc)
+    if m:
+        damage = (int(m.group(1)), int(m.group(2)), int(m.group(3) or 0))
+        damage_type = m.group(4)
+    heal = None
+    h = HEAL_RE.search(desc)
+    if h:
+        heal = (int(h.group(1)), int(h.group(2)))
+    try:
+        level = int(row.get("level") or 0)
+    except ValueError:
+        level = 0
+    return Spell(
+        name=row["name"].strip(),
+        level=level,
+        school=row.get("school", "Unknown"),
+        range=row.get("range", "Unknown"),
+        casting_time=row.get("casting_time", "Unknown"),
+        damage_dice=damage,
+        damage_type=damage_type,
+        heal_dice=heal,
+    )
+
+
+class SpellIndex:
+    """Inverted index over spell names and descriptions.
+
+    Everything is precomputed at construction so lookups only touch small dicts:
+    name tokens support exact, prefix (bisect over the sorted vocabulary) and
+    fuzzy (trigram candidates ranked by difflib) matching; description tokens
+    back a tf-idf search for queries that do not name a spell.
+    """
+
+    def __init__(self, spells: List[Spell], descriptions: List[str]):
+        self.spells = spells
+        self.by_name: Dict[str, int] = {}
+        self.name_postings: Dict[str, Set[int]] = {}
+        self.name_lengths: List[int] = []
+        self.desc_postings: Dict[str, Dict[int, int]] = {}
+
+        for i, spell in enumerate(spells):
+            self.by_name.setdefault(spell.name.lower(), i)
+            tokens = tokenize(spell.name)
+            self.name_lengths.append(max(1, len(tokens)))
+            for tok in tokens:
+                self.name_postings.setdefault(tok, set()).add(i)
+            for tok in tokenize(descriptions[i]):
+                if tok in FILLER_WORDS:
+                    continue
+                postings = self.desc_postings.setdefault(tok, {})
+                postings[i] = postings.get(i, 0) + 1
+
+        n = max(1, len(spells))
+        self.name_idf = {tok: math.log(1 + n / len(ids)) for tok, ids in self.name_postings.items()}
+        self.desc_idf = {tok: math.log(1 + n / len(ids)) for tok, ids in self.desc_postings.items()}
+        self.vocab = sorted(self.name_postings)
+        self.trigram_index: Dict[str, Set[str]] = {}
+        for tok in self.vocab:
+            for gram in _trigrams(tok):
+                self.trigram_index.setdefault(gram, set()).add(tok)
+
+    @classmethod
+    def from_csv(cls, path: str = SPELLS_PATH) -> "SpellIndex":
+        spells: List[Spell] = []
+        descriptions: List[str] = []
+        seen: Set[str] = set()
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                name = (row.get("name") or "").strip()
+                if not name or name.lower() in seen:
+                    continue
+                seen.add(name.lower())
+                spells.append(_parse_spell(row))
+                descriptions.append(row.get("description") or "")
+        return cls(spells, descriptions)
+
+    def _match_token(self, token: str) -> List[Tuple[str, float]]:
+        """Vocabulary tokens matching `token` with a similarity in (0, 1]."""
+        if token in self.name_postings:
+            return [(token, 1.0)]
+        matches: List[Tuple[str, float]] = []
+        if len(token) >= 3:
+            lo = bisect.bisect_left(self.vocab, token)
+            hi = bisect.bisect_left(self.vocab, token + "\uffff")
+            for vocab_tok in self.vocab[lo:hi]:
+                matches.append((vocab_tok, 0.6 + 0.4 * len(token) / len(vocab_tok)))
+        if matches or len(token) < 4:
+            return matches
+        counts: Dict[str, int] = {}
+        for gram in _trigrams(token):
+            for vocab_tok in self.trigram_index.get(gram, ()):
+                counts[vocab_tok] = counts.get(vocab_tok, 0) + 1
+        candidates = sorted(counts, key=counts.get, reverse=True)[:20]
+        for vocab_tok in candidates:
+            ratio = difflib.SequenceMatcher(None, token, vocab_tok).ratio()
+            if ratio >= FUZZY_CUTOFF:
+                matches.append((vocab_tok, ratio))
+        return matches
+
+    def lookup(self, phrase: str) -> Optional[Spell]:
+        """Best spell whose name matches `phrase` exactly, by prefix or fuzzily."""
+        key = " ".join(tokenize(phrase))
+        if not key:
+            return None
+        if key in self.by_name:
+            return self.spells[self.by_name[key]]
+        scores: Dict[int, float] = {}
+        for token in key.split():
+            if token in FILLER_WORDS:
+                continue
+            best: Dict[int, float] = {}
+            for vocab_tok, sim in self._match_token(token):
+                weight = sim * self.name_idf[vocab_tok]
+                for i in self.name_postings[vocab_tok]:
+                    if weight > best.get(i, 0.0):
+                        best[i] = weight
+            for i, weight in best.items():
+                scores[i] = scores.get(i, 0.0) + weight
+        if not scores:
+            return None
+        # Prefer names the query covers fully ("Fireball" over "Delayed Blast Fireball")
+        best_id = max(scores, key=lambda i: (scores[i] / math.sqrt(self.name_lengths[i]), -i))
+        return self.spells[best_id]
+
+    def search(self, query: str, k: int = 5) -> List[Spell]:
+        """Top-k spells for free text, scoring name matches above description matches."""
+        scores: Dict[int, float] = {}
+        for token in tokenize(query):
+            if token in FILLER_WORDS:
+                continue
+            for vocab_tok, sim in self._match_token(token):
+                weight = NAME_WEIGHT * sim * self.name_idf[vocab_tok]
+                for i in self.name_postings[vocab_tok]:
+                    scores[i] = scores.get(i, 0.0) + weight
+            idf = self.desc_idf.get(token)
+            if idf:
+                for i, tf in self.desc_postings[token].items():
+                    scores[i] = scores.get(i, 0.0) + idf * (1 + math.log(tf))
+        ranked = sorted(scores, key=lambda i: (-scores[i], i))
+        return [self.spells[i] for i in ranked[:k]]
+
+    def resolve(self, player_input: str) -> Optional[Spell]:
+        """Resolve "cast firebal at the bandit" to a Spell, or None if no spell is cast."""
+        tokens = tokenize(player_input)
+        start = next((i + 1 for i, tok in enumerate(tokens) if tok in CAST_WORDS), None)
+        if start is None:
+            return None
+        phrase = []
+        for tok in tokens[start:]:
+            if tok in TARGET_WORDS:
+                break
+            phrase.append(tok)
+        return self.lookup(" ".join(phrase))
+
+
+_INDEX: Optional[SpellIndex] = None
+
+
+def get_spell_index() -> Optional[SpellIndex]:
+    global _INDEX
+    if _INDEX is None and os.path.exists(SPELLS_PATH):
+        try:
+            _INDEX = SpellIndex.from_csv(SPELLS_PATH)
+        except Exception:
+            return None
+    return _INDEX
+
+
+def find_spell(player_input: str) -> Optional[Spell]:
+    # Most actions cast nothing; don't load the spell CSV (~0.2 s) until one might
+    text = (player_input or "").lower()
+    if not any(word in text for word in CAST_WORDS):
+        return None
+    index = get_spell_index()
+    if index is None:
+        return None
+    return index.resolve(player_input)
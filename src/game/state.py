@@ -1,14 +1,90 @@
 from dataclasses import dataclass, field
-from typing import List, Dict
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import random
 
 
+SECTIONS = ("players", "world", "dice_log", "log")
+# Sections that only ever grow within a game; their diffs carry new entries only
+APPEND_SECTIONS = ("dice_log", "log")
+
+
+class TrackedList(list):
+    """list that reports in-place mutations through `on_change`."""
+
+    __slots__ = ("on_change",)
+
+    def __init__(self, data: Iterable = (), on_change: Optional[Callable[[], None]] = None):
+        super().__init__(data)
+        self.on_change = on_change
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
+
+    def __reduce__(self):
+        # Copies and pickles drop the callback; the owning GameState rebinds them
+        return (type(self), (list(self),))
+
+
+class TrackedDict(dict):
+    """dict that reports in-place mutations through `on_change`."""
+
+    __slots__ = ("on_change",)
+
+    def __init__(self, data: Any = (), on_change: Optional[Callable[[], None]] = None):
+        super().__init__(data)
+        self.on_change = on_change
+
+    def _changed(self) -> None:
+        if self.on_change is not None:
+            self.on_change()
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def _tracked(base: type, method_name: str) -> Callable:
+    method = getattr(base, method_name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._changed()
+        return result
+    wrapper.__name__ = method_name
+    return wrapper
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse", "__setitem__", "__delitem__", "__iadd__"):
+    setattr(TrackedList, _name, _tracked(list, _name))
+for _name in ("__setitem__", "__delitem__", "update", "pop", "popitem", "clear", "setdefault"):
+    setattr(TrackedDict, _name, _tracked(dict, _name))
+
+
 @dataclass
 class Player:
     name: str
     hp: int = 10
     inventory: List[str] = field(default_factory=list)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        on_change = self.__dict__.get("_on_change")
+        if name == "inventory":
+            value = TrackedList(value, on_change)
+        object.__setattr__(self, name, value)
+        if on_change is not None:
+            on_change()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {k: v for k, v in self.__dict__.items() if k != "_on_change"}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+    def _bind(self, on_change: Optional[Callable[[], None]]) -> None:
+        object.__setattr__(self, "_on_change", on_change)
+        self.inventory.on_change = on_change
+
 
 @dataclass
 class WorldState:
@@ -21,14 +97,122 @@ class WorldState:
     boss_active: bool = False
     boss_hp: int = 0
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        on_change = self.__dict__.get("_on_change")
+        if name == "flags":
+            value = TrackedDict(value, on_change)
+        object.__setattr__(self, name, value)
+        if on_change is not None:
+            on_change()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {k: v for k, v in self.__dict__.items() if k != "_on_change"}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+
+    def _bind(self, on_change: Optional[Callable[[], None]]) -> None:
+        object.__setattr__(self, "_on_change", on_change)
+        self.flags.on_change = on_change
+
+
+def _serialize_players(players: List[Player]) -> List[Dict[str, Any]]:
+    return [{"name": p.name, "hp": p.hp, "inventory": list(p.inventory)} for p in players]
+
+
+def _player_from_dict(data: Dict[str, Any]) -> Player:
+    return Player(name=data["name"], hp=data.get("hp", 10), inventory=list(data.get("inventory", [])))
+
+
+def _serialize_world(world: WorldState) -> Dict[str, Any]:
+    return {
+        "location": world.location,
+        "turn": world.turn,
+        "boss_active": world.boss_active,
+        "boss_hp": world.boss_hp,
+        "flags": dict(world.flags),
+        "story_seed": world.story_seed,
+        "quest": world.quest,
+        "danger_level": world.danger_level,
+    }
+
 
 @dataclass
 class GameState:
+    """Mutable game state with change tracking.
+
+    Every mutation of a section (players, world, dice_log, log) bumps `version`
+    and marks the section dirty. `snapshot()` serializes only sections that
+    changed since the last call; `changes()`/`end_turn()` return the per-turn
+    diff so consumers never have to rebuild or compare full dicts.
+    """
+
     players: List[Player] = field(default_factory=lambda: [Player(name="Hero")])
     world: WorldState = field(default_factory=WorldState)
     log: List[str] = field(default_factory=list)
     dice_log: List[str] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "version", 0)
+        object.__setattr__(self, "_section_versions", {name: 0 for name in SECTIONS})
+        object.__setattr__(self, "_dirty", set())
+        object.__setattr__(self, "_marks", {name: 0 for name in APPEND_SECTIONS})
+        object.__setattr__(self, "_cache", {})
+        for name in SECTIONS:
+            self._bind_section(name)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {name: getattr(self, name) for name in SECTIONS}
+        state["version"] = self.version
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name in SECTIONS:
+            object.__setattr__(self, name, state[name])
+        self.__post_init__()
+        self.version = state.get("version", 0)
+        for name in APPEND_SECTIONS:
+            self._marks[name] = len(getattr(self, name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in SECTIONS and "_dirty" in self.__dict__:
+            if name in ("players", "log", "dice_log"):
+                value = TrackedList(value)
+            object.__setattr__(self, name, value)
+            if name in APPEND_SECTIONS:
+                self._marks[name] = 0
+            self._bind_section(name)
+            self._touch(name)
+            return
+        object.__setattr__(self, name, value)
+
+    def _bind_section(self, name: str) -> None:
+        touch = partial(self._touch, name)
+        if name == "world":
+            self.world._bind(touch)
+            return
+        value = getattr(self, name)
+        if not isinstance(value, TrackedList):
+            value = TrackedList(value)
+            object.__setattr__(self, name, value)
+        if name == "players":
+            value.on_change = self._players_changed
+            for p in value:
+                p._bind(touch)
+        else:
+            value.on_change = touch
+
+    def _players_changed(self) -> None:
+        touch = partial(self._touch, "players")
+        for p in self.players:
+            p._bind(touch)
+        self._touch("players")
+
+    def _touch(self, name: str) -> None:
+        self.version += 1
+        self._section_versions[name] = self.version
+        self._dirty.add(name)
+
     def roll(self, sides: int = 20) -> int:
         value = random.randint(1, sides)
         self.dice_log.append(f"d{sides}: {value}")
@@ -44,4 +228,74 @@ class GameState:
         self.log = []
         self.dice_log = []
 
+    def replace_log(self, index: int, entry: str) -> None:
+        """Rewrite an earlier log entry (e.g. late narration) so the next diff includes it."""
+        self.log[index] = entry
+        self._marks["log"] = min(self._marks["log"], index)
+
+    def _section(self, name: str) -> Any:
+        cached: Optional[Tuple[int, Any]] = self._cache.get(name)
+        current = self._section_versions[name]
+        if cached is not None and cached[0] == current:
+            return cached[1]
+        if name == "players":
+            value = _serialize_players(self.players)
+        elif name == "world":
+            value = _serialize_world(self.world)
+        else:
+            value = list(getattr(self, name))
+        self._cache[name] = (current, value)
+        return value
+
+    def snapshot(self, sections: Iterable[str] = SECTIONS) -> Dict[str, Any]:
+        """Serialized state, rebuilt only for sections changed since the last call.
+
+        The top-level dict is fresh on every call, but nested values are shared
+        with the cache and must be treated as read-only.
+        """
+        return {name: self._section(name) for name in sections}
+
+    def changes(self) -> Dict[str, Any]:
+        """Diff since the last `end_turn()`: full values for replaced sections,
+        `{"start": i, "entries": [...]}` for the append-only logs."""
+        diff: Dict[str, Any] = {}
+        for name in SECTIONS:
+            if name not in self._dirty:
+                continue
+            if name in APPEND_SECTIONS:
+                entries = getattr(self, name)
+                start = min(self._marks[name], len(entries))
+                diff[name] = {"start": start, "entries": entries[start:]}
+            else:
+                diff[name] = self._section(name)
+        return diff
+
+    def end_turn(self) -> Dict[str, Any]:
+        """Return this turn's diff and start a new change set."""
+        diff = self.changes()
+        self._dirty.clear()
+        for name in APPEND_SECTIONS:
+            self._marks[name] = len(getattr(self, name))
+        return diff
+
+    def apply_changes(self, diff: Dict[str, Any]) -> None:
+        """Apply a diff produced by `changes()`/`end_turn()` (used to replay journals)."""
+        if "players" in diff:
+            self.players = [_player_from_dict(p) for p in diff["players"]]
+        if "world" in diff:
+            self.world = WorldState(**diff["world"])
+        for name in APPEND_SECTIONS:
+            if name in diff:
+                entries = getattr(self, name)
+                del entries[diff[name]["start"]:]
+                entries.extend(diff[name]["entries"])
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GameState":
+        """Inverse of `snapshot()`."""
+        return cls(
+            players=[_player_from_dict(p) for p in data.get("players", [])] or [Player(name="Hero")],
+            world=WorldState(**data.get("world", {})),
+            log=list(data.get("log", [])),
+            dice_log=list(data.get("dice_log", [])),
+        )
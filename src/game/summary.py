@@ -0,0 +1,160 @@
+import os
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .narrative import strip_flavor
+
+
+SUMMARY_EVERY = int(os.environ.get("SUMMARY_EVERY", "4"))  # turns folded per update
+SUMMARY_MAX_CHARS = int(os.environ.get("SUMMARY_MAX_CHARS", "600"))
+SUMMARY_RECENT = int(os.environ.get("SUMMARY_RECENT", "6"))  # log entries kept verbatim
+RECENT_ENTRY_CHARS = 160
+EVENT_CHARS = 120
+
+# Events mentioning these survive compression longest
+_KEY_TERMS = (
+    "amulet", "boss", "defeat", "slain", "falls", "dies", "found", "discover", "tracks",
+    "rumor", "bandit", "ruins", "stairs", "shadow", "heal", "learn", "quest",
+)
+_DULL_TERMS = ("quiet", "nothing", "only broken", "hesitate", "not sure", "circles you", "you wait")
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _first_sentence(text: str) -> str:
+    sentence = _SENTENCE_RE.split(text.strip(), 1)[0]
+    return sentence if len(sentence) <= EVENT_CHARS else sentence[: EVENT_CHARS - 1] + "…"
+
+
+def _outcome(dm_text: str) -> str:
+    # The offline narrator spells the engine result out as "Outcome: ..."; LLM text is used as is
+    if "Outcome:" in dm_text:
+        dm_text = dm_text.split("Outcome:", 1)[1].split(" Party:", 1)[0]
+        if ": " in dm_text.split(".", 1)[0]:
+            dm_text = dm_text.split(": ", 1)[1]
+    dm_text = strip_flavor(dm_text)
+    # Drop the scene-setting opener ("The forest is quiet.") when something follows it
+    sentences = [s for s in _SENTENCE_RE.split(dm_text) if s]
+    if len(sentences) > 1 and any(term in sentences[0].lower() for term in _DULL_TERMS):
+        sentences = sentences[1:]
+    return _first_sentence(" ".join(sentences))
+
+
+def _salience(event: str) -> int:
+    text = event.lower()
+    if any(term in text for term in _KEY_TERMS):
+        return 2
+    if any(term in text for term in _DULL_TERMS):
+        return 0
+    return 1
+
+
+def condense(entries: Sequence[str]) -> List[Tuple[str, str]]:
+    """Turn raw log lines into (action, outcome) pairs, e.g. ("Ann: look around", "You spot tracks.")."""
+    events: List[Tuple[str, str]] = []
+    actor_line = ""
+    for entry in entries:
+        who, _, text = entry.partition(": ")
+        if not text:
+            continue
+        if who == "DM":
+            outcome = _outcome(text)
+            if actor_line or outcome:
+                events.append((actor_line, outcome))
+            actor_line = ""
+        else:
+            if actor_line:
+                events.append((actor_line, ""))
+            actor_line = f"{who}: {_first_sentence(text)}"
+    if actor_line:
+        events.append((actor_line, ""))
+    return events
+
+
+class _Event:
+    __slots__ = ("salience", "action", "outcome", "count")
+
+    def __init__(self, action: str, outcome: str):
+        # Rated on the outcome: what happened matters more than what was tried
+        self.salience = _salience(outcome) if outcome else 0
+        self.action = action
+        self.outcome = outcome
+        self.count = 1
+
+    def render(self) -> str:
+        if self.count > 1:
+            return f"{self.outcome} (x{self.count})"
+        if self.action and self.outcome:
+            return f"{self.action} → {self.outcome}"
+        return self.action or self.outcome
+
+
+class RollingSummary:
+    """Fixed-size running summary of a game log, updated incrementally.
+
+    Log entries older than the last `recent` are folded in blocks of
+    `every` turns (two entries per turn), always at the same block
+    boundaries, so rebuilding from a full log gives the same summary as
+    having followed the game turn by turn. When the summary outgrows
+    `max_chars`, the oldest low-salience events are dropped first.
+    Deterministic and offline: no model calls.
+    """
+
+    def __init__(self, every: int = SUMMARY_EVERY, max_chars: int = SUMMARY_MAX_CHARS, recent: int = SUMMARY_RECENT):
+        self.block = max(1, every) * 2
+        self.max_chars = max_chars
+        self.recent = max(2, recent)
+        self.reset()
+
+    def reset(self) -> None:
+        self.events: List[_Event] = []
+        self.dropped = 0
+        self.covered = 0
+        self._first = None
+
+    def update(self, log: Sequence[str]) -> bool:
+        """Fold any complete blocks that left the recent window; True if the summary changed."""
+        first = log[0] if log else None
+        if len(log) < self.covered or first != self._first:
+            # A restarted or replaced game: start over
+            self.reset()
+            self._first = first
+        changed = False
+        while len(log) - self.recent - self.covered >= self.block:
+            for action, outcome in condense(log[self.covered:self.covered + self.block]):
+                last = self.events[-1] if self.events else None
+                if last is not None and outcome and last.outcome == outcome:
+                    # Repeats of the same result collapse into one counted event
+                    last.count += 1
+                else:
+                    self.events.append(_Event(action, outcome))
+            self.covered += self.block
+            self._compress()
+            changed = True
+        return changed
+
+    def _size(self) -> int:
+        return sum(len(e.render()) + 3 for e in self.events)
+
+    def _compress(self) -> None:
+        while self.events and self._size() > self.max_chars:
+            # Oldest event of the lowest salience present goes first
+            lowest = min(e.salience for e in self.events)
+            idx = next(i for i, e in enumerate(self.events) if e.salience == lowest)
+            self.dropped += self.events.pop(idx).count
+
+    @property
+    def text(self) -> str:
+        body = " ; ".join(e.render() for e in self.events)
+        if self.dropped:
+            body = f"(+{self.dropped} earlier events) {body}".strip()
+        return body
+
+    def context(self, log: Sequence[str]) -> Dict[str, Any]:
+        """Summary plus the recent entries not yet folded, both bounded in size."""
+        self.update(log)
+        recent = [
+            entry if len(entry) <= RECENT_ENTRY_CHARS else entry[: RECENT_ENTRY_CHARS - 1] + "…"
+            for entry in log[self.covered:]
+        ]
+        return {"summary": self.text, "recent": recent}
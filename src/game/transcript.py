@@ -0,0 +1,249 @@
+import html
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .journal import JOURNAL_DIR, SessionJournal, iter_history
+
+
+# Rendered records buffered per write; memory is bounded by this, not by campaign length
+TRANSCRIPT_CHUNK = int(os.environ.get("TRANSCRIPT_CHUNK", "200"))
+EXPORT_FORMATS = ("jsonl", "html")
+
+HTML_HEAD = """<!doctype html>
+<html lang="en"><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ background: #0b0e14; color: #e0e6ef; font: 15px/1.5 Georgia, serif; max-width: 52rem; margin: 2rem auto; padding: 0 1rem; }}
+.turn {{ border-left: 3px solid #263043; padding: 0.25rem 0.9rem; margin: 0 0 1rem; }}
+.meta {{ color: #7f8da6; font: 12px/1.4 monospace; }}
+.act {{ color: #6ad0ff; margin: 0.2rem 0; }}
+.outcome {{ color: #b8c7e0; font-style: italic; margin: 0.2rem 0; }}
+.dm {{ margin: 0.2rem 0; }}
+</style></head><body>
+<h1>{title}</h1>
+"""
+HTML_FOOT = "<p class=\"meta\">{count} turns · exported {when}</p>\n</body></html>\n"
+
+
+def split_entry(entry: str) -> tuple:
+    """("DM", "text") from "DM: text" or the demo app's "**DM:** text"."""
+    head, sep, body = entry.partition(":")
+    if not sep or len(head) > 80:
+        return "", entry.strip()
+    return head.strip().strip("*").strip(), body.lstrip("*").strip()
+
+
+class _Prefix:
+    # Read-only view of the first `size` log entries without copying the list
+    def __init__(self, log: Sequence[str], size: int):
+        self.log = log
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> str:
+        return self.log[index]
+
+
+def log_turns(log: Sequence[str]) -> Iterator[Dict[str, Any]]:
+    """Turns rebuilt from the story log alone (no intents or rolls): a player line opens a turn,
+    the DM line after it is its narration, other DM lines stand alone."""
+    current: Optional[Dict[str, Any]] = None
+    number = 0
+    for i in range(len(log)):
+        speaker, text = split_entry(log[i])
+        if speaker == "DM":
+            if current is not None and current["narration"] is None:
+                current["narration"] = text
+                yield current
+                current = None
+            else:
+                yield {"turn": None, "player": None, "text": None, "narration": text}
+            continue
+        if current is not None:
+            yield current
+        number += 1
+        current = {"turn": number, "player": speaker or None, "text": text, "narration": None}
+    if current is not None:
+        yield current
+
+
+def journal_turns(session_id: str, log: Optional[Sequence[str]] = None, root: str = JOURNAL_DIR) -> Iterator[Dict[str, Any]]:
+    """Structured turns from a session's journal history (intent, monster, rolls, engine outcome).
+
+    With `log`, narrations that an LLM replaced after the turn are taken
+    from it, and so are the player names.
+    """
+    events = iter_history(session_id, root)
+    size = len(log) if log is not None else 0
+    number = 0
+    for event in events:
+        if event.get("type") != "turn":
+            continue
+        number += 1
+        changes = event.get("changes") or {}
+        log_diff = changes.get("log") or {}
+        narration = event.get("narration")
+        player = None
+        entries = log_diff.get("entries") or []
+        if entries:
+            dm_index = int(log_diff.get("start", 0)) + len(entries) - 1
+            if 0 <= dm_index < size:
+                speaker, text = split_entry(log[dm_index])
+                if speaker == "DM":
+                    narration = text
+            if dm_index - 1 >= 0 and dm_index - 1 < size:
+                player = split_entry(log[dm_index - 1])[0] or None
+            elif len(entries) >= 2:
+                player = split_entry(entries[-2])[0] or None
+        world = changes.get("world") or {}
+        yield {
+            "turn": number,
+            "game_turn": world.get("turn"),
+            "seq": event.get("seq"),
+            "ts": event.get("ts"),
+            "actor": event.get("actor"),
+            "player": player,
+            "text": event.get("text"),
+            "intent": event.get("intent"),
+            "confidence": event.get("confidence"),
+            "monster": event.get("monster"),
+            "dice": (changes.get("dice_log") or {}).get("entries") or [],
+            "engine": event.get("engine"),
+            "narration": narration,
+        }
+
+
+def render_jsonl(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def render_html(record: Dict[str, Any]) -> str:
+    esc = html.escape
+    if record.get("text") is None:
+        return f"<p class=\"dm\">{esc(record.get('narration') or '')}</p>\n"
+    meta = [f"#{record['turn']}"]
+    if record.get("game_turn") is not None:
+        meta.append(f"turn {record['game_turn']}")
+    if record.get("intent"):
+        meta.append(f"intent {esc(str(record['intent']))} ({float(record.get('confidence') or 0.0):.2f})")
+    monster = record.get("monster") or {}
+    if isinstance(monster, dict) and monster.get("action") not in (None, "idle"):
+        meta.append(f"monster {esc(str(monster['action']))}")
+    if record.get("dice"):
+        meta.append("rolls " + esc(", ".join(record["dice"])))
+    parts = [f"<section class=\"turn\"><div class=\"meta\">{' · '.join(meta)}</div>"]
+    parts.append(f"<p class=\"act\"><b>{esc(record.get('player') or 'Player')}:</b> {esc(record['text'])}</p>")
+    if record.get("engine"):
+        parts.append(f"<p class=\"outcome\">{esc(record['engine'])}</p>")
+    if record.get("narration"):
+        parts.append(f"<p class=\"dm\">{esc(record['narration'])}</p>")
+    parts.append("</section>\n")
+    return "".join(parts)
+
+
+def iter_export(turns: Iterable[Dict[str, Any]], fmt: str = "jsonl", title: str = "Transcript", chunk: int = TRANSCRIPT_CHUNK) -> Iterator[str]:
+    """The export as text chunks of up to `chunk` records each; usable as an HTTP streaming body."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown transcript format {fmt!r}")
+    render = render_html if fmt == "html" else render_jsonl
+    if fmt == "html":
+        yield HTML_HEAD.format(title=html.escape(title))
+    buffer: List[str] = []
+    count = 0
+    for record in turns:
+        buffer.append(render(record))
+        if record.get("text") is not None:
+            count += 1
+        if len(buffer) >= chunk:
+            yield "".join(buffer)
+            buffer.clear()
+    if buffer:
+        yield "".join(buffer)
+    if fmt == "html":
+        yield HTML_FOOT.format(count=count, when=time.strftime("%Y-%m-%d %H:%M"))
+
+
+class TranscriptExport:
+    """One background export to a file; poll `done`, `written` and `error`."""
+
+    def __init__(self, path: str, fmt: str):
+        self.path = path
+        self.fmt = fmt
+        self.written = 0  # characters so far
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self.error: Optional[str] = None
+        self.future: Optional[Future] = None
+
+    @property
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def run(self, turns: Iterable[Dict[str, Any]], title: str) -> None:
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                for text in iter_export(turns, self.fmt, title):
+                    f.write(text)
+                    self.written += len(text)
+            os.replace(tmp, self.path)
+        except Exception as exc:
+            self.error = f"{type(exc).__name__}: {exc}"
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        finally:
+            self.finished = time.time()
+
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="transcript")
+        return _EXECUTOR
+
+
+def session_turns(log: Sequence[str], journal: Optional[SessionJournal] = None) -> Iterator[Dict[str, Any]]:
+    """Turns of a live session: structured from its journal when it has one, else from the log.
+
+    Only log entries present at the call are used, so a game that keeps
+    going does not stretch the export.
+    """
+    visible = _Prefix(log, len(log))
+    if journal is None:
+        return log_turns(visible)
+    journal.flush()
+    return journal_turns(journal.session_id, visible, os.path.dirname(journal.dir))
+
+
+def iter_log_text(log: Sequence[str], chunk: int = TRANSCRIPT_CHUNK) -> Iterator[str]:
+    """The plain story log, one entry per line, in chunks."""
+    size = len(log)
+    for start in range(0, size, chunk):
+        yield "".join(entry + "\n" for entry in log[start:min(size, start + chunk)])
+
+
+def export_transcript(
+    path: str,
+    fmt: str,
+    log: Sequence[str],
+    journal: Optional[SessionJournal] = None,
+    title: str = "Transcript",
+) -> TranscriptExport:
+    """Start writing a transcript to `path` in the background and return its handle."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown transcript format {fmt!r}")
+    turns = session_turns(log, journal)
+    export = TranscriptExport(path, fmt)
+    export.future = _executor().submit(export.run, turns, title)
+    return export
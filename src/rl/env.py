@@ -4,6 +4,7 @@ import numpy as np
 from typing import Tuple, Dict
 from ..game.state import GameState
 from ..game.policies.rule_based import decide_response
+from .numpy_policy import observation
 
 
 class DungeonMasterEnv(gym.Env):
@@ -25,12 +26,8 @@ class DungeonMasterEnv(gym.Env):
         self.last_player_action = "start"
 
     def _obs(self) -> np.ndarray:
-        loc_code = {"village": 0, "forest": 1, "ruins": 2}.get(self.state.world.location, 0)
-        return np.array([
-            loc_code,
-            int(self.state.world.danger_level),
-            int(sum(self.state.world.flags.values())),
-        ], dtype=np.int32)
+        world = self.state.world
+        return observation(world.location, world.danger_level, world.flags)
 
     def reset(self, *, seed: int | None = None, options: Dict | None = None):
         super().reset(seed=seed)
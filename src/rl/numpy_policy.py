@@ -0,0 +1,94 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Exported by src/tools/export_policy.py from dm_ppo.zip; loading it needs NumPy only (no torch/SB3)
+DM_POLICY_PATH = os.environ.get("DM_POLICY_PATH", os.path.join("reports", "artifacts", "dm_policy.npz"))
+INTENTS = ("narrate", "hint", "escalate", "reward")
+LOCATION_CODES = {"village": 0, "forest": 1, "ruins": 2}
+
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "identity": lambda x: x,
+}
+
+
+def observation(location: str, danger_level: int, flags: Dict[str, Any]) -> np.ndarray:
+    """The DungeonMasterEnv observation for a world: [location code, danger, flags set]."""
+    return np.array([
+        LOCATION_CODES.get(location, 0),
+        int(danger_level),
+        int(sum(flags.values())),
+    ], dtype=np.int32)
+
+
+class NumpyPolicy:
+    """Deterministic forward pass of an exported SB3 MlpPolicy actor (argmax of the action logits).
+
+    `layers` are (weight [out, in], bias [out], activation) in order, the
+    last one producing the logits. Math is float32 like torch, so actions
+    match `PPO.predict(obs, deterministic=True)`.
+    """
+
+    def __init__(self, layers: Sequence[Tuple[np.ndarray, np.ndarray, str]], intents: Sequence[str] = INTENTS):
+        self.layers = [(np.ascontiguousarray(w.T, dtype=np.float32), b.astype(np.float32), act) for w, b, act in layers]
+        self._apply = [(w, b, ACTIVATIONS[act]) for w, b, act in self.layers]
+        self.intents = list(intents)
+        # Live observations are three small ints, so each distinct one is evaluated once
+        self._cache: Dict[Tuple[int, ...], str] = {}
+
+    @classmethod
+    def load(cls, path: str = DM_POLICY_PATH) -> "NumpyPolicy":
+        with np.load(path, allow_pickle=False) as data:
+            count = int(data["layers"])
+            layers = [(data[f"w{i}"], data[f"b{i}"], str(data[f"act{i}"])) for i in range(count)]
+            return cls(layers, [str(name) for name in data["intents"]])
+
+    def save(self, path: str) -> None:
+        arrays: Dict[str, Any] = {"layers": np.array(len(self.layers)), "intents": np.array(self.intents)}
+        for i, (w, b, act) in enumerate(self.layers):
+            arrays[f"w{i}"] = w.T
+            arrays[f"b{i}"] = b
+            arrays[f"act{i}"] = np.array(act)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    def logits(self, obs: np.ndarray) -> np.ndarray:
+        x = np.asarray(obs, dtype=np.float32)
+        for w, b, act in self._apply:
+            x = act(x @ w + b)
+        return x
+
+    def predict(self, obs: np.ndarray) -> np.ndarray:
+        """Action indices for a batch of observations (or one index for a single one)."""
+        return np.argmax(self.logits(obs), axis=-1)
+
+    def intent(self, location: str, danger_level: int, flags: Dict[str, Any]) -> str:
+        key = (LOCATION_CODES.get(location, 0), int(danger_level), int(sum(flags.values())))
+        name = self._cache.get(key)
+        if name is None:
+            name = self._cache[key] = self.intents[int(self.predict(np.array(key, dtype=np.int32)))]
+        return name
+
+
+_POLICY: Optional[Any] = None  # False once loading failed
+_POLICY_LOCK = threading.Lock()
+
+
+def load_policy() -> Optional[NumpyPolicy]:
+    # Loaded once per process; None when no bundle has been exported
+    global _POLICY
+    with _POLICY_LOCK:
+        if _POLICY is None:
+            _POLICY = False
+            if os.path.exists(DM_POLICY_PATH):
+                try:
+                    _POLICY = NumpyPolicy.load(DM_POLICY_PATH)
+                except Exception:
+                    pass
+        return _POLICY if _POLICY is not False else None
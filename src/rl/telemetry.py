@@ -0,0 +1,109 @@
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, IO, Optional
+
+from stable_baselines3.common.callbacks import BaseCallback
+
+
+# Episodes kept in memory for plots; the run file keeps all of them
+TRAIN_TELEMETRY_HISTORY = int(os.environ.get("TRAIN_TELEMETRY_HISTORY", "5000"))
+TELEMETRY_FILE = "telemetry.jsonl"
+
+
+class TrainingTelemetry(BaseCallback):
+    """Per-episode reward, length and steps/sec as episodes finish during `learn`.
+
+    Reads the "episode" entries Monitor/VecMonitor put in step infos, keeps
+    the latest `history` in memory and appends every one to `path` (JSONL,
+    flushed after each rollout). Totals cover all episodes, not just the
+    kept ones.
+    """
+
+    def __init__(self, path: Optional[str] = None, history: int = TRAIN_TELEMETRY_HISTORY, verbose: int = 0):
+        super().__init__(verbose)
+        self.path = path
+        self.records: Deque[Dict[str, Any]] = deque(maxlen=max(1, history))
+        self.episodes = 0
+        self.reward_sum = 0.0
+        self.length_sum = 0
+        self.best_reward: Optional[float] = None
+        self.rollouts = 0
+        self._file: Optional[IO[str]] = None
+        self._start = 0.0
+        self._start_steps = 0
+
+    def _on_training_start(self) -> None:
+        self._start = time.perf_counter()
+        self._start_steps = self.num_timesteps
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def steps_per_sec(self) -> float:
+        elapsed = time.perf_counter() - self._start
+        return (self.num_timesteps - self._start_steps) / elapsed if elapsed > 0 else 0.0
+
+    def _on_step(self) -> bool:
+        for env_index, info in enumerate(self.locals.get("infos") or ()):
+            episode = info.get("episode")
+            if episode is None:
+                continue
+            self.episodes += 1
+            reward, length = float(episode["r"]), int(episode["l"])
+            self.reward_sum += reward
+            self.length_sum += length
+            self.best_reward = reward if self.best_reward is None else max(self.best_reward, reward)
+            record = {
+                "episode": self.episodes,
+                "env": env_index,
+                "reward": reward,
+                "length": length,
+                "timesteps": int(self.num_timesteps),
+                "steps_per_sec": round(self.steps_per_sec(), 1),
+                "ts": round(time.time(), 3),
+            }
+            self.records.append(record)
+            if self._file is not None:
+                self._file.write(json.dumps(record) + "\n")
+        return True
+
+    def _on_rollout_end(self) -> None:
+        self.rollouts += 1
+        if self._file is not None:
+            self._file.flush()
+
+    def _on_training_end(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def summary(self, recent: int = 100) -> Dict[str, Any]:
+        last = list(self.records)[-recent:]
+        return {
+            "episodes": self.episodes,
+            "mean_reward": self.reward_sum / self.episodes if self.episodes else 0.0,
+            "mean_length": self.length_sum / self.episodes if self.episodes else 0.0,
+            "best_reward": self.best_reward,
+            f"mean_reward_last_{recent}": sum(r["reward"] for r in last) / len(last) if last else 0.0,
+            "steps_per_sec": self.steps_per_sec(),
+            "rollouts": self.rollouts,
+        }
+
+    def plot(self, path: str) -> bool:
+        """Episode rewards from memory to a PNG; False when no episode finished."""
+        if not self.records:
+            return False
+        import matplotlib.pyplot as plt
+
+        episodes = [r["episode"] for r in self.records]
+        plt.figure(figsize=(6,4))
+        plt.plot(episodes, [r["reward"] for r in self.records])
+        plt.title('PPO Episode Rewards')
+        plt.xlabel('Episode')
+        plt.ylabel('Reward')
+        plt.tight_layout()
+        plt.savefig(path)
+        plt.close()
+        return True
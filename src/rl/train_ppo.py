@@ -1,49 +1,116 @@
 from stable_baselines3 import PPO
-from stable_baselines3.common.vec_env import DummyVecEnv
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv, VecMonitor
 from stable_baselines3.common.monitor import Monitor
-import matplotlib.pyplot as plt
+from gymnasium.wrappers import TimeLimit
 import os
+import random
+import time
+from typing import Any, Dict, Optional
 from .env import DungeonMasterEnv
+from .telemetry import TELEMETRY_FILE, TrainingTelemetry
+from .vec_env import DungeonMasterVecEnv
 
 
-def train_ppo(total_timesteps: int = 5000, save_path: str = "dm_ppo.zip") -> None:
-    def make_env():
-        return DungeonMasterEnv()
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+# numpy: all worlds as arrays in this process; dummy: DungeonMasterEnv copies in this
+# process; subproc: one DungeonMasterEnv per worker process
+VEC_BACKENDS = ("numpy", "dummy", "subproc")
+# Turns before an episode is cut off (the quest rarely ends on its own), so monitors see episodes
+EPISODE_STEPS = 200
+
+
+def default_n_envs(vec_backend: str) -> int:
+    if vec_backend == "numpy":
+        return 16
+    if vec_backend == "subproc":
+        return os.cpu_count() or 1
+    return 1
+
+
+def _env_fn(rank: int, seed: Optional[int], monitor_dir: Optional[str], max_steps: Optional[int]):
+    def _init():
+        # The rule engine rolls dice with `random`; without this, forked workers share one stream
+        random.seed(None if seed is None else seed + rank)
+        env = DungeonMasterEnv()
+        if max_steps is not None:
+            env = TimeLimit(env, max_episode_steps=max_steps)
+        env = Monitor(env, filename=os.path.join(monitor_dir, str(rank)) if monitor_dir else None)
+        env.reset(seed=None if seed is None else seed + rank)
+        env.action_space.seed(None if seed is None else seed + rank)
+        return env
+
+    return _init
 
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "reports", "figures")
-    os.makedirs(logs_dir, exist_ok=True)
 
-    def make_monitored():
-        return Monitor(DungeonMasterEnv())
+def make_vec_env(
+    n_envs: int,
+    vec_backend: str = "numpy",
+    seed: Optional[int] = None,
+    monitor_dir: Optional[str] = None,
+    max_steps: Optional[int] = EPISODE_STEPS,
+) -> VecEnv:
+    """`n_envs` monitored DungeonMaster worlds on the given backend, env i seeded with `seed + i`.
 
-    env = DummyVecEnv([make_monitored])
-    model = PPO("MlpPolicy", env, verbose=1)
-    model.learn(total_timesteps=total_timesteps)
+    dummy/subproc write one `<i>.monitor.csv` per env to `monitor_dir`; numpy
+    worlds share one `numpy.monitor.csv`.
+    """
+    if vec_backend not in VEC_BACKENDS:
+        raise ValueError(f"unknown vec backend {vec_backend!r}; expected one of {VEC_BACKENDS}")
+    if monitor_dir:
+        os.makedirs(monitor_dir, exist_ok=True)
+    if vec_backend == "numpy":
+        env = DungeonMasterVecEnv(n_envs, seed=seed, max_steps=max_steps)
+        return VecMonitor(env, filename=os.path.join(monitor_dir, "numpy") if monitor_dir else None)
+    env_fns = [_env_fn(rank, seed, monitor_dir, max_steps) for rank in range(n_envs)]
+    if vec_backend == "subproc":
+        return SubprocVecEnv(env_fns)
+    return DummyVecEnv(env_fns)
+
+
+def train_ppo(
+    total_timesteps: int = 5000,
+    save_path: str = "dm_ppo.zip",
+    n_envs: Optional[int] = None,
+    vec_backend: str = "numpy",
+    seed: Optional[int] = None,
+    monitor_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Train PPO and save it; returns steps/sec, episode stats and the run's directory
+    (monitor CSVs plus telemetry.jsonl)."""
+    logs_dir = os.path.join(REPO_ROOT, "reports", "figures")
+    os.makedirs(logs_dir, exist_ok=True)
+    n_envs = n_envs or default_n_envs(vec_backend)
+    if monitor_dir is None:
+        monitor_dir = os.path.join(REPO_ROOT, "reports", "monitors", time.strftime("%Y%m%d-%H%M%S") + f"-{vec_backend}{n_envs}")
+
+    env = make_vec_env(n_envs, vec_backend, seed=seed, monitor_dir=monitor_dir)
+    # Keep ~2048 transitions per rollout whatever the number of envs
+    model = PPO("MlpPolicy", env, n_steps=max(16, 2048 // n_envs), seed=seed, verbose=1)
+    telemetry = TrainingTelemetry(os.path.join(monitor_dir, TELEMETRY_FILE))
+    start = time.perf_counter()
+    model.learn(total_timesteps=total_timesteps, callback=telemetry)
+    elapsed = time.perf_counter() - start
     model.save(save_path)
+    env.close()
+    stats = {
+        "vec_backend": vec_backend,
+        "n_envs": n_envs,
+        "cpus": os.cpu_count(),
+        "timesteps": int(model.num_timesteps),
+        "seconds": elapsed,
+        "steps_per_sec": model.num_timesteps / elapsed if elapsed > 0 else 0.0,
+        "monitor_dir": monitor_dir,
+        "episodes": telemetry.summary(),
+    }
+    print(f"{stats['timesteps']} steps in {elapsed:.1f}s with {n_envs} {vec_backend} envs: {stats['steps_per_sec']:,.0f} steps/s")
+    episodes = stats["episodes"]
+    if episodes["episodes"]:
+        print(f"{episodes['episodes']} episodes, mean reward {episodes['mean_reward']:.2f} (last 100: {episodes['mean_reward_last_100']:.2f}), mean length {episodes['mean_length']:.0f}")
 
-    # Plot episode rewards if available
-    monitor_files = [f for f in os.listdir('.') if f.startswith('monitor') and f.endswith('.csv')]
-    if monitor_files:
-        try:
-            import pandas as pd
-            rewards = []
-            for f in monitor_files:
-                df = pd.read_csv(f, comment='#')
-                rewards.extend(df['r'].tolist())
-            if rewards:
-                plt.figure(figsize=(6,4))
-                plt.plot(rewards)
-                plt.title('PPO Episode Rewards')
-                plt.xlabel('Episode')
-                plt.ylabel('Reward')
-                plt.tight_layout()
-                plt.savefig(os.path.join(logs_dir, 'ppo_rewards.png'))
-                plt.close()
-        except Exception:
-            pass
+    # Episode rewards from the callback's buffer (not from rescanning monitor files)
+    telemetry.plot(os.path.join(logs_dir, 'ppo_rewards.png'))
+    return stats
 
 
 if __name__ == "__main__":
     train_ppo()
-
-
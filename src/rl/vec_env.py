@@ -0,0 +1,165 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+
+
+VILLAGE, FOREST, RUINS = 0, 1, 2
+LOCATIONS = ("village", "forest", "ruins")
+# Columns of the flags array; only flags the four synthetic actions can set
+FLAGS = ("rumor_bandits", "found_tracks", "boss_defeated", "amulet_found")
+RUMOR, TRACKS, DEFEATED, AMULET = range(len(FLAGS))
+# Action indices, same order as DungeonMasterEnv.intents
+NARRATE, HINT, ESCALATE, REWARD = range(4)
+
+TRACKS_DC = 12  # forest "look around" without tracks: d20 >= 12 finds them
+AMULET_DC = 14  # ruins "descend stairs": d20 >= 14 finds the amulet
+BOSS_HP = 10
+DANGER_LEVEL = 1  # WorldState default; no synthetic action changes it
+
+
+class DungeonMasterVecEnv(VecEnv):
+    """`num_envs` DungeonMasterEnv worlds held as NumPy arrays and stepped together.
+
+    Each action index stands for the synthetic player line DungeonMasterEnv
+    sends to `decide_response` ("look around", "talk to villager", "go to
+    forest", "descend stairs"). Those four lines only reach a handful of
+    rule-engine branches, which `advance` applies as masked array updates:
+
+    - village: talk → rumor_bandits; go to forest → forest
+    - forest, no boss: look around → d20 >= 12 finds tracks (no roll once
+      found); talk to villager ("village") → the bandit leader appears with
+      10 HP, or back to the village once defeated
+    - forest, boss fighting: none of the four lines attacks, casts or flees
+    - ruins: descend stairs → d20 >= 14 finds the amulet; talk to villager
+      → village, and the episode ends if the amulet was found
+
+    Everything else is narration only. Observations and rewards match
+    DungeonMasterEnv; finished worlds are reset in place and their last
+    observation is returned in `infos[i]["terminal_observation"]`, as
+    SB3 expects from a VecEnv. With `max_steps`, a world is also cut off
+    after that many turns, like gymnasium's TimeLimit wrapper.
+    """
+
+    def __init__(self, num_envs: int = 8, seed: Optional[int] = None, max_steps: Optional[int] = None):
+        self.render_mode = None
+        self.intents = ["narrate", "hint", "escalate", "reward"]
+        observation_space = spaces.Box(low=0, high=100, shape=(3,), dtype=np.int32)
+        action_space = spaces.Discrete(len(self.intents))
+        self.n = num_envs
+        self.max_steps = max_steps
+        super().__init__(num_envs, observation_space, action_space)
+        self.rng = np.random.default_rng(seed)
+        self.loc = np.zeros(num_envs, dtype=np.int8)
+        self.flags = np.zeros((num_envs, len(FLAGS)), dtype=bool)
+        self.boss_active = np.zeros(num_envs, dtype=bool)
+        self.boss_hp = np.zeros(num_envs, dtype=np.int16)
+        self.turn = np.zeros(num_envs, dtype=np.int32)
+        self.danger = np.full(num_envs, DANGER_LEVEL, dtype=np.int32)
+        self._actions = np.zeros(num_envs, dtype=np.int64)
+
+    def _reset_worlds(self, mask: np.ndarray) -> None:
+        self.loc[mask] = VILLAGE
+        self.flags[mask] = False
+        self.boss_active[mask] = False
+        self.boss_hp[mask] = 0
+        self.turn[mask] = 0
+        self.danger[mask] = DANGER_LEVEL
+
+    def _obs(self) -> np.ndarray:
+        return np.stack([self.loc.astype(np.int32), self.danger, self.flags.sum(axis=1, dtype=np.int32)], axis=1)
+
+    def advance(self, actions: np.ndarray, rolls: np.ndarray) -> np.ndarray:
+        """Apply one action per world with the given d20 `rolls` (one per world, used only
+        where the rule engine would roll); returns the `done` mask."""
+        actions = np.asarray(actions).reshape(self.n)
+        village = self.loc == VILLAGE
+        forest = self.loc == FOREST
+        ruins = self.loc == RUINS
+        self.turn += 1
+
+        self.flags[village & (actions == HINT), RUMOR] = True
+        self.loc[village & (actions == ESCALATE)] = FOREST
+
+        calm = forest & ~self.boss_active
+        search = calm & (actions == NARRATE) & ~self.flags[:, TRACKS]
+        self.flags[search & (rolls >= TRACKS_DC), TRACKS] = True
+        talk = calm & (actions == HINT)
+        spawn = talk & ~self.flags[:, DEFEATED]
+        self.boss_active[spawn] = True
+        self.boss_hp[spawn] = BOSS_HP
+        self.loc[talk & self.flags[:, DEFEATED]] = VILLAGE
+
+        self.flags[ruins & (actions == REWARD) & (rolls >= AMULET_DC), AMULET] = True
+        leave = ruins & (actions == HINT)
+        self.loc[leave] = VILLAGE
+        return leave & self.flags[:, AMULET]
+
+    def reset(self) -> np.ndarray:
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+        self._reset_worlds(np.ones(self.n, dtype=bool))
+        return self._obs()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions)
+
+    def step_wait(self):
+        rolls = self.rng.integers(1, 21, size=self.n)
+        terminated = self.advance(self._actions, rolls)
+        rewards = self.flags[:, AMULET].astype(np.float32) + terminated
+        dones = terminated
+        if self.max_steps is not None:
+            dones = terminated | (self.turn >= self.max_steps)
+        obs = self._obs()
+        infos: List[Dict[str, Any]] = [{} for _ in range(self.n)]
+        if dones.any():
+            for i in np.flatnonzero(dones):
+                infos[i]["terminal_observation"] = obs[i].copy()
+                infos[i]["TimeLimit.truncated"] = not terminated[i]
+            self._reset_worlds(dones)
+            obs[dones] = self._obs()[dones]
+        return obs, rewards, dones, infos
+
+    def state_of(self, index: int) -> Dict[str, Any]:
+        """World `index` in GameState terms (location, flags, boss, turn)."""
+        return {
+            "location": LOCATIONS[self.loc[index]],
+            "danger_level": int(self.danger[index]),
+            "turn": int(self.turn[index]),
+            "flags": {name: True for name, on in zip(FLAGS, self.flags[index]) if on},
+            "boss_active": bool(self.boss_active[index]),
+            "boss_hp": int(self.boss_hp[index]),
+        }
+
+    def render(self, mode: Optional[str] = None) -> Optional[np.ndarray]:
+        for i in range(self.n):
+            state = self.state_of(i)
+            print(f"[{i}] Loc={state['location']}, Flags={state['flags']}")
+        return None
+
+    def close(self) -> None:
+        pass
+
+    def _indices(self, indices) -> Sequence[int]:
+        if indices is None:
+            return range(self.n)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return [getattr(self, attr_name) for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False for _ in self._indices(indices)]
@@ -0,0 +1 @@
+# Headless game server (src/server/api.py)
@@ -0,0 +1,381 @@
+import asyncio
+import contextlib
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set
+
+try:
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, StreamingResponse
+    from starlette.routing import Route, WebSocketRoute
+    from starlette.websockets import WebSocket, WebSocketDisconnect
+except Exception:  # starlette/uvicorn ship with streamlit; the server is optional
+    Starlette = None
+
+from src.game.journal import SessionJournal, new_session_id
+from src.game.state import GameState
+from src.game.transcript import EXPORT_FORMATS, iter_export, iter_log_text, session_turns
+from src.ui.game_session import GameSession, _state_to_dict
+
+
+SERVER_MAX_SESSIONS = int(os.environ.get("SERVER_MAX_SESSIONS", "10000"))
+# Threads running turns; GameSession is synchronous (engine, local models)
+SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", "8"))
+# Clients pause between turns; keep their connections open across a typical think time
+SERVER_KEEPALIVE_S = int(os.environ.get("SERVER_KEEPALIVE_S", "75"))
+SERVER_LOG_TAIL = 20  # log entries returned with each state
+SWEEP_INTERVAL_S = 5.0
+NARRATION_POLL_S = 0.1
+MAX_PLAYERS = 6
+MAX_TEXT = 500
+LATENCY_WINDOW = 10000
+
+TRANSCRIPT_MEDIA_TYPES = {"jsonl": "application/x-ndjson; charset=utf-8", "html": "text/html; charset=utf-8"}
+
+INTRO = "{party} gather as dusk falls over the old road. A cold wind hints at secrets beyond the village."
+
+
+class APIError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class ServerSession:
+    id: str
+    game: GameSession
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    created: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    next_actor: int = 0
+    ended: bool = False
+    subscribers: Set[Any] = field(default_factory=set)
+    settling: Optional[asyncio.Task] = None
+    evicted: bool = False  # moved out of memory by a SessionStore; look it up again
+    waiting: int = 0  # requests queued on the lock; a session someone waits for is not evicted
+
+    def view(self, tail: int = SERVER_LOG_TAIL) -> Dict[str, Any]:
+        state = self.game.state
+        data = _state_to_dict(state)
+        log = state.log
+        data.update({
+            "id": self.id,
+            "version": state.version,
+            "ended": self.ended,
+            "next_actor": self.next_actor,
+            "log_size": len(log),
+            "log_tail": log[-tail:] if tail > 0 else [],
+            "narration_pending": self.game.has_pending_narration(),
+        })
+        return data
+
+
+class SessionTable:
+    """In-memory session table; every session shares the process-wide models and clients.
+
+    Coroutines so a table with a slower tier (see store.SessionStore) can wait on it.
+    """
+
+    def __init__(self, max_sessions: int = SERVER_MAX_SESSIONS, journal: bool = False):
+        self.max_sessions = max_sessions
+        self.journal = journal
+        self.sessions: Dict[str, ServerSession] = {}
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    async def create(self, players: int = 1, names: Optional[List[str]] = None, seed: str = "") -> ServerSession:
+        if len(self.sessions) >= self.max_sessions:
+            raise APIError(503, "session table full")
+        session_id = new_session_id()
+        state = GameState()
+        state.reset(num_players=max(1, min(MAX_PLAYERS, players)))
+        state.world.story_seed = seed[:MAX_TEXT]
+        for i, player in enumerate(state.players):
+            name = (names or [])[i] if i < len(names or []) else ""
+            player.name = str(name)[:40] or f"Player {i + 1}"
+        game = GameSession(state, journal=SessionJournal(session_id) if self.journal else None)
+        game.append_log("DM", INTRO.format(party=", ".join(p.name for p in state.players)))
+        game.begin()
+        session = ServerSession(session_id, game)
+        self.sessions[session_id] = session
+        return session
+
+    async def get(self, session_id: str) -> ServerSession:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise APIError(404, "unknown session")
+        session.last_used = time.time()
+        return session
+
+    async def remove(self, session_id: str) -> bool:
+        session = self.sessions.pop(session_id, None)
+        if session is not None and session.game.journal is not None:
+            session.game.journal.close()
+        return session is not None
+
+    async def sweep(self) -> int:
+        # Nothing to evict when everything lives in memory (see store.SessionStore)
+        return 0
+
+    async def close(self) -> None:
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"hot": len(self.sessions)}
+
+
+class GameServer:
+    """Turn handling shared by the HTTP and WebSocket endpoints."""
+
+    def __init__(self, table: Optional[SessionTable] = None, workers: int = SERVER_WORKERS):
+        self.table = table if table is not None else SessionTable()
+        self.pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="turn")
+        self.started = time.time()
+        self.turn_latency: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.stats = {"created": 0, "deleted": 0, "turns": 0, "errors": 0, "pushes": 0}
+
+    async def act(self, session: ServerSession, text: str, actor: Optional[int] = None) -> Dict[str, Any]:
+        text = (text or "").strip()[:MAX_TEXT]
+        if not text:
+            raise APIError(400, "empty action")
+        await self._lock_session(session)
+        while session.evicted:
+            # Evicted to the cold tier before this request got here; act on the reloaded copy
+            session.lock.release()
+            session = await self.table.get(session.id)
+            await self._lock_session(session)
+        try:
+            if session.ended:
+                raise APIError(409, "game over")
+            players = len(session.game.state.players)
+            actor = session.next_actor if actor is None else int(actor)
+            if not -1 <= actor < players:
+                raise APIError(400, "bad actor")
+            start = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            if actor == -1:
+                narration, panel = await loop.run_in_executor(
+                    self.pool, session.game.handle_group_action, list(range(players)), text
+                )
+            else:
+                narration, panel = await loop.run_in_executor(self.pool, session.game.handle_player_action, actor, text)
+            self.turn_latency.append(time.perf_counter() - start)
+            self.stats["turns"] += 1
+            session.ended = bool(panel.get("ended"))
+            session.next_actor = 0 if actor == -1 else (actor + 1) % players
+            result = {"narration": narration, "panel": panel, "state": session.view(tail=2)}
+        finally:
+            session.lock.release()
+        if session.game.has_pending_narration() and (session.settling is None or session.settling.done()):
+            session.settling = asyncio.create_task(self._settle(session))
+        return result
+
+    async def _lock_session(self, session: ServerSession) -> None:
+        # Between a release and the next waiter waking the lock reads as free; `waiting`
+        # keeps the session hot for that window so the waiter never wakes on an evicted copy
+        session.waiting += 1
+        try:
+            await session.lock.acquire()
+        finally:
+            session.waiting -= 1
+
+    async def _settle(self, session: ServerSession) -> None:
+        # Late LLM narrations replace their fallback line; subscribers get partials and the final text
+        streamed: Dict[int, str] = {}
+        while session.game.has_pending_narration():
+            await asyncio.sleep(NARRATION_POLL_S)
+            async with session.lock:
+                partials = session.game.streaming_narration()
+                changed = session.game.poll_narration()
+            for index, text in partials.items():
+                if streamed.get(index) != text:
+                    streamed[index] = text
+                    await self.push(session, {"type": "partial", "index": index, "text": text})
+            if changed:
+                await self.push(session, {"type": "narration", "state": session.view(tail=2)})
+
+    async def push(self, session: ServerSession, message: Dict[str, Any]) -> None:
+        for ws in list(session.subscribers):
+            try:
+                await ws.send_json(message)
+                self.stats["pushes"] += 1
+            except Exception:
+                session.subscribers.discard(ws)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self.turn_latency)
+
+        def pct(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(p / 100.0 * len(latencies)))] * 1000 if latencies else 0.0
+
+        return {
+            **self.stats,
+            "sessions": len(self.table),
+            "uptime_s": time.time() - self.started,
+            "max_rss_mb": _max_rss_mb(),
+            "turn_ms": {"p50": pct(50), "p95": pct(95), "p99": pct(99)},
+            "store": self.table.snapshot(),
+        }
+
+    async def maintain(self, interval: float = SWEEP_INTERVAL_S) -> None:
+        # Periodic eviction of idle sessions; runs for the lifetime of the app
+        while True:
+            await asyncio.sleep(interval)
+            await self.table.sweep()
+
+
+def _max_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # not on Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+async def _body(request: "Request") -> Dict[str, Any]:
+    try:
+        data = await request.json()
+    except Exception:
+        raise APIError(400, "expected a JSON body")
+    if not isinstance(data, dict):
+        raise APIError(400, "expected a JSON object")
+    return data
+
+
+def create_app(server: Optional[GameServer] = None) -> "Starlette":
+    """ASGI app: POST /sessions, POST /sessions/{id}/act, GET /sessions/{id}[/transcript], DELETE /sessions/{id}, WS /sessions/{id}/ws."""
+    if Starlette is None:
+        raise RuntimeError("The game server needs starlette and uvicorn (installed with streamlit).")
+    server = server or GameServer()
+    table = server.table
+
+    def endpoint(handler):
+        async def wrapped(request: Request):
+            try:
+                return await handler(request)
+            except APIError as exc:
+                server.stats["errors"] += 1
+                return JSONResponse({"error": exc.message}, status_code=exc.status)
+            except (TypeError, ValueError, AttributeError):
+                server.stats["errors"] += 1
+                return JSONResponse({"error": "bad request"}, status_code=400)
+        return wrapped
+
+    @endpoint
+    async def create(request: Request):
+        data = await _body(request) if await request.body() else {}
+        names = data.get("names") or []
+        if not isinstance(names, list):
+            raise APIError(400, "names must be a list")
+        session = await table.create(int(data.get("players") or len(names) or 1), names, str(data.get("seed") or ""))
+        server.stats["created"] += 1
+        return JSONResponse(session.view(), status_code=201)
+
+    @endpoint
+    async def act(request: Request):
+        data = await _body(request)
+        # Nothing yields between the lookup returning and the session lock, so the session cannot be evicted in between
+        session = await table.get(request.path_params["sid"])
+        return JSONResponse(await server.act(session, str(data.get("text") or ""), data.get("actor")))
+
+    @endpoint
+    async def state(request: Request):
+        session = await table.get(request.path_params["sid"])
+        tail = int(request.query_params.get("tail", SERVER_LOG_TAIL))
+        return JSONResponse(session.view(tail=tail))
+
+    @endpoint
+    async def transcript(request: Request):
+        # Streamed in chunks: jsonl/html are structured turns (from the journal when enabled)
+        session = await table.get(request.path_params["sid"])
+        fmt = request.query_params.get("format", "text")
+        log = session.game.state.log
+        if fmt == "json":
+            return JSONResponse({"id": session.id, "log": list(log)})
+        if fmt in EXPORT_FORMATS:
+            body = iter_export(session_turns(log, session.game.journal), fmt, title=f"Session {session.id}")
+            return StreamingResponse(body, media_type=TRANSCRIPT_MEDIA_TYPES[fmt])
+        if fmt != "text":
+            raise APIError(400, f"format must be text, json or one of {', '.join(EXPORT_FORMATS)}")
+        return StreamingResponse(iter_log_text(log), media_type="text/plain; charset=utf-8")
+
+    @endpoint
+    async def delete(request: Request):
+        if not await table.remove(request.path_params["sid"]):
+            raise APIError(404, "unknown session")
+        server.stats["deleted"] += 1
+        return JSONResponse({"deleted": True})
+
+    async def stats(request: Request):
+        return JSONResponse(server.snapshot())
+
+    async def health(request: Request):
+        return JSONResponse({"ok": True})
+
+    async def websocket(ws: WebSocket):
+        # Client sends {"text", "actor"?}; server answers with turn results and pushes late narrations
+        try:
+            session = await table.get(ws.path_params["sid"])
+        except APIError:
+            await ws.close(code=4404)
+            return
+        await ws.accept()
+        session.subscribers.add(ws)
+        await ws.send_json({"type": "state", "state": session.view()})
+        try:
+            while True:
+                data = await ws.receive_json()
+                try:
+                    result = await server.act(session, str(data.get("text") or ""), data.get("actor"))
+                    await ws.send_json({"type": "turn", **result})
+                except APIError as exc:
+                    server.stats["errors"] += 1
+                    await ws.send_json({"type": "error", "error": exc.message, "status": exc.status})
+                except (TypeError, ValueError, AttributeError):
+                    server.stats["errors"] += 1
+                    await ws.send_json({"type": "error", "error": "bad request", "status": 400})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            session.subscribers.discard(ws)
+
+    routes = [
+        Route("/health", health),
+        Route("/stats", stats),
+        Route("/sessions", create, methods=["POST"]),
+        Route("/sessions/{sid}", state, methods=["GET"]),
+        Route("/sessions/{sid}", delete, methods=["DELETE"]),
+        Route("/sessions/{sid}/act", act, methods=["POST"]),
+        Route("/sessions/{sid}/transcript", transcript),
+        WebSocketRoute("/sessions/{sid}/ws", websocket),
+    ]
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        sweeper = asyncio.create_task(server.maintain())
+        try:
+            yield
+        finally:
+            sweeper.cancel()
+            await table.close()
+
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.server = server
+    return app
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, journal: bool = False, store: Optional[str] = None) -> None:
+    import uvicorn
+    from .store import SERVER_STORE_PATH, SessionStore
+
+    table = SessionStore(store or SERVER_STORE_PATH, journal=journal) if store != "memory" else SessionTable(journal=journal)
+    app = create_app(GameServer(table))
+    tier = f", idle sessions -> {table.path}" if isinstance(table, SessionStore) else ""
+    print(f"Game server on http://{host}:{port} (POST /sessions, POST /sessions/<id>/act, WS /sessions/<id>/ws{tier})")
+    uvicorn.run(app, host=host, port=port, log_level="warning", timeout_keep_alive=SERVER_KEEPALIVE_S)
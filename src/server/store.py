@@ -0,0 +1,276 @@
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, Optional
+
+from src.game import savefile
+from src.game.journal import JOURNAL_DIR, SessionJournal
+from src.ui.game_session import GameSession
+
+from .api import APIError, ServerSession, SessionTable
+
+
+# Sessions kept in memory; beyond this the least recently used idle one goes to SQLite
+SERVER_HOT_SESSIONS = int(os.environ.get("SERVER_HOT_SESSIONS", "1000"))
+# Seconds without a request before a session is evicted regardless of capacity
+SERVER_IDLE_S = float(os.environ.get("SERVER_IDLE_S", "300"))
+SERVER_STORE_PATH = os.environ.get("SERVER_STORE_PATH", os.path.join(JOURNAL_DIR, "store.sqlite3"))
+# Total sessions across both tiers; only disk bounds the cold tier
+SERVER_STORE_MAX_SESSIONS = int(os.environ.get("SERVER_STORE_MAX_SESSIONS", "1000000"))
+LATENCY_WINDOW = 10000
+# Most recent turn timings carried through eviction; the cold row stays small
+SERVER_STORE_TIMINGS = int(os.environ.get("SERVER_STORE_TIMINGS", "50"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    state BLOB NOT NULL,
+    meta TEXT NOT NULL,
+    evicted REAL NOT NULL
+)
+"""
+
+
+class SessionStore(SessionTable):
+    """Two-tier session table: a bounded in-memory LRU over a local SQLite file.
+
+    Sessions idle for `idle_s`, or pushed out when more than `hot_capacity`
+    are in memory, are written to SQLite as savefile blobs (plus turn order
+    and end state) and dropped from memory. The next request for one loads
+    it back. A session in the middle of a turn, waiting on a narration or
+    watched over a WebSocket is never evicted, so the hot tier can run over
+    capacity briefly. Each session lives in exactly one tier.
+
+    The LRU is only touched on the event loop; serialization and SQLite run
+    on a single store thread, which owns the connection. A request for a
+    session that is being written out or read back waits for that to land.
+    """
+
+    def __init__(
+        self,
+        path: str = SERVER_STORE_PATH,
+        hot_capacity: int = SERVER_HOT_SESSIONS,
+        idle_s: float = SERVER_IDLE_S,
+        max_sessions: int = SERVER_STORE_MAX_SESSIONS,
+        journal: bool = False,
+    ):
+        super().__init__(max_sessions=max_sessions, journal=journal)
+        self.sessions: "OrderedDict[str, ServerSession]" = OrderedDict()
+        self.path = path
+        self.hot_capacity = max(1, hot_capacity)
+        self.idle_s = idle_s
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store")
+        # Sessions on their way out to, or back from, SQLite
+        self._flushing: Dict[str, "asyncio.Future[None]"] = {}
+        self._loading: Dict[str, "asyncio.Future[Optional[ServerSession]]"] = {}
+        (self.cold_count,) = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()
+        self.rehydrate_latency: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.stats = {"hot_hits": 0, "rehydrated": 0, "misses": 0, "evicted_idle": 0, "evicted_capacity": 0, "cold_bytes": 0}
+
+    def __len__(self) -> int:
+        return len(self.sessions) + len(self._flushing) + self.cold_count
+
+    async def create(self, players: int = 1, names=None, seed: str = "") -> ServerSession:
+        if len(self) >= self.max_sessions:
+            raise APIError(503, "session table full")
+        session = await super().create(players, names, seed)
+        self._enforce_capacity(keep=session)
+        return session
+
+    async def get(self, session_id: str) -> ServerSession:
+        while True:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                self.sessions.move_to_end(session_id)
+                self.stats["hot_hits"] += 1
+                session.last_used = time.time()
+                return session
+            busy = self._flushing.get(session_id) or self._loading.get(session_id)
+            if busy is None:
+                break
+            await asyncio.wait([busy])
+        loading = self._loading[session_id] = asyncio.ensure_future(self._rehydrate(session_id))
+        session = await asyncio.shield(loading)
+        if session is None:
+            self.stats["misses"] += 1
+            raise APIError(404, "unknown session")
+        self._enforce_capacity(keep=session)
+        return session
+
+    async def remove(self, session_id: str) -> bool:
+        busy = self._flushing.get(session_id) or self._loading.get(session_id)
+        if busy is not None:
+            await asyncio.wait([busy])
+        if await super().remove(session_id):
+            return True
+        deleted = await asyncio.get_running_loop().run_in_executor(self._io, self._delete, session_id)
+        self.cold_count -= deleted
+        return bool(deleted)
+
+    async def _rehydrate(self, session_id: str) -> Optional[ServerSession]:
+        start = time.perf_counter()
+        try:
+            session = await asyncio.get_running_loop().run_in_executor(self._io, self._read, session_id)
+        except savefile.SaveFormatError:
+            # _read dropped the corrupt row; the session is gone either way
+            self.cold_count -= 1
+            return None
+        finally:
+            del self._loading[session_id]
+        if session is None:
+            return None
+        self.cold_count -= 1
+        self.sessions[session_id] = session
+        self.rehydrate_latency.append(time.perf_counter() - start)
+        self.stats["rehydrated"] += 1
+        return session
+
+    def _read(self, session_id: str) -> Optional[ServerSession]:
+        # Store thread: load one row back into a session and delete it from the cold tier
+        row = self._db.execute("SELECT state, meta FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        blob, meta_text = row
+        try:
+            meta = json.loads(meta_text)
+            state = savefile.loads(bytes(blob))
+        except (ValueError, savefile.SaveFormatError) as exc:
+            self._delete(session_id)
+            raise savefile.SaveFormatError(f"session {session_id}: {exc}") from exc
+        # The savefile does not carry the change counter; without this it would restart at 0
+        state.version = int(meta.get("version", 0))
+        game = GameSession(state, journal=SessionJournal(session_id) if self.journal else None)
+        game.timings.records.extend(meta.get("timings") or ())
+        session = ServerSession(
+            session_id,
+            game,
+            created=meta.get("created", time.time()),
+            next_actor=int(meta.get("next_actor", 0)),
+            ended=bool(meta.get("ended", False)),
+        )
+        self._delete(session_id)
+        return session
+
+    def _delete(self, session_id: str) -> int:
+        return self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount
+
+    def _evictable(self, session: ServerSession) -> bool:
+        return not (session.lock.locked() or session.waiting or session.subscribers or session.game.has_pending_narration())
+
+    def _evict(self, sessions: "list[ServerSession]") -> Optional["asyncio.Future[None]"]:
+        # Out of the hot tier now, so no request starts a turn on them; written out in the background
+        if not sessions:
+            return None
+        for session in sessions:
+            # A request already holding this object re-fetches it instead of acting on a stale copy
+            session.evicted = True
+            del self.sessions[session.id]
+        flush = asyncio.ensure_future(self._flush(sessions))
+        for session in sessions:
+            self._flushing[session.id] = flush
+        return flush
+
+    async def _flush(self, sessions: "list[ServerSession]") -> None:
+        try:
+            self.stats["cold_bytes"] += await asyncio.get_running_loop().run_in_executor(self._io, self._write, sessions)
+        except Exception:
+            # Nothing was written: keep them in memory rather than lose them
+            for session in sessions:
+                session.evicted = False
+                self.sessions[session.id] = session
+            raise
+        else:
+            self.cold_count += len(sessions)
+            for session in sessions:
+                if session.game.journal is not None:
+                    session.game.journal.close()
+        finally:
+            for session in sessions:
+                del self._flushing[session.id]
+
+    def _write(self, sessions: "list[ServerSession]") -> int:
+        # Store thread: nothing mutates an evicted session, so it can be serialized off the loop
+        rows = []
+        size = 0
+        for session in sessions:
+            blob = savefile.dumps(session.game.state)
+            timings = session.game.timings
+            timings.flush()
+            meta = {
+                "created": session.created,
+                "next_actor": session.next_actor,
+                "ended": session.ended,
+                "version": session.game.state.version,
+                "timings": list(timings.records)[-SERVER_STORE_TIMINGS:] if SERVER_STORE_TIMINGS > 0 else [],
+            }
+            rows.append((session.id, blob, json.dumps(meta), time.time()))
+            size += len(blob)
+        # One transaction per batch: a sweep of thousands of sessions is one commit
+        self._db.execute("BEGIN")
+        self._db.executemany("INSERT OR REPLACE INTO sessions (id, state, meta, evicted) VALUES (?, ?, ?, ?)", rows)
+        self._db.execute("COMMIT")
+        return size
+
+    def _enforce_capacity(self, keep: Optional[ServerSession] = None) -> None:
+        # `keep` is the session being handed to a caller; evicting it would only make them reload it
+        excess = len(self.sessions) - self.hot_capacity
+        if excess <= 0:
+            return
+        victims = []
+        for session in self.sessions.values():  # oldest first
+            if len(victims) >= excess:
+                break
+            if session is not keep and self._evictable(session):
+                victims.append(session)
+        self._evict(victims)
+        self.stats["evicted_capacity"] += len(victims)
+
+    async def sweep(self, now: Optional[float] = None) -> int:
+        """Move sessions idle for longer than `idle_s` to SQLite; returns how many."""
+        now = time.time() if now is None else now
+        victims = []
+        for session in self.sessions.values():
+            if now - session.last_used < self.idle_s:
+                break  # LRU order: everything after this was used more recently
+            if self._evictable(session):
+                victims.append(session)
+        flush = self._evict(victims)
+        if flush is not None:
+            await flush
+        self.stats["evicted_idle"] += len(victims)
+        return len(victims)
+
+    async def close(self) -> None:
+        """Persist every idle hot session (e.g. on shutdown) and close the database."""
+        self._evict([s for s in self.sessions.values() if self._evictable(s)])
+        pending = set(self._flushing.values()) | set(self._loading.values())
+        if pending:
+            await asyncio.wait(pending)
+        self._io.submit(self._db.close).result()
+        self._io.shutdown()
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self.rehydrate_latency)
+
+        def pct(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(p / 100.0 * len(latencies)))] * 1000 if latencies else 0.0
+
+        lookups = self.stats["hot_hits"] + self.stats["rehydrated"]
+        return {
+            **self.stats,
+            "hot": len(self.sessions),
+            "cold": self.cold_count,
+            "hot_capacity": self.hot_capacity,
+            "hit_rate": self.stats["hot_hits"] / lookups if lookups else 0.0,
+            "rehydrate_ms": {"p50": pct(50), "p95": pct(95), "p99": pct(99)},
+        }
@@ -0,0 +1,64 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from src.rl.train_ppo import VEC_BACKENDS, make_vec_env
+
+
+def rollout_rate(vec_backend: str, n_envs: int, seconds: float, seed: int, warmup: int = 300) -> float:
+	"""Env steps/sec collected with random actions (no policy) on one backend, after `warmup`
+	steps so every worker has loaded the encounter models."""
+	env = make_vec_env(n_envs, vec_backend, seed=seed)
+	try:
+		env.reset()
+		actions = np.random.default_rng(seed).integers(0, 4, (256, n_envs))
+		for i in range(warmup):
+			env.step(actions[i % 256])
+		steps = 0
+		start = time.perf_counter()
+		while time.perf_counter() - start < seconds:
+			env.step(actions[steps % 256])
+			steps += 1
+		return steps * n_envs / (time.perf_counter() - start)
+	finally:
+		env.close()
+
+
+def main():
+	cpus = os.cpu_count() or 1
+	default_sizes = sorted({1, 2, 4, cpus, 2 * cpus})
+	parser = argparse.ArgumentParser(description="Rollout steps/sec per vec backend and env count (scaling across cores).")
+	parser.add_argument("--backends", nargs="+", choices=VEC_BACKENDS, default=["dummy", "subproc"])
+	parser.add_argument("--n-envs", type=int, nargs="+", default=default_sizes)
+	parser.add_argument("--seconds", type=float, default=3.0, help="Time per measurement")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--out", default=None, help="Optional JSON file for results")
+	args = parser.parse_args()
+
+	print(f"{cpus} CPUs")
+	results = {"cpus": cpus, "runs": []}
+	for backend in args.backends:
+		base = None
+		for n in args.n_envs:
+			rate = rollout_rate(backend, n, args.seconds, args.seed)
+			base = base or rate
+			results["runs"].append({"vec_backend": backend, "n_envs": n, "steps_per_sec": rate, "speedup": rate / base})
+			print(f"{backend:<8} n_envs={n:<4} {rate:>12,.0f} steps/s  x{rate / base:.2f}")
+
+	if args.out:
+		os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+		with open(args.out, "w") as f:
+			json.dump(results, f, indent=2)
+		print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+	main()
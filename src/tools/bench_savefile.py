@@ -0,0 +1,130 @@
+import os
+import sys
+import json
+import time
+import pickle
+import random
+import argparse
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from src.game.state import GameState
+from src.game.policies.rule_based import decide_response
+from src.game import savefile
+
+
+ACTIONS = [
+	"talk to villager", "buy a torch", "go north", "look around", "search for tracks",
+	"east to the ruins", "descend the stairs", "leave", "head south", "attack the foe",
+	"cast fire bolt at the foe", "back to the village",
+]
+
+
+def make_session(turns: int, num_players: int, rng: random.Random) -> GameState:
+	state = GameState()
+	state.reset(num_players=num_players)
+	for i, p in enumerate(state.players):
+		p.name = f"Adventurer {i + 1}"
+	for _ in range(turns):
+		text = rng.choice(ACTIONS)
+		dm_text, _ = decide_response(state, text)
+		state.add_log(f"{state.players[0].name}: {text}")
+		state.add_log(f"DM: {dm_text}")
+	return state
+
+
+def _json_dumps(state: GameState) -> bytes:
+	return json.dumps(state.snapshot(), separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> GameState:
+	return GameState.from_dict(json.loads(data))
+
+
+FORMATS = {
+	"binary": (savefile.dumps, savefile.loads),
+	"json": (_json_dumps, _json_loads),
+	"pickle": (lambda s: pickle.dumps(s, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+}
+
+
+def _time(fn, repeat: int) -> float:
+	start = time.perf_counter()
+	for _ in range(repeat):
+		fn()
+	return (time.perf_counter() - start) / repeat
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark the binary save format against JSON and pickle.")
+	parser.add_argument("--sessions", type=int, default=1000, help="Number of saves for the bulk benchmark")
+	parser.add_argument("--turns", type=int, default=40, help="Turns played per synthetic session")
+	parser.add_argument("--players", type=int, default=3)
+	parser.add_argument("--repeat", type=int, default=200, help="Repetitions for single-session timings")
+	parser.add_argument("--seed", type=int, default=7)
+	parser.add_argument("--out", default=None, help="Optional JSON file for the results")
+	args = parser.parse_args()
+
+	random.seed(args.seed)
+	rng = random.Random(args.seed)
+	sessions = [make_session(args.turns, args.players, rng) for _ in range(args.sessions)]
+	sample = sessions[0]
+
+	results = {"sessions": args.sessions, "turns": args.turns, "players": args.players, "formats": {}}
+	with tempfile.TemporaryDirectory() as tmp:
+		for name, (dump, load) in FORMATS.items():
+			blob = dump(sample)
+			single_save = _time(lambda: dump(sample), args.repeat)
+			single_load = _time(lambda: load(blob), args.repeat)
+
+			directory = os.path.join(tmp, name)
+			os.makedirs(directory)
+			start = time.perf_counter()
+			for i, state in enumerate(sessions):
+				with open(os.path.join(directory, f"{i:06d}{savefile.SAVE_EXT}"), "wb") as f:
+					f.write(dump(state))
+			bulk_save = time.perf_counter() - start
+
+			start = time.perf_counter()
+			loaded = 0
+			for entry in os.scandir(directory):
+				with open(entry.path, "rb") as f:
+					load(f.read())
+				loaded += 1
+			bulk_load = time.perf_counter() - start
+
+			row = {
+				"bytes": len(blob),
+				"save_us": single_save * 1e6,
+				"load_us": single_load * 1e6,
+				"bulk_save_s": bulk_save,
+				"bulk_load_s": bulk_load,
+				"bulk_load_per_s": loaded / bulk_load if bulk_load else 0.0,
+			}
+			if name == "binary":
+				start = time.perf_counter()
+				scanned = sum(1 for _ in savefile.scan_saves(directory))
+				scan = time.perf_counter() - start
+				row["header_scan_s"] = scan
+				row["header_scan_per_s"] = scanned / scan if scan else 0.0
+			results["formats"][name] = row
+
+	print(f"{args.sessions} sessions x {args.turns} turns, {args.players} players")
+	print(f"{'format':<8} {'bytes':>8} {'save us':>9} {'load us':>9} {'bulk save s':>12} {'bulk load s':>12}")
+	for name, row in results["formats"].items():
+		print(f"{name:<8} {row['bytes']:>8} {row['save_us']:>9.1f} {row['load_us']:>9.1f} {row['bulk_save_s']:>12.3f} {row['bulk_load_s']:>12.3f}")
+	binary = results["formats"]["binary"]
+	print(f"binary header scan: {binary['header_scan_s']:.3f}s ({binary['header_scan_per_s']:.0f} saves/s)")
+
+	if args.out:
+		os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+		with open(args.out, "w") as f:
+			json.dump(results, f, indent=2)
+		print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,270 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from src.game.state import GameState
+from src.game.narrative import craft_narration
+from src.game.policies.rule_based import decide_response
+from src.rl.env import DungeonMasterEnv
+from src.rl.vec_env import DungeonMasterVecEnv
+from src.ui.intent_bridge import load_model
+
+
+# Per machine and untracked (timings do not transfer between hosts); create it with --update-baseline
+BASELINE_PATH = os.path.join(PROJECT_ROOT, "reports", "bench", "baseline.json")
+LATEST_PATH = os.path.join(PROJECT_ROOT, "reports", "bench", "latest.json")
+
+ACTIONS = [
+	"talk to villager", "buy a torch", "go north", "look around", "search for tracks",
+	"east to the ruins", "descend the stairs", "leave", "head south", "attack the foe",
+	"cast fire bolt at the foe", "back to the village",
+]
+SCENES = ["village", "forest", "ruins"]
+VEC_WORLDS = 256
+# Gated metrics where lower is better; calls_per_sec is gated higher-is-better. p95 is
+# reported but too noisy between runs to gate on
+LOWER_IS_BETTER = ("p50_us", "peak_kb")
+
+
+def _env_reset():
+	env = DungeonMasterEnv()
+	return lambda: env.reset()
+
+
+def _env_step():
+	env = DungeonMasterEnv()
+	env.reset()
+	count = 0
+
+	def op():
+		nonlocal count
+		count += 1
+		if count % 200 == 0:  # episodes never end on their own
+			env.reset()
+		env.step(count % 4)
+
+	return op
+
+
+def _vec_env_step():
+	env = DungeonMasterVecEnv(VEC_WORLDS, seed=0, max_steps=200)
+	env.reset()
+	actions = np.random.default_rng(0).integers(0, 4, (64, VEC_WORLDS))
+	count = 0
+
+	def op():
+		nonlocal count
+		count += 1
+		env.step(actions[count % 64])
+
+	return op
+
+
+def _decide_response():
+	rng = random.Random(7)
+	state = GameState()
+	count = 0
+
+	def op():
+		nonlocal state, count
+		count += 1
+		if count % 40 == 0:
+			state = GameState()
+		decide_response(state, rng.choice(ACTIONS))
+
+	return op
+
+
+def _craft_narration():
+	count = 0
+
+	def op():
+		nonlocal count
+		count += 1
+		craft_narration(SCENES[count % 3], "You push on.", roll=count % 20 + 1)
+
+	return op
+
+
+def _intent():
+	model = load_model()
+	state = GameState().world.__dict__.copy()
+	count = 0
+
+	def op():
+		nonlocal count
+		count += 1
+		model.predict_intent(ACTIONS[count % len(ACTIONS)], state)
+
+	return op
+
+
+# name -> (factory returning a zero-argument operation, env steps per call)
+BENCHMARKS = {
+	"env.reset": (_env_reset, 1),
+	"env.step": (_env_step, 1),
+	"vec_env.step": (_vec_env_step, VEC_WORLDS),
+	"rule_engine.decide_response": (_decide_response, 1),
+	"narrative.craft_narration": (_craft_narration, 1),
+	"intent.predict": (_intent, 1),
+}
+
+
+def measure(factory, steps_per_call: int, seconds: float, rounds: int, min_calls: int = 50) -> dict:
+	"""Best-of-`rounds` throughput, per-call latency percentiles over all rounds, and the
+	traced allocation peak over one extra round."""
+	random.seed(0)
+	op = factory()
+	for _ in range(min_calls):  # warm caches and lazy model loads
+		op()
+	samples = []
+	best = 0.0
+	for _ in range(rounds):
+		calls = 0
+		start = time.perf_counter()
+		while calls < min_calls or time.perf_counter() - start < seconds / rounds:
+			t0 = time.perf_counter_ns()
+			op()
+			samples.append(time.perf_counter_ns() - t0)
+			calls += 1
+		best = max(best, calls / (time.perf_counter() - start))
+	samples.sort()
+
+	tracemalloc.start()
+	try:
+		tracemalloc.reset_peak()
+		base, _ = tracemalloc.get_traced_memory()
+		for _ in range(min_calls * 10):
+			op()
+		current, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+
+	return {
+		"calls_per_sec": best,
+		"steps_per_sec": best * steps_per_call,
+		"p50_us": samples[len(samples) // 2] / 1000.0,
+		"p95_us": samples[min(len(samples) - 1, int(0.95 * len(samples)))] / 1000.0,
+		"peak_kb": (peak - base) / 1024.0,
+		"retained_b_per_call": (current - base) / (min_calls * 10),
+	}
+
+
+def host() -> dict:
+	"""What a baseline is only valid for."""
+	return {"node": platform.node(), "machine": platform.machine(), "python": sys.version.split()[0], "cpus": os.cpu_count()}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+	"""Metrics worse than the baseline by more than `threshold` (a fraction)."""
+	regressions = []
+	for name, row in results["benchmarks"].items():
+		old = baseline.get("benchmarks", {}).get(name)
+		if not old:
+			continue
+		for metric in ("calls_per_sec",) + LOWER_IS_BETTER:
+			before, after = old.get(metric), row.get(metric)
+			if not before or after is None:
+				continue
+			if metric in LOWER_IS_BETTER:
+				change = after / before - 1.0
+			else:
+				change = before / after - 1.0 if after else float("inf")
+			if change > threshold:
+				regressions.append({"benchmark": name, "metric": metric, "baseline": before, "current": after, "worse_by": change})
+	return regressions
+
+
+def best_of(first: dict, second: dict) -> dict:
+	"""Per-metric better value of two runs of one benchmark."""
+	row = dict(first)
+	for metric in ("calls_per_sec", "steps_per_sec"):
+		row[metric] = max(first[metric], second[metric])
+	for metric in ("p50_us", "p95_us", "peak_kb", "retained_b_per_call"):
+		row[metric] = min(first[metric], second[metric])
+	return row
+
+
+def run(results: dict, name: str, args) -> None:
+	factory, steps_per_call = BENCHMARKS[name]
+	row = measure(factory, steps_per_call, args.seconds, args.rounds)
+	if name in results["benchmarks"]:
+		row = best_of(results["benchmarks"][name], row)
+	results["benchmarks"][name] = row
+	print(f"{name:<30}{row['calls_per_sec']:>12,.0f}{row['steps_per_sec']:>12,.0f}{row['p50_us']:>10.1f}{row['p95_us']:>10.1f}{row['peak_kb']:>10.1f}{row['retained_b_per_call']:>13.1f}")
+
+
+def save(results: dict, path: str) -> None:
+	os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+	with open(path, "w") as f:
+		json.dump(results, f, indent=2)
+	print(f"Saved results to {path}")
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Throughput, latency and allocation benchmarks for the env, rule engine, narration and intent inference.")
+	parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=None, help="Run a subset")
+	parser.add_argument("--seconds", type=float, default=1.5, help="Timed budget per benchmark")
+	parser.add_argument("--rounds", type=int, default=3, help="Throughput is the best of this many rounds")
+	parser.add_argument("--threshold", type=float, default=0.25, help="Fail when a metric is this much worse than the baseline (0.25 = 25%%)")
+	parser.add_argument("--baseline", default=BASELINE_PATH)
+	parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+	parser.add_argument("--confirm", type=int, default=2, help="Re-measure regressed benchmarks up to this many times before failing")
+	parser.add_argument("--out", default=LATEST_PATH, help="JSON file for the results")
+	args = parser.parse_args()
+
+	results = {"ts": time.strftime("%Y-%m-%d %H:%M:%S"), "host": host(), "benchmarks": {}}
+	print(f"{'benchmark':<30}{'calls/s':>12}{'steps/s':>12}{'p50 us':>10}{'p95 us':>10}{'peak KB':>10}{'kept B/call':>13}")
+	for name in args.only or BENCHMARKS:
+		run(results, name, args)
+
+	if args.update_baseline:
+		save(results, args.out)
+		os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+		with open(args.baseline, "w") as f:
+			json.dump(results, f, indent=2)
+		print(f"Baseline written to {args.baseline}")
+		return
+	if not os.path.exists(args.baseline):
+		save(results, args.out)
+		print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one")
+		sys.exit(2)
+
+	with open(args.baseline) as f:
+		baseline = json.load(f)
+	if baseline.get("host") != results["host"]:
+		save(results, args.out)
+		print(f"\nBaseline {args.baseline} was recorded on {baseline.get('host')}, not {results['host']}; run with --update-baseline on this machine")
+		sys.exit(2)
+	regressions = compare(results, baseline, args.threshold)
+	for attempt in range(args.confirm):
+		if not regressions:
+			break
+		# A noisy neighbour can slow one benchmark for seconds; only a slowdown that repeats counts
+		names = sorted({r["benchmark"] for r in regressions})
+		print(f"\nRe-measuring {', '.join(names)} ({attempt + 1}/{args.confirm})")
+		for name in names:
+			run(results, name, args)
+		regressions = compare(results, baseline, args.threshold)
+	save(results, args.out)
+	if regressions:
+		print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.baseline} ({baseline.get('ts')}):")
+		for r in regressions:
+			print(f"  {r['benchmark']} {r['metric']}: {r['baseline']:,.1f} -> {r['current']:,.1f} ({r['worse_by']:+.0%})")
+		sys.exit(1)
+	print(f"No regressions beyond {args.threshold:.0%} against {args.baseline} ({baseline.get('ts')})")
+
+
+if __name__ == "__main__":
+	main()
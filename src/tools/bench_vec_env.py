@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+from src.game.state import GameState
+from src.rl.env import DungeonMasterEnv
+from src.rl.vec_env import AMULET, FLAGS, FOREST, LOCATIONS, DungeonMasterVecEnv
+
+
+def _world(env: DungeonMasterEnv) -> dict:
+	world = env.state.world
+	return {
+		"location": world.location,
+		"danger_level": int(world.danger_level),
+		"turn": int(world.turn),
+		"flags": {name: True for name, on in world.flags.items() if on},
+		"boss_active": bool(world.boss_active),
+		"boss_hp": int(world.boss_hp),
+	}
+
+
+def check_parity(worlds: int, steps: int, seed: int) -> int:
+	"""Step the rule engine and the array env side by side with the same actions and d20
+	rolls, from random start states (every location, flag and boss combination); returns
+	the number of mismatching steps."""
+	rng = np.random.default_rng(seed)
+	vec = DungeonMasterVecEnv(worlds)
+	vec.reset()
+	vec.loc[:] = rng.integers(0, len(LOCATIONS), worlds)
+	vec.flags[:] = rng.random((worlds, len(FLAGS))) < 0.4
+	vec.boss_active[:] = (vec.loc == FOREST) & (rng.random(worlds) < 0.3)
+	vec.boss_hp[:] = np.where(vec.boss_active, rng.integers(1, 11, worlds), 0)
+	envs = []
+	for i in range(worlds):
+		env = DungeonMasterEnv()
+		env.reset()
+		start = vec.state_of(i)
+		world = env.state.world
+		world.location = start["location"]
+		world.flags = dict(start["flags"])
+		world.boss_active = start["boss_active"]
+		world.boss_hp = start["boss_hp"]
+		envs.append(env)
+
+	roll = GameState.roll
+	mismatches = 0
+	try:
+		for step in range(steps):
+			actions = rng.integers(0, 4, worlds)
+			rolls = rng.integers(1, 21, worlds)
+			expected = []
+			for i, env in enumerate(envs):
+				GameState.roll = lambda self, sides=20, value=int(rolls[i]): (self.dice_log.append(f"d{sides}: {value}"), value)[1]
+				_, reward, done, _, _ = env.step(int(actions[i]))
+				expected.append((reward, done))
+			dones = vec.advance(actions, rolls)
+			rewards = vec.flags[:, AMULET].astype(np.float32) + dones
+			for i, env in enumerate(envs):
+				if _world(env) != vec.state_of(i) or expected[i] != (float(rewards[i]), bool(dones[i])):
+					mismatches += 1
+					if mismatches <= 5:
+						print(f"step {step} world {i} action {actions[i]} roll {rolls[i]}: engine {_world(env)} {expected[i]} vs arrays {vec.state_of(i)} {(float(rewards[i]), bool(dones[i]))}")
+					env.reset()
+					vec._reset_worlds(np.arange(worlds) == i)
+	finally:
+		GameState.roll = roll
+	return mismatches
+
+
+def steps_per_sec(env, seconds: float) -> float:
+	env.reset()
+	n = env.num_envs
+	actions = np.random.default_rng(0).integers(0, 4, (1024, n))
+	steps = 0
+	start = time.perf_counter()
+	while time.perf_counter() - start < seconds:
+		env.step(actions[steps % 1024])
+		steps += 1
+	return steps * n / (time.perf_counter() - start)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Check DungeonMasterVecEnv against the rule engine and compare env steps/sec with DummyVecEnv.")
+	parser.add_argument("--worlds", type=int, default=64, help="Worlds in the parity check")
+	parser.add_argument("--steps", type=int, default=300, help="Steps in the parity check")
+	parser.add_argument("--n-envs", type=int, nargs="+", default=[1, 8, 64, 1024], help="Batch sizes to time")
+	parser.add_argument("--seconds", type=float, default=2.0, help="Time per measurement")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--out", default=None, help="Optional JSON file for results")
+	args = parser.parse_args()
+
+	mismatches = check_parity(args.worlds, args.steps, args.seed)
+	print(f"parity: {args.worlds} worlds x {args.steps} steps, {mismatches} mismatches")
+
+	results = {"parity_mismatches": mismatches, "steps_per_sec": {}}
+	baseline = steps_per_sec(DummyVecEnv([DungeonMasterEnv]), args.seconds)
+	print(f"DummyVecEnv(DungeonMasterEnv): {baseline:,.0f} steps/s")
+	results["steps_per_sec"]["dummy_1"] = baseline
+	for n in args.n_envs:
+		rate = steps_per_sec(DungeonMasterVecEnv(n, seed=args.seed), args.seconds)
+		results["steps_per_sec"][f"numpy_{n}"] = rate
+		print(f"DungeonMasterVecEnv n={n}: {rate:,.0f} steps/s ({rate / baseline:,.0f}x)")
+
+	if args.out:
+		os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+		with open(args.out, "w") as f:
+			json.dump(results, f, indent=2)
+		print(f"Saved results to {args.out}")
+	sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from src.game import lore
+
+
+QUERIES = [
+	("village", "talk to villager", False),
+	("village", "buy a torch", False),
+	("forest", "look around", False),
+	("forest", "search for tracks", False),
+	("forest", "cast fireball at the wolf", False),
+	("forest", "attack the horned shadow", True),
+	("ruins", "descend the stairs", False),
+	("ruins", "cast cure wounds on Ann", False),
+]
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Build (or load) the persisted lore index and time lookups.")
+	parser.add_argument("--rebuild", action="store_true", help="Ignore a saved index that matches the CSVs")
+	parser.add_argument("--query", default=None, help="Free-text query to run instead of the sample set")
+	parser.add_argument("--location", default="forest", help="Location for --query")
+	parser.add_argument("--k", type=int, default=lore.LORE_TOP_K)
+	parser.add_argument("--repeat", type=int, default=200, help="Timed runs per sample query")
+	parser.add_argument("--out", default=None, help="Optional JSON file for the results")
+	args = parser.parse_args()
+
+	start = time.perf_counter()
+	index = lore.build_index(rebuild=args.rebuild)
+	build_s = time.perf_counter() - start
+	size = os.path.getsize(lore.INDEX_PATH) if os.path.exists(lore.INDEX_PATH) else 0
+	print(f"index: {len(index.entries)} entries, {len(index.postings)} terms, ready in {build_s * 1000:.0f} ms ({size / 1024:.0f} KiB at {lore.INDEX_PATH})")
+
+	queries = [(args.location, args.query, False)] if args.query else QUERIES
+	rows = []
+	for location, action, boss in queries:
+		context = lore.lore_context(location, boss)
+		start = time.perf_counter()
+		for _ in range(args.repeat):
+			hits = index.search(action, args.k, context=context)
+		per_query_ms = (time.perf_counter() - start) / max(1, args.repeat) * 1000
+		rows.append({"location": location, "action": action, "ms": per_query_ms, "snippets": [h.snippet for h in hits]})
+		print(f"\n[{location}] {action}  ({per_query_ms:.3f} ms)")
+		for hit in hits:
+			print(f"  - {hit.snippet}")
+
+	if args.out:
+		os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+		with open(args.out, "w") as f:
+			json.dump({"entries": len(index.entries), "ready_ms": build_s * 1000, "bytes": size, "queries": rows}, f, indent=2)
+		print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,94 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from src.rl.numpy_policy import DM_POLICY_PATH, INTENTS, LOCATION_CODES, NumpyPolicy
+
+
+ACTIVATION_NAMES = {"Tanh": "tanh", "ReLU": "relu"}
+
+
+def export_policy(model) -> NumpyPolicy:
+	"""Actor weights of a PPO MlpPolicy (Flatten features, Discrete actions) as a NumpyPolicy."""
+	import torch.nn as nn
+	from stable_baselines3.common.torch_layers import FlattenExtractor
+
+	policy = model.policy
+	extractor = policy.pi_features_extractor if hasattr(policy, "pi_features_extractor") else policy.features_extractor
+	if not isinstance(extractor, FlattenExtractor):
+		raise ValueError(f"only FlattenExtractor policies can be exported, not {type(extractor).__name__}")
+	if not hasattr(model.action_space, "n"):
+		raise ValueError("only Discrete action spaces can be exported")
+
+	layers = []
+	for module in list(policy.mlp_extractor.policy_net) + [policy.action_net]:
+		if isinstance(module, nn.Linear):
+			layers.append([module.weight.detach().cpu().numpy(), module.bias.detach().cpu().numpy(), "identity"])
+		elif type(module).__name__ in ACTIVATION_NAMES and layers:
+			layers[-1][2] = ACTIVATION_NAMES[type(module).__name__]
+		else:
+			raise ValueError(f"unsupported layer {module!r}")
+	return NumpyPolicy([tuple(layer) for layer in layers], INTENTS[:model.action_space.n])
+
+
+def parity_observations(samples: int, seed: int) -> np.ndarray:
+	"""Every reachable-looking observation (locations x danger 0-10 x flags 0-4) plus random ones from the Box."""
+	grid = np.array([[loc, danger, flags] for loc in LOCATION_CODES.values() for danger in range(11) for flags in range(5)], dtype=np.int32)
+	rng = np.random.default_rng(seed)
+	return np.concatenate([grid, rng.integers(0, 101, (samples, 3), dtype=np.int32)])
+
+
+def _per_call_us(fn, obs: np.ndarray, repeat: int) -> float:
+	start = time.perf_counter()
+	for i in range(repeat):
+		fn(obs[i % len(obs)])
+	return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Export the PPO actor from dm_ppo.zip to a NumPy bundle for torch-free inference.")
+	parser.add_argument("--model", default=os.path.join(PROJECT_ROOT, "dm_ppo.zip"), help="Saved SB3 PPO model")
+	parser.add_argument("--out", default=os.path.join(PROJECT_ROOT, DM_POLICY_PATH), help="NumPy bundle (.npz)")
+	parser.add_argument("--verify", action="store_true", help="Check actions against SB3 predict(deterministic=True) and time both")
+	parser.add_argument("--samples", type=int, default=5000, help="Random observations for --verify")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--report", default=None, help="Optional JSON file for the --verify results")
+	args = parser.parse_args()
+
+	from stable_baselines3 import PPO
+
+	model = PPO.load(args.model, device="cpu")
+	policy = export_policy(model)
+	policy.save(args.out)
+	print(f"Exported {len(policy.layers)} layers ({os.path.getsize(args.out) / 1024:.1f} KB) to {args.out}")
+	if not args.verify:
+		return
+
+	loaded = NumpyPolicy.load(args.out)
+	obs = parity_observations(args.samples, args.seed)
+	expected, _ = model.predict(obs, deterministic=True)
+	actual = loaded.predict(obs)
+	mismatches = int(np.sum(expected != actual))
+	sb3_us = _per_call_us(lambda o: model.predict(o, deterministic=True), obs, 2000)
+	numpy_us = _per_call_us(loaded.predict, obs, 20000)
+	print(f"parity: {len(obs)} observations, {mismatches} action mismatches")
+	print(f"single-observation latency: SB3 {sb3_us:.1f} us, NumPy {numpy_us:.1f} us ({sb3_us / numpy_us:.0f}x)")
+
+	if args.report:
+		os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+		with open(args.report, "w") as f:
+			json.dump({"observations": len(obs), "mismatches": mismatches, "sb3_us": sb3_us, "numpy_us": numpy_us}, f, indent=2)
+		print(f"Saved results to {args.report}")
+	sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+import argparse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from src.game.journal import JOURNAL_DIR, journal_exists, resume
+from src.game.transcript import EXPORT_FORMATS, iter_export, journal_turns
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Export a journaled session's turns (intent, monster, rolls, outcome, narration) as JSONL or HTML.")
+	parser.add_argument("--session", required=True, help="Session id (directory under the journal root)")
+	parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+	parser.add_argument("--root", default=JOURNAL_DIR, help="Journal root directory")
+	parser.add_argument("--out", default=None, help="Output file (default: sessions/<id>/exports/transcript.<format>)")
+	args = parser.parse_args()
+
+	if not journal_exists(args.session, args.root):
+		parser.error(f"no journal for session {args.session} under {args.root}")
+	resumed = resume(args.session, args.root)
+	log = resumed[0].log if resumed else []
+	out = args.out or os.path.join(args.root, args.session, "exports", f"transcript.{args.format}")
+	os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+
+	start = time.perf_counter()
+	written = 0
+	with open(out, "w", encoding="utf-8") as f:
+		for text in iter_export(journal_turns(args.session, log, args.root), args.format, title=f"Session {args.session}"):
+			f.write(text)
+			written += len(text)
+	print(f"Wrote {written / 1024:.0f} KB to {out} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+	main()
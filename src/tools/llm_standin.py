@@ -0,0 +1,248 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+
+# Local stand-in for the narration backend, speaking the HTTPBackend protocol of
+# src/ai/llm_client.py: POST {"system", "prompt", "stream"} -> {"text"} or NDJSON
+# {"text": chunk} lines. Point the game at it with
+#   NARRATION_BACKEND_URL=http://127.0.0.1:8765/generate
+
+
+OPENERS = [
+	"Mist curls around your boots as",
+	"A hush falls over the party as",
+	"Somewhere beyond the torchlight,",
+	"The old stones seem to listen as",
+]
+CLOSERS = [
+	"Will you press on, search the area, or call out?",
+	"Do you strike, sneak, or speak?",
+	"What do you do next?",
+]
+
+
+@dataclass
+class StandinConfig:
+	latency: str = "lognormal"  # lognormal | uniform | fixed
+	latency_ms: float = 400.0  # median (lognormal), mean (uniform) or exact (fixed) total latency
+	sigma: float = 0.5  # lognormal spread; p99 is about median * exp(2.33 * sigma)
+	first_token_share: float = 0.4  # share of the latency spent before the first streamed token
+	error_rate: float = 0.0  # share of requests answered with a 5xx
+	rate_limit: float = 0.0  # requests per second, 0 = unlimited; excess gets 429
+	burst: int = 10
+	seed: Optional[int] = None
+
+
+class _TokenBucket:
+	def __init__(self, rate: float, burst: int):
+		self.rate = rate
+		self.capacity = max(1, burst)
+		self.tokens = float(self.capacity)
+		self.updated = time.monotonic()
+		self.lock = threading.Lock()
+
+	def take(self) -> bool:
+		with self.lock:
+			now = time.monotonic()
+			self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+			self.updated = now
+			if self.tokens >= 1:
+				self.tokens -= 1
+				return True
+			return False
+
+
+class StandinServer(ThreadingHTTPServer):
+	daemon_threads = True
+
+	def __init__(self, address, config: StandinConfig):
+		super().__init__(address, _Handler)
+		self.config = config
+		self.rng = random.Random(config.seed)
+		self.rng_lock = threading.Lock()
+		self.bucket = _TokenBucket(config.rate_limit, config.burst) if config.rate_limit > 0 else None
+		self.stats_lock = threading.Lock()
+		self.stats: Dict[str, int] = {"requests": 0, "ok": 0, "streamed": 0, "errors": 0, "rate_limited": 0, "bad_requests": 0, "system_prefixes": 0}
+		self.system_prefixes = set()
+
+	def count(self, key: str) -> None:
+		with self.stats_lock:
+			self.stats[key] += 1
+
+	def sample_latency(self) -> float:
+		cfg = self.config
+		with self.rng_lock:
+			if cfg.latency == "fixed":
+				ms = cfg.latency_ms
+			elif cfg.latency == "uniform":
+				ms = self.rng.uniform(0.0, 2.0 * cfg.latency_ms)
+			else:
+				ms = cfg.latency_ms * math.exp(self.rng.gauss(0.0, cfg.sigma))
+		return max(0.0, ms) / 1000.0
+
+	def roll_error(self) -> bool:
+		with self.rng_lock:
+			return self.rng.random() < self.config.error_rate
+
+	def compose(self, prompt: Any) -> str:
+		text = prompt if isinstance(prompt, str) else "\n".join(map(str, prompt))
+		location = "the road"
+		for field in text.replace("\n", " | ").split(" | "):
+			field = field.strip()
+			if field.startswith("state: loc=") or field.startswith("loc="):
+				location = f"the {field.split('=', 1)[1]}"
+		with self.rng_lock:
+			opener = self.rng.choice(OPENERS)
+			closer = self.rng.choice(CLOSERS)
+		return f"{opener} the wind shifts over {location}. Shapes stir at the edge of sight. {closer}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"
+	server: StandinServer
+
+	def log_message(self, format, *args):
+		pass
+
+	def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+		data = json.dumps(payload).encode("utf-8")
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(data)))
+		for key, value in (headers or {}).items():
+			self.send_header(key, value)
+		self.end_headers()
+		self.wfile.write(data)
+
+	def do_GET(self):
+		if self.path.rstrip("/") == "/stats":
+			with self.server.stats_lock:
+				stats = dict(self.server.stats)
+			self._send_json(200, {"stats": stats, "config": asdict(self.server.config)})
+		elif self.path.rstrip("/") in ("", "/health"):
+			self._send_json(200, {"ok": True})
+		else:
+			self._send_json(404, {"error": "not found"})
+
+	def do_POST(self):
+		server = self.server
+		server.count("requests")
+		try:
+			body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+			prompt = body["prompt"]
+		except (ValueError, KeyError):
+			server.count("bad_requests")
+			self._send_json(400, {"error": "expected JSON with a prompt"})
+			return
+		if server.bucket is not None and not server.bucket.take():
+			server.count("rate_limited")
+			self._send_json(429, {"error": "rate limited"}, {"Retry-After": "1"})
+			return
+		system = body.get("system")
+		if system:
+			with server.stats_lock:
+				if system not in server.system_prefixes:
+					server.system_prefixes.add(system)
+					server.stats["system_prefixes"] += 1
+
+		latency = server.sample_latency()
+		if server.roll_error():
+			time.sleep(latency * server.config.first_token_share)
+			server.count("errors")
+			self._send_json(503, {"error": "backend overloaded"})
+			return
+		text = server.compose(prompt)
+		if not body.get("stream"):
+			time.sleep(latency)
+			server.count("ok")
+			self._send_json(200, {"text": text})
+			return
+
+		words = text.split(" ")
+		first = latency * server.config.first_token_share
+		per_token = (latency - first) / max(1, len(words) - 1)
+		self.send_response(200)
+		self.send_header("Content-Type", "application/x-ndjson")
+		self.send_header("Transfer-Encoding", "chunked")
+		self.end_headers()
+		time.sleep(first)
+		try:
+			for i, word in enumerate(words):
+				if i:
+					time.sleep(per_token)
+				line = json.dumps({"text": word + (" " if i < len(words) - 1 else "")}).encode("utf-8") + b"\n"
+				self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+				self.wfile.flush()
+			self.wfile.write(b"0\r\n\r\n")
+		except (BrokenPipeError, ConnectionResetError):
+			return
+		server.count("ok")
+		server.count("streamed")
+
+
+def start_standin(config: Optional[StandinConfig] = None, host: str = "127.0.0.1", port: int = 0) -> StandinServer:
+	"""Run the stand-in on a background thread; `server.server_port` is the bound port."""
+	server = StandinServer((host, port), config or StandinConfig())
+	thread = threading.Thread(target=server.serve_forever, name="llm-standin", daemon=True)
+	thread.start()
+	return server
+
+
+def add_config_args(parser: argparse.ArgumentParser) -> None:
+	defaults = StandinConfig()
+	parser.add_argument("--latency", choices=["lognormal", "uniform", "fixed"], default=defaults.latency)
+	parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+	parser.add_argument("--sigma", type=float, default=defaults.sigma)
+	parser.add_argument("--first-token-share", type=float, default=defaults.first_token_share)
+	parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+	parser.add_argument("--rate-limit", type=float, default=defaults.rate_limit, help="Requests per second (0 = unlimited)")
+	parser.add_argument("--burst", type=int, default=defaults.burst)
+	parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> StandinConfig:
+	return StandinConfig(
+		latency=args.latency,
+		latency_ms=args.latency_ms,
+		sigma=args.sigma,
+		first_token_share=args.first_token_share,
+		error_rate=args.error_rate,
+		rate_limit=args.rate_limit,
+		burst=args.burst,
+		seed=args.seed,
+	)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Local stand-in for the narration LLM backend.")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=8765)
+	add_config_args(parser)
+	args = parser.parse_args()
+
+	server = StandinServer((args.host, args.port), config_from_args(args))
+	print(f"LLM stand-in on http://{args.host}:{server.server_port}/generate ({asdict(server.config)})")
+	print(f"Use: NARRATION_BACKEND_URL=http://{args.host}:{server.server_port}/generate")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from src.ai.llm_client import HTTPBackend, LLMClient
+from src.game.state import GameState
+from src.game.policies.rule_based import decide_response
+from src.ui.game_session import _state_to_dict
+from src.ui.gemini_client import SYSTEM_INSTRUCTIONS, _build_prompt
+from src.tools.llm_standin import add_config_args, config_from_args, start_standin
+
+
+ACTIONS = [
+	"talk to villager", "look around", "go north", "search for tracks", "east to the ruins",
+	"descend the stairs", "attack the foe", "back to the village",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	# Nearest rank: the smallest value with at least pct% of the samples at or below it
+	rank = max(0, min(len(ordered) - 1, math.ceil(pct * len(ordered) / 100.0) - 1))
+	return ordered[rank]
+
+
+def run_session(client: LLMClient, session_idx: int, args: argparse.Namespace, results: Dict[str, list], lock: threading.Lock) -> None:
+	rng = random.Random(args.seed * 1000 + session_idx)
+	state = GameState()
+	state.reset(num_players=args.players)
+	for turn in range(args.turns):
+		player = state.players[turn % len(state.players)]
+		text = rng.choice(ACTIONS)
+		engine_text, _ = decide_response(state, text)
+		prompt = _build_prompt(_state_to_dict(state), f"[{player.name}] {text}", f"{player.name}: {engine_text}")
+		start = time.perf_counter()
+		first = None
+		try:
+			if args.stream:
+				for _ in client.stream(prompt, timeout=args.timeout, system=SYSTEM_INSTRUCTIONS):
+					if first is None:
+						first = time.perf_counter() - start
+			else:
+				client.generate(prompt, timeout=args.timeout, system=SYSTEM_INSTRUCTIONS)
+			outcome = "ok"
+		except Exception as exc:
+			outcome = type(exc).__name__
+		elapsed = time.perf_counter() - start
+		with lock:
+			results["outcomes"].append(outcome)
+			if outcome == "ok":
+				results["latency"].append(elapsed)
+				if first is not None:
+					results["ttft"].append(first)
+		if args.think_ms > 0:
+			time.sleep(rng.uniform(0.5, 1.5) * args.think_ms / 1000.0)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Drive concurrent sessions through the narration client and report latency percentiles.")
+	parser.add_argument("--url", default=None, help="Backend URL; default starts a local stand-in in-process")
+	parser.add_argument("--sessions", type=int, default=20, help="Concurrent sessions")
+	parser.add_argument("--turns", type=int, default=10, help="Narration calls per session")
+	parser.add_argument("--players", type=int, default=3)
+	parser.add_argument("--think-ms", type=float, default=200.0, help="Mean pause between a session's turns")
+	parser.add_argument("--concurrency", type=int, default=8, help="Client pool size (LLM_MAX_CONCURRENCY)")
+	parser.add_argument("--timeout", type=float, default=10.0)
+	parser.add_argument("--no-stream", dest="stream", action="store_false")
+	parser.add_argument("--out", default=None, help="Optional JSON file for the report")
+	add_config_args(parser)
+	args = parser.parse_args()
+	random.seed(args.seed or 0)
+	args.seed = args.seed or 0
+
+	server = None
+	url = args.url
+	if url is None:
+		server = start_standin(config_from_args(args))
+		url = f"http://127.0.0.1:{server.server_port}/generate"
+	client = LLMClient(HTTPBackend(url, pool_size=args.concurrency), max_concurrency=args.concurrency)
+
+	results: Dict[str, list] = {"latency": [], "ttft": [], "outcomes": []}
+	lock = threading.Lock()
+	threads = [
+		threading.Thread(target=run_session, args=(client, i, args, results, lock), daemon=True)
+		for i in range(args.sessions)
+	]
+	start = time.perf_counter()
+	for t in threads:
+		t.start()
+	for t in threads:
+		t.join()
+	wall = time.perf_counter() - start
+
+	outcomes = Counter(results["outcomes"])
+	report = {
+		"url": url,
+		"sessions": args.sessions,
+		"calls": len(results["outcomes"]),
+		"wall_s": wall,
+		"throughput_per_s": len(results["outcomes"]) / wall if wall else 0.0,
+		"outcomes": dict(outcomes),
+		"latency_ms": {f"p{p}": percentile(results["latency"], p) * 1000 for p in (50, 90, 95, 99)},
+		"ttft_ms": {f"p{p}": percentile(results["ttft"], p) * 1000 for p in (50, 90, 95, 99)},
+		"client": client.metrics(),
+	}
+	if server is not None:
+		report["server"] = dict(server.stats)
+		server.shutdown()
+		server.server_close()
+
+	print(f"{report['calls']} calls from {args.sessions} sessions in {wall:.2f}s ({report['throughput_per_s']:.1f}/s) against {url}")
+	print("outcomes: " + ", ".join(f"{k}={v}" for k, v in outcomes.most_common()))
+	for name in ("latency_ms", "ttft_ms"):
+		if name == "ttft_ms" and not results["ttft"]:
+			continue
+		row = report[name]
+		print(f"{name:<11} p50 {row['p50']:7.1f}  p90 {row['p90']:7.1f}  p95 {row['p95']:7.1f}  p99 {row['p99']:7.1f}")
+	c = report["client"]
+	print(f"client: retries {c['retries']}, breaker {c['breaker']['state']} (opened {c['breaker']['opens']}x), max in flight {c['max_in_flight']}/{c['max_concurrency']}, connections {c.get('connections_created', 0)} new / {c.get('connections_reused', 0)} reused")
+	if "server" in report:
+		print("server: " + ", ".join(f"{k}={v}" for k, v in report["server"].items()))
+
+	if args.out:
+		os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+		with open(args.out, "w") as f:
+			json.dump(report, f, indent=2)
+		print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,235 @@
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from src.tools.load_narration import percentile
+
+
+ACTIONS = [
+	"talk to villager", "look around", "go north", "search for tracks", "east to the ruins",
+	"descend the stairs", "attack the foe", "back to the village", "cast fire bolt at the foe",
+]
+
+
+class HTTPConnection:
+	"""Minimal keep-alive HTTP/1.1 JSON client on asyncio streams (one request at a time)."""
+
+	def __init__(self, host: str, port: int):
+		self.host = host
+		self.port = port
+		self.reader: Optional[asyncio.StreamReader] = None
+		self.writer: Optional[asyncio.StreamWriter] = None
+
+	async def request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Tuple[int, Any]:
+		reused = self.writer is not None
+		try:
+			return await self._request(method, path, payload)
+		except (ConnectionError, asyncio.IncompleteReadError):
+			if not reused:
+				raise
+			# The server may close idle keep-alive connections; reconnect once
+			await self.close()
+			return await self._request(method, path, payload)
+
+	async def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]]) -> Tuple[int, Any]:
+		if self.writer is None:
+			self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+		body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+		head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+		self.writer.write(head.encode("ascii") + body)
+		await self.writer.drain()
+		status_line = await self.reader.readline()
+		if not status_line:
+			await self.close()
+			raise ConnectionError("server closed the connection")
+		status = int(status_line.split()[1])
+		length = 0
+		chunked = False
+		while True:
+			line = await self.reader.readline()
+			if line in (b"\r\n", b"\n", b""):
+				break
+			name, _, value = line.decode("latin-1").partition(":")
+			name = name.strip().lower()
+			if name == "content-length":
+				length = int(value.strip())
+			elif name == "transfer-encoding" and "chunked" in value.lower():
+				chunked = True
+		if chunked:
+			# Streamed responses (transcripts)
+			parts = []
+			while True:
+				size = int((await self.reader.readline()).split(b";")[0].strip(), 16)
+				if size == 0:
+					await self.reader.readline()
+					break
+				parts.append(await self.reader.readexactly(size))
+				await self.reader.readline()
+			data = b"".join(parts)
+		else:
+			data = await self.reader.readexactly(length) if length else b""
+		ctype_json = data[:1] in (b"{", b"[")
+		return status, json.loads(data) if ctype_json else data.decode("utf-8")
+
+	async def close(self) -> None:
+		if self.writer is not None:
+			self.writer.close()
+			try:
+				await self.writer.wait_closed()
+			except Exception:
+				pass
+			self.writer = None
+
+
+async def play_session(host: str, port: int, idx: int, args: argparse.Namespace, results: Dict[str, list]) -> None:
+	rng = random.Random(args.seed * 1000 + idx)
+	conn = HTTPConnection(host, port)
+	try:
+		start = time.perf_counter()
+		status, created = await conn.request("POST", "/sessions", {"names": [f"P{idx}-{i}" for i in range(args.players)], "seed": "Goblins raid the farms"})
+		results["create"].append(time.perf_counter() - start)
+		if status != 201:
+			results["outcomes"].append(f"create_{status}")
+			return
+		sid = created["id"]
+		for _ in range(args.turns):
+			start = time.perf_counter()
+			status, _ = await conn.request("POST", f"/sessions/{sid}/act", {"text": rng.choice(ACTIONS)})
+			results["act"].append(time.perf_counter() - start)
+			results["outcomes"].append("ok" if status == 200 else f"act_{status}")
+			if status == 409:
+				break
+			if args.think_ms > 0:
+				await asyncio.sleep(rng.uniform(0.5, 1.5) * args.think_ms / 1000.0)
+		start = time.perf_counter()
+		await conn.request("GET", f"/sessions/{sid}/transcript")
+		results["transcript"].append(time.perf_counter() - start)
+		if not args.keep:
+			await conn.request("DELETE", f"/sessions/{sid}")
+	except (OSError, ValueError, asyncio.IncompleteReadError) as exc:
+		results["outcomes"].append(type(exc).__name__)
+	finally:
+		await conn.close()
+
+
+async def run(host: str, port: int, args: argparse.Namespace) -> Dict[str, Any]:
+	results: Dict[str, list] = {"create": [], "act": [], "transcript": [], "outcomes": []}
+	gate = asyncio.Semaphore(args.concurrency)
+
+	async def one(i: int) -> None:
+		async with gate:
+			await play_session(host, port, i, args, results)
+
+	start = time.perf_counter()
+	await asyncio.gather(*(one(i) for i in range(args.sessions)))
+	wall = time.perf_counter() - start
+	conn = HTTPConnection(host, port)
+	_, server_stats = await conn.request("GET", "/stats")
+	await conn.close()
+	turns = sum(1 for o in results["outcomes"] if o == "ok")
+	requests = len(results["create"]) + len(results["act"]) + len(results["transcript"]) * (1 if args.keep else 2)
+	return {
+		"sessions": args.sessions,
+		"concurrency": args.concurrency,
+		"turns_per_session": args.turns,
+		"wall_s": wall,
+		"turns_per_s": turns / wall if wall else 0.0,
+		"requests_per_s": requests / wall if wall else 0.0,
+		"outcomes": dict(Counter(results["outcomes"])),
+		"act_ms": {f"p{p}": percentile(results["act"], p) * 1000 for p in (50, 90, 95, 99)},
+		"create_ms": {f"p{p}": percentile(results["create"], p) * 1000 for p in (50, 99)},
+		"server": server_stats,
+	}
+
+
+def _free_port() -> int:
+	with socket.socket() as s:
+		s.bind(("127.0.0.1", 0))
+		return s.getsockname()[1]
+
+
+def _wait_for(host: str, port: int, timeout: float = 60.0) -> None:
+	deadline = time.time() + timeout
+	while time.time() < deadline:
+		try:
+			with socket.create_connection((host, port), timeout=1):
+				return
+		except OSError:
+			time.sleep(0.2)
+	raise RuntimeError(f"server on {host}:{port} did not come up")
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Drive many concurrent game sessions against the headless server and report throughput.")
+	parser.add_argument("--url", default=None, help="Server URL; default starts `main.py serve` in a subprocess")
+	parser.add_argument("--sessions", type=int, default=500, help="Sessions to play in total")
+	parser.add_argument("--concurrency", type=int, default=200, help="Sessions in flight at once")
+	parser.add_argument("--turns", type=int, default=10, help="Actions per session")
+	parser.add_argument("--players", type=int, default=2)
+	parser.add_argument("--think-ms", type=float, default=0.0, help="Mean pause between a session's actions")
+	parser.add_argument("--keep", action="store_true", help="Leave sessions on the server (to measure a full table)")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--store", default=None, help="Spawned server: session store file, or 'memory' (default: a temporary file)")
+	parser.add_argument("--out", default=None, help="Optional JSON file for the report")
+	args = parser.parse_args()
+
+	proc = None
+	if args.url:
+		parsed = urlparse(args.url)
+		host, port = parsed.hostname or "127.0.0.1", parsed.port or 80
+	else:
+		host, port = "127.0.0.1", _free_port()
+		store = args.store or os.path.join(tempfile.mkdtemp(prefix="load_server_"), "store.sqlite3")
+		cmd = [sys.executable, os.path.join(PROJECT_ROOT, "main.py"), "serve", "--port", str(port), "--store", store]
+		proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT)
+		_wait_for(host, port)
+	try:
+		report = asyncio.run(run(host, port, args))
+	finally:
+		if proc is not None:
+			proc.terminate()
+			try:
+				proc.wait(timeout=10)
+			except subprocess.TimeoutExpired:
+				# A server whose event loop is stuck never runs its SIGTERM handler
+				proc.kill()
+				proc.wait()
+
+	print(f"{args.sessions} sessions x {args.turns} turns ({args.concurrency} concurrent) in {report['wall_s']:.2f}s against {host}:{port}")
+	print(f"throughput: {report['turns_per_s']:.0f} turns/s, {report['requests_per_s']:.0f} requests/s")
+	print("outcomes: " + ", ".join(f"{k}={v}" for k, v in sorted(report["outcomes"].items())))
+	row = report["act_ms"]
+	print(f"act_ms      p50 {row['p50']:7.1f}  p90 {row['p90']:7.1f}  p95 {row['p95']:7.1f}  p99 {row['p99']:7.1f}")
+	s = report["server"]
+	print(f"server: {s['sessions']} sessions open, {s['turns']} turns, turn p50 {s['turn_ms']['p50']:.1f} ms / p99 {s['turn_ms']['p99']:.1f} ms, max RSS {s.get('max_rss_mb') or 0:.0f} MB")
+	store = s.get("store", {})
+	if "cold" in store:
+		print(
+			f"store: {store['hot']} hot / {store['cold']} cold, hit rate {store['hit_rate']:.1%}, "
+			f"{store['rehydrated']} rehydrated (p50 {store['rehydrate_ms']['p50']:.2f} ms, p99 {store['rehydrate_ms']['p99']:.2f} ms), "
+			f"evicted {store['evicted_idle']} idle / {store['evicted_capacity']} over capacity"
+		)
+
+	if args.out:
+		os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+		with open(args.out, "w") as f:
+			json.dump(report, f, indent=2)
+		print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+import random
+import argparse
+from typing import Any, Dict, Iterator, List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from src.game.state import GameState
+from src.game.policies.rule_based import decide_response
+from src.game import journal
+from src.game.summary import RollingSummary
+from src.ui.game_session import _state_to_dict
+from src.ui.gemini_client import SYSTEM_INSTRUCTIONS, _build_prompt
+
+
+ACTIONS = [
+	"talk to villager", "buy a torch", "go north", "look around", "search for tracks",
+	"east to the ruins", "descend the stairs", "attack the foe", "cast cure wounds", "back to the village",
+]
+LOOT = ["torch", "rope", "healing potion", "silver coin", "rations", "old map", "dagger", "lantern oil"]
+
+
+# The instruction block every narration prompt used to start with
+LEGACY_INSTRUCTIONS = (
+	"System:\n"
+	"You are the Dungeon Master narrator. You will describe events, atmospheres, NPC dialogue, and hints. "
+	"You must not decide combat outcomes, damage, or game-rule changes — those are determined by the game engine. "
+	"The engine will supply the action outcome summary and current game state. Your job is to craft immersive narration based on that outcome. "
+	"If player input is confusing or nonsense, convert it into a meaningful narrative hook (e.g., “Your clumsy swing startles a fox; in the distance, a torch flares — perhaps someone is near”) "
+	"and give 2–3 clear suggestions (Fight / Explore / Talk / Inspect). Always include a short question to invite the next action. "
+	"Keep responses 2–4 sentences. Use tone: Mystical, dramatic storyteller.\n\n"
+	"You are a cinematic Dungeon Master narrating a dynamic fantasy RPG. "
+	"Use second-person narration (\"You step into the forest...\"). "
+	"If a player’s action is vague or unrelated, guide them gently back into the quest with clues, side characters, or narrative hints. "
+	"Include all player names in relevant moments. "
+	"Keep tone immersive, short, and story-like — never list actions or steps.\n\n"
+	"User (provide programmatic fields):\n\n"
+	"game_state: JSON containing location, players, HP, inventory, flags, turn.\n\n"
+	"action_summary: short string describing the engine result: e.g. \"Player 1 attacked goblin; roll 19; goblin HP reduced to 0; loot silver coin.\"\n\n"
+	"recent_player_text: raw text the player typed.\n\n"
+	"Assistant should output: A small paragraph (2–4 sentences) narrating the scene, with a trailing suggestion like: "
+	"“Will you strike again, search the clearing, or try to persuade them?”"
+)
+
+
+def legacy_prompt(game_state: Dict[str, Any], recent_player_action: str, action_summary: str) -> str:
+	# What every narration call used to send: instructions + repr of the state dict (dice log included)
+	return (
+		f"{LEGACY_INSTRUCTIONS}\n\n"
+		f"game_state: {game_state}\n\n"
+		f"action_summary: {action_summary or 'N/A'}\n\n"
+		f"recent_player_text: {recent_player_action}\n"
+	)
+
+
+Turn = Tuple[Dict[str, Any], str, str, List[str]]
+
+
+def synthetic_turns(turns: int, players: int, seed: int) -> Iterator[Turn]:
+	rng = random.Random(seed)
+	random.seed(seed)
+	state = GameState()
+	state.reset(num_players=players)
+	state.world.story_seed = "A cursed forest, a vanished baron, whispers under the ruins"
+	for i, p in enumerate(state.players):
+		p.name = f"Adventurer {i + 1}"
+	for turn in range(turns):
+		player = state.players[turn % len(state.players)]
+		text = rng.choice(ACTIONS)
+		engine_text, _ = decide_response(state, text)
+		if rng.random() < 0.3:
+			player.inventory.append(rng.choice(LOOT))
+		yield _state_to_dict(state), f"[{player.name}] {text}", f"{player.name}: {engine_text}", list(state.log)
+		state.add_log(f"{player.name}: {text}")
+		state.add_log(f"DM: {engine_text}")
+
+
+def journal_turns(session_id: str) -> Iterator[Turn]:
+	# Start from the session's snapshot (if any) and replay the turns still in the journal
+	snapshot_path = os.path.join(journal.JOURNAL_DIR, session_id, journal.SNAPSHOT_FILE)
+	state = GameState()
+	snapshot_seq = 0
+	if os.path.exists(snapshot_path):
+		with open(snapshot_path, encoding="utf-8") as f:
+			data = json.load(f)
+		state = GameState.from_dict(data["state"])
+		snapshot_seq = int(data.get("seq", 0))
+	for event in journal.iter_events(session_id):
+		if int(event.get("seq", 0)) <= snapshot_seq:
+			continue
+		state.apply_changes(event.get("changes") or {})
+		if event.get("type") != "turn":
+			continue
+		actor = event.get("actor", -1)
+		name = state.players[actor].name if 0 <= actor < len(state.players) else "All Players"
+		yield _state_to_dict(state), f"[{name}] {event.get('text', '')}", f"{name}: {event.get('engine', '')}", list(state.log)
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Replay a session and compare legacy, full-log and compact narration prompt sizes.")
+	parser.add_argument("--session", default=None, help="Journal session id to replay (default: a synthetic session)")
+	parser.add_argument("--turns", type=int, default=60, help="Turns for the synthetic session")
+	parser.add_argument("--players", type=int, default=4)
+	parser.add_argument("--seed", type=int, default=7)
+	parser.add_argument("--every", type=int, default=10, help="Print every Nth turn")
+	parser.add_argument("--out", default=None, help="Optional JSON file for the per-turn sizes")
+	args = parser.parse_args()
+
+	turns = journal_turns(args.session) if args.session else synthetic_turns(args.turns, args.players, args.seed)
+	rows = []
+	story = RollingSummary()
+	# full log = what a narrator would send for continuity without the rolling summary
+	print(f"{'turn':>5} {'legacy chars':>13} {'full log':>9} {'compact chars':>14} {'saved':>7}")
+	for i, (game_state, player_text, summary, log) in enumerate(turns, start=1):
+		legacy = len(legacy_prompt(game_state, player_text, summary))
+		full_log = len(_build_prompt({**game_state, "story": {"recent": log}}, player_text, summary))
+		compact = len(_build_prompt({**game_state, "story": story.context(log)}, player_text, summary))
+		rows.append({"turn": i, "legacy_chars": legacy, "full_log_chars": full_log, "compact_chars": compact})
+		if i % args.every == 0 or i == 1:
+			print(f"{i:>5} {legacy:>13} {full_log:>9} {compact:>14} {1 - (compact + len(SYSTEM_INSTRUCTIONS)) / legacy:>7.0%}")
+	if not rows:
+		print("No turns to replay.")
+		return
+
+	legacy_total = sum(r["legacy_chars"] for r in rows)
+	compact_total = sum(r["compact_chars"] for r in rows)
+	# The system prefix goes out with every call (no backend caches it), so it counts every time
+	sent_total = compact_total + len(SYSTEM_INSTRUCTIONS) * len(rows)
+	print(f"continuity context: last call {rows[-1]['compact_chars']} chars with the rolling summary vs {rows[-1]['full_log_chars']} sending the whole log")
+	print(f"{len(rows)} calls: legacy {legacy_total} chars, compact {compact_total} chars + {len(SYSTEM_INSTRUCTIONS)} prefix per call")
+	print(f"per call: legacy {legacy_total / len(rows):.0f}, compact {sent_total / len(rows):.0f} with the prefix (~{sent_total / len(rows) / 4:.0f} tokens)")
+	print(f"reduction: {1 - sent_total / legacy_total:.1%}")
+
+	if args.out:
+		os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+		with open(args.out, "w") as f:
+			json.dump({"system_chars": len(SYSTEM_INSTRUCTIONS), "turns": rows}, f, indent=2)
+		print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import json
+import argparse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+	sys.path.insert(0, PROJECT_ROOT)
+
+from src.ui.turn_timing import TURN_TIMINGS_PATH, TurnTimings
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Per-phase p50/p95/p99 from turn timing JSONL (TURN_TIMINGS_PATH or the Model Panel download).")
+	parser.add_argument("paths", nargs="*", default=[TURN_TIMINGS_PATH] if TURN_TIMINGS_PATH else [], help="JSONL files")
+	parser.add_argument("--skip-first", action="store_true", help="Drop each session's first turn (model loading)")
+	parser.add_argument("--speculative", choices=["all", "only", "none"], default="all")
+	parser.add_argument("--out", default=None, help="Optional JSON file for the summary")
+	args = parser.parse_args()
+	if not args.paths:
+		parser.error("no input: pass JSONL files or set TURN_TIMINGS_PATH")
+
+	timings = TurnTimings(history=10**7, path=None)
+	for path in args.paths:
+		with open(path, encoding="utf-8") as f:
+			for line in f:
+				if not line.strip():
+					continue
+				record = json.loads(line)
+				if args.skip_first and record.get("turn") == 1:
+					continue
+				if args.speculative != "all" and bool(record.get("speculative")) != (args.speculative == "only"):
+					continue
+				timings.records.append(record)
+
+	summary = timings.percentiles()
+	print(f"{len(timings.records)} turns")
+	print(f"{'phase':<12}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+	for name, row in summary.items():
+		print(f"{name:<12}{row['p50']:>10.1f}{row['p95']:>10.1f}{row['p99']:>10.1f}")
+
+	if args.out:
+		os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+		with open(args.out, "w") as f:
+			json.dump({"turns": len(timings.records), "phases": summary}, f, indent=2)
+		print(f"Saved results to {args.out}")
+
+
+if __name__ == "__main__":
+	main()
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -9,6 +10,8 @@ if str(PROJECT_ROOT) not in sys.path:
 import streamlit as st
 from src.game.state import GameState
 from src.game.loop import dm_step
+from src.game.journal import JOURNAL_DIR, new_session_id
+from src.ui.transcript_export import transcript_controls
 
 
 st.set_page_config(page_title="AI Dungeon Master", page_icon="🧙", layout="wide")
@@ -21,6 +24,7 @@ if "game_state" not in st.session_state:
     st.session_state.ended = False
     st.session_state.started = False
     st.session_state.num_players = 1
+    st.session_state.export_id = new_session_id()
 
 state: GameState = st.session_state.game_state
 
@@ -93,23 +97,18 @@ with right:
     if state.world.boss_active:
         try:
             from src.game.align_predictor import predict_alignment
-            seed_name = state.world.story_seed.split(" ")[0] or "Forest Guardian"
-            align = predict_alignment(seed_name, "Large", 45.0, 14.0, 3.0)
+            from src.game.bestiary import encounter_monster
+            monster = encounter_monster(state.world.story_seed)
+            align = predict_alignment(monster.name, monster.size, monster.hit_points, monster.armor_class, monster.challenge_rating)
             if align:
                 st.markdown("**🧭 Encounter Alignment (predicted)**")
-                st.write(align)
+                st.write(f"{align} (as {monster.name})")
         except Exception:
             pass
 
     st.markdown("**💾 Transcript**")
-    if st.button("Download transcript"):
-        transcript = "\n".join(state.log)
-        st.download_button(
-            label="Save transcript.txt",
-            data=transcript,
-            file_name="transcript.txt",
-            mime="text/plain"
-        )
+    # Written in chunks on a background thread; nothing is built in the request
+    transcript_controls(state.log, os.path.join(JOURNAL_DIR, st.session_state.export_id, "exports"), title="D&D AI Dungeon Master")
 
 st.divider()
 colA, colB = st.columns(2)
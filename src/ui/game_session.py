@@ -1,6 +1,8 @@
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+import time
+from concurrent.futures import wait
+from typing import Any, Dict, List, Optional, Tuple
 
 # Ensure project root on path for `import src.*` when run via `streamlit run src/ui/streamlit_app.py`
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -8,37 +10,157 @@ if str(PROJECT_ROOT) not in sys.path:
 	sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.game.state import GameState  # type: ignore
+from src.game.journal import SessionJournal  # type: ignore
+from src.game.lore import lore_for  # type: ignore
+from src.game.summary import RollingSummary  # type: ignore
 from src.game.policies.rule_based import decide_response  # type: ignore
 from src.ui.intent_bridge import get_intent_and_monster
-from src.ui.gemini_client import generate_narration
+from src.ui.narrator import PendingNarration, start_narration
+from src.ui.speculation import SpeculativeTurn, Speculator
 from src.ui.model_predict import predict as predict_ui_dict
+from src.ui.turn_timing import TurnTimer, TurnTimings
 
 
 def _state_to_dict(state: GameState) -> Dict[str, Any]:
-	return {
-		"players": [
-			{"name": p.name, "hp": p.hp, "inventory": list(p.inventory)}
-			for p in state.players
-		],
-		"world": {
-			"location": state.world.location,
-			"turn": state.world.turn,
-			"boss_active": state.world.boss_active,
-			"boss_hp": state.world.boss_hp,
-			"flags": dict(state.world.flags),
-			"story_seed": state.world.story_seed,
-			"quest": state.world.quest,
-		},
-		"dice_log": list(state.dice_log[-10:]),
-	}
+	# Sections are re-serialized only when their version changed; the top-level
+	# dict is fresh so callers may add keys (e.g. "last_intent") without leaking them.
+	snap = state.snapshot(("players", "world"))
+	snap["dice_log"] = state.dice_log[-10:]
+	return snap
 
 
 class GameSession:
-	def __init__(self, state: GameState):
+	def __init__(
+		self,
+		state: GameState,
+		journal: Optional[SessionJournal] = None,
+		narration_budget: Optional[float] = None,
+		speculator: Optional[Speculator] = None,
+	):
 		self.state = state
+		self.journal = journal
+		self.narration_budget = narration_budget
+		self.speculator = speculator
+		self.summary = RollingSummary()
+		self.timings = TurnTimings()
+		self.pending: List[PendingNarration] = []
 		if not hasattr(self.state, "log"):
 			self.state.log = []
 
+	def begin(self) -> None:
+		"""Mark the current state as a fresh game; compacts the journal into a snapshot."""
+		self.state.end_turn()
+		if self.journal is not None:
+			self.journal.snapshot(self.state, meta={"started": True, "ended": False, "last_actor": -1})
+
+	def _track(self, pending: Optional[PendingNarration]) -> None:
+		if pending is not None:
+			pending.log_index = len(self.state.log) - 1
+			self.pending.append(pending)
+
+	def has_pending_narration(self) -> bool:
+		return bool(self.pending)
+
+	def poll_narration(self) -> bool:
+		"""Swap in LLM narrations that finished within budget; expire overdue ones.
+
+		Returns True when the story log changed.
+		"""
+		changed = False
+		still_pending = []
+		for pending in self.pending:
+			text = pending.take()
+			if text is not None:
+				idx = pending.log_index
+				if 0 <= idx < len(self.state.log) and self.state.log[idx] == f"DM: {pending.fallback}":
+					self.state.replace_log(idx, f"DM: {text}")
+					changed = True
+			elif not pending.resolved and pending.overdue():
+				pending.expire()
+			if not pending.resolved:
+				still_pending.append(pending)
+		self.pending = still_pending
+		if changed and self.journal is not None:
+			self.journal.record({"type": "narration", "changes": self.state.end_turn()}, state=self.state)
+		return changed
+
+	def streaming_narration(self) -> Dict[int, str]:
+		"""Log index -> narration streamed so far, for entries still being written."""
+		partials = {}
+		for pending in self.pending:
+			text = pending.partial_text()
+			if text:
+				partials[pending.log_index] = f"DM: {text}"
+		return partials
+
+	def wait_for_narration(self, timeout: Optional[float] = None) -> bool:
+		"""Block until pending narrations finish or their budget runs out (at most `timeout`)."""
+		end = None if timeout is None else time.monotonic() + timeout
+		changed = False
+		while self.pending:
+			limit = max(p.remaining() for p in self.pending)
+			if end is not None:
+				limit = min(limit, end - time.monotonic())
+			if limit <= 0:
+				break
+			wait([p.future for p in self.pending], timeout=limit)
+			changed = self.poll_narration() or changed
+		return self.poll_narration() or changed
+
+	def _narration_state(self, text: str = "") -> Dict[str, Any]:
+		# Story so far (rolling summary) + recent log lines: constant-size context however long the game
+		data = _state_to_dict(self.state)
+		data["story"] = self.summary.context(self.state.log)
+		# A few bestiary/spell facts for this action and place, instead of raw CSV rows
+		world = self.state.world
+		data["lore"] = lore_for(world.location, text, world.boss_active)
+		return data
+
+	def speculate(self, actor: int) -> int:
+		"""Pre-play likely quick actions for `actor` while the table is idle."""
+		if self.speculator is None or self.pending:
+			return 0
+		return self.speculator.speculate(self.state, actor, self.narration_budget)
+
+	def _take_speculation(self, actor: int, text: str) -> Optional[SpeculativeTurn]:
+		if self.speculator is None:
+			return None
+		return self.speculator.take(self.state, actor, text)
+
+	def _commit_speculation(self, actor: int, text: str, turn: SpeculativeTurn, timer: TurnTimer) -> Tuple[str, Dict[str, Any]]:
+		# Same base version, so the dry run's diff is exactly this turn
+		with timer.phase("apply"):
+			self.state.apply_changes(turn.diff)
+			self.pending.extend(p for p in turn.pending if not p.resolved)
+		panel = dict(turn.panel)
+		panel["speculative"] = True
+		panel["narration_pending"] = bool(self.pending)
+		panel["state_version"] = self.state.version
+		with timer.phase("journal"):
+			panel["state_changes"] = self._record_turn(
+				actor, text, panel["intent_label"], panel["intent_confidence"], panel["monster_action"],
+				panel["engine_outcome"], turn.narration, panel["ended"],
+			)
+		panel["timings"] = self.timings.add(timer, turn=self.state.world.turn, actor=actor, speculative=True)
+		return turn.narration, panel
+
+	def _record_turn(self, actor: int, text: str, intent_label: str, intent_conf: float, monster: Dict[str, Any], engine_text: str, narration: str, ended: bool) -> Dict[str, Any]:
+		changes = self.state.end_turn()
+		if self.journal is not None:
+			self.journal.record({
+				"type": "turn",
+				"actor": actor,
+				"text": text,
+				"intent": intent_label,
+				"confidence": intent_conf,
+				"monster": monster,
+				"engine": engine_text,
+				"narration": narration,
+				"changes": changes,
+				"meta": {"started": True, "ended": ended, "last_actor": actor},
+			}, state=self.state)
+		return changes
+
 	@property
 	def story_log(self) -> List[str]:
 		return getattr(self.state, "log", [])
@@ -47,6 +169,13 @@ class GameSession:
 		self.state.add_log(f"{who}: {text}")
 
 	def handle_group_action(self, player_indices: list[int], text: str) -> Tuple[str, Dict[str, Any]]:
+		timer = TurnTimer()
+		if sorted(player_indices) == list(range(len(self.state.players))):
+			with timer.phase("speculation"):
+				speculated = self._take_speculation(-1, text)
+			if speculated is not None:
+				return self._commit_speculation(-1, text, speculated, timer)
+
 		# Build a readable group name
 		names = []
 		for i in player_indices:
@@ -54,25 +183,32 @@ class GameSession:
 				names.append(self.state.players[i].name)
 		group_name = " & ".join(names) if names else "All Players"
 
-		game_state_dict = _state_to_dict(self.state)
-		intent_label, intent_conf, monster_action = get_intent_and_monster(text, game_state_dict)
+		with timer.phase("state"):
+			game_state_dict = _state_to_dict(self.state)
+		intent_label, intent_conf, monster_action = get_intent_and_monster(text, game_state_dict, timer)
 
 		# Pass intent prediction and monster behavior to engine so it can use ML guidance
 		monster_dict = monster_action if isinstance(monster_action, dict) else {"action": str(monster_action)}
-		engine_text, end_game = decide_response(self.state, text, predicted_intent=intent_label, intent_confidence=intent_conf, monster_behavior=monster_dict)
+		with timer.phase("engine"):
+			engine_text, end_game = decide_response(self.state, text, predicted_intent=intent_label, intent_confidence=intent_conf, monster_behavior=monster_dict)
 
 		action_summary = f"{group_name}: {engine_text}"
-		narration = generate_narration(
-			game_state=_state_to_dict(self.state),
-			recent_player_action=f"[{group_name}] {text}",
-			action_summary=action_summary,
-		)
+		with timer.phase("narration"):
+			narration, pending = start_narration(
+				game_state=self._narration_state(text),
+				recent_player_action=f"[{group_name}] {text}",
+				action_summary=action_summary,
+				intent=intent_label,
+				budget=self.narration_budget,
+			)
 
-		# Single combined log line for actors
-		self.append_log(group_name, text)
-		self.append_log("DM", narration)
+			# Single combined log line for actors
+			self.append_log(group_name, text)
+			self.append_log("DM", narration)
+			self._track(pending)
 
-		ui_predictions = predict_ui_dict(text, _state_to_dict(self.state))
+		with timer.phase("predictions"):
+			ui_predictions = predict_ui_dict(text, _state_to_dict(self.state))
 
 		intent_applied = intent_conf >= 0.7
 		monster_used = bool(self.state.world.boss_active and monster_dict.get("action") not in {"idle", "watch"})
@@ -102,34 +238,53 @@ class GameSession:
 			"predictions": ui_predictions,
 			"actors": names,
 			"effect_message": " | ".join(effects) if effects else None,
+			"narration_pending": pending is not None,
+			"state_version": self.state.version,
 		}
+		with timer.phase("journal"):
+			panel["state_changes"] = self._record_turn(-1, text, intent_label, intent_conf, monster_dict, engine_text, narration, end_game)
+		panel["timings"] = self.timings.add(timer, turn=self.state.world.turn, actor=-1, speculative=False)
 		return narration, panel
 
 	def handle_player_action(self, player_idx: int, text: str) -> Tuple[str, Dict[str, Any]]:
-		game_state_dict = _state_to_dict(self.state)
+		timer = TurnTimer()
+		with timer.phase("speculation"):
+			speculated = self._take_speculation(player_idx, text)
+		if speculated is not None:
+			return self._commit_speculation(player_idx, text, speculated, timer)
+
+		with timer.phase("state"):
+			game_state_dict = _state_to_dict(self.state)
 
 		# Local ML: intent + monster behaviour
-		intent_label, intent_conf, monster_action = get_intent_and_monster(text, game_state_dict)
+		intent_label, intent_conf, monster_action = get_intent_and_monster(text, game_state_dict, timer)
 
 		# Deterministic engine outcome - now uses ML intent and monster behavior when confidence is high
 		monster_dict = monster_action if isinstance(monster_action, dict) else {"action": str(monster_action)}
-		engine_text, end_game = decide_response(self.state, text, predicted_intent=intent_label, intent_confidence=intent_conf, monster_behavior=monster_dict)
+		with timer.phase("engine"):
+			engine_text, end_game = decide_response(self.state, text, predicted_intent=intent_label, intent_confidence=intent_conf, monster_behavior=monster_dict)
 
 		# Narration strictly based on engine outcome (exact Gemini prompt is set inside the client)
 		player_name = self.state.players[player_idx].name if 0 <= player_idx < len(self.state.players) else f"Player {player_idx+1}"
 		action_summary = f"{player_name}: {engine_text}"
-		narration = generate_narration(
-			game_state=_state_to_dict(self.state),
-			recent_player_action=f"[{player_name}] {text}",
-			action_summary=action_summary,
-		)
+		# Fallback narration is logged right away; the LLM version replaces it if it arrives within budget
+		with timer.phase("narration"):
+			narration, pending = start_narration(
+				game_state=self._narration_state(text),
+				recent_player_action=f"[{player_name}] {text}",
+				action_summary=action_summary,
+				intent=intent_label,
+				budget=self.narration_budget,
+			)
 
-		# Log player with actual name and narrated DM text (model outputs only in side panel)
-		self.append_log(player_name, text)
-		self.append_log("DM", narration)
+			# Log player with actual name and narrated DM text (model outputs only in side panel)
+			self.append_log(player_name, text)
+			self.append_log("DM", narration)
+			self._track(pending)
 
 		# UI predictions dict for right-side cards
-		ui_predictions = predict_ui_dict(text, _state_to_dict(self.state))
+		with timer.phase("predictions"):
+			ui_predictions = predict_ui_dict(text, _state_to_dict(self.state))
 
 		intent_applied = intent_conf >= 0.7
 		monster_used = bool(self.state.world.boss_active and monster_dict.get("action") not in {"idle", "watch"})
@@ -158,6 +313,11 @@ class GameSession:
 			"ended": end_game,
 			"predictions": ui_predictions,
 			"effect_message": " | ".join(effects) if effects else None,
+			"narration_pending": pending is not None,
+			"state_version": self.state.version,
 		}
+		with timer.phase("journal"):
+			panel["state_changes"] = self._record_turn(player_idx, text, intent_label, intent_conf, monster_dict, engine_text, narration, end_game)
+		panel["timings"] = self.timings.add(timer, turn=self.state.world.turn, actor=player_idx, speculative=False)
 		return narration, panel
 
@@ -1,68 +1,157 @@
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
 from . import gemini_fallback
+from src.ai.llm_client import get_client
+from src.ai.narration_cache import get_cache, state_fingerprint
 
 
+# Fixed instructions, sent as the backend's system instruction rather than inside the
+# prompt. No backend caches them (Gemini's context cache needs far larger prefixes), so
+# they travel with every call: keep them short.
 SYSTEM_INSTRUCTIONS = (
-	"System:\n"
-	"You are the Dungeon Master narrator. You will describe events, atmospheres, NPC dialogue, and hints. "
-	"You must not decide combat outcomes, damage, or game-rule changes — those are determined by the game engine. "
-	"The engine will supply the action outcome summary and current game state. Your job is to craft immersive narration based on that outcome. "
-	"If player input is confusing or nonsense, convert it into a meaningful narrative hook (e.g., “Your clumsy swing startles a fox; in the distance, a torch flares — perhaps someone is near”) "
-	"and give 2–3 clear suggestions (Fight / Explore / Talk / Inspect). Always include a short question to invite the next action. "
-	"Keep responses 2–4 sentences. Use tone: Mystical, dramatic storyteller.\n\n"
-	"You are a cinematic Dungeon Master narrating a dynamic fantasy RPG. "
-	"Use second-person narration (\"You step into the forest...\"). "
-	"If a player’s action is vague or unrelated, guide them gently back into the quest with clues, side characters, or narrative hints. "
-	"Include all player names in relevant moments. "
-	"Keep tone immersive, short, and story-like — never list actions or steps.\n\n"
-	"User (provide programmatic fields):\n\n"
-	"game_state: JSON containing location, players, HP, inventory, flags, turn.\n\n"
-	"action_summary: short string describing the engine result: e.g. \"Player 1 attacked goblin; roll 19; goblin HP reduced to 0; loot silver coin.\"\n\n"
-	"recent_player_text: raw text the player typed.\n\n"
-	"Assistant should output: A small paragraph (2–4 sentences) narrating the scene, with a trailing suggestion like: "
-	"“Will you strike again, search the clearing, or try to persuade them?”"
+	"You are the Dungeon Master narrator of a fantasy RPG. The game engine decides outcomes, damage and rules; "
+	"narrate the outcome you are given and never change it. "
+	"Write 2–4 immersive sentences in second person (\"You step into the forest...\"), mystical and dramatic, "
+	"naming the players involved; never list steps. "
+	"Turn vague or nonsense input into a narrative hook that leads back to the quest. "
+	"End with a short question offering 2–3 choices (fight, explore, talk, inspect).\n"
+	"Fields: state = `key=value` pairs (loc, turn, party as `Name HPhp [items]`, set flags, boss HP, quest, seed); "
+	"story_so_far (oldest first) and recent_log: keep continuity; lore: facts for flavor only; "
+	"action_summary: the engine result; recent_player_text: what the player typed."
 )
 
 
-def _call_gemini_stub(prompt: str) -> Optional[str]:
+def _backend() -> str:
+	# "fake" streams the deterministic narrator with artificial latency (no API key needed)
+	return os.environ.get("NARRATION_BACKEND", "gemini").strip().lower()
+
+
+def llm_available() -> bool:
+	return _backend() == "fake" or get_client() is not None
+
+
+# Items listed per player in prompts; the rest are summarised as "+N"
+PROMPT_MAX_ITEMS = 6
+PROMPT_MAX_TEXT = 120
+
+
+def _clip(text: Any, limit: int = PROMPT_MAX_TEXT) -> str:
+	text = " ".join(str(text).split())
+	return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def encode_state(game_state: Dict[str, Any]) -> str:
 	"""
-	Lightweight placeholder so the app runs without extra deps.
-	If GEMINI_API_KEY is present but no SDK is installed, we gracefully return None.
+	Compact, deterministic one-line state for prompts. Only what narration
+	uses: no dice log, no unset flags, long inventories and texts are clipped.
 	"""
-	# Intentionally not importing any SDK to keep requirements simple.
-	# In a real setup, import Google's Gemini SDK and call here.
-	return None
+	world = game_state.get("world", {}) or {}
+	party = []
+	for p in game_state.get("players", []) or []:
+		items = list(p.get("inventory") or [])
+		member = f"{_clip(p.get('name', 'Adventurer'), 40)} {p.get('hp', '?')}hp"
+		if items:
+			shown = ",".join(_clip(item, 40) for item in items[:PROMPT_MAX_ITEMS])
+			extra = len(items) - PROMPT_MAX_ITEMS
+			member += f" [{shown}{f',+{extra}' if extra > 0 else ''}]"
+		party.append(member)
+	fields = [f"loc={world.get('location', '?')}", f"turn={world.get('turn', 0)}", f"party={'; '.join(party) or 'none'}"]
+	flags = sorted(name for name, value in (world.get("flags") or {}).items() if value)
+	if flags:
+		fields.append(f"flags={','.join(flags)}")
+	if world.get("boss_active"):
+		fields.append(f"boss={world.get('boss_hp', '?')}hp")
+	if world.get("quest"):
+		fields.append(f"quest={_clip(world['quest'])}")
+	if world.get("story_seed"):
+		fields.append(f"seed={_clip(world['story_seed'])}")
+	return " | ".join(fields)
 
-def generate_narration(
+
+def _build_prompt(game_state: Dict[str, Any], recent_player_action: str, action_summary: Optional[str]) -> str:
+	# Only the per-turn part; SYSTEM_INSTRUCTIONS goes out as the system prefix
+	story = game_state.get("story") or {}
+	context = ""
+	if story.get("summary"):
+		context += f"story_so_far: {story['summary']}\n"
+	if story.get("recent"):
+		context += f"recent_log: {' / '.join(story['recent'])}\n"
+	if game_state.get("lore"):
+		context += f"lore: {' / '.join(game_state['lore'])}\n"
+	return (
+		context
+		+ f"state: {encode_state(game_state)}\n"
+		f"action_summary: {_clip(action_summary or 'N/A', 400)}\n"
+		f"recent_player_text: {_clip(recent_player_action, 200)}"
+	)
+
+
+def stream_llm_narration(
 	game_state: Dict[str, Any],
 	recent_player_action: str = "",
 	action_summary: Optional[str] = None,
-) -> str:
+	intent: Optional[str] = None,
+) -> Iterator[str]:
 	"""
-	Generate a short DM paragraph. If GEMINI_API_KEY is missing or any error occurs,
-	falls back to deterministic narration.
+	Yield LLM narration in chunks as the model produces them. A cache hit is
+	yielded as a single chunk; only a completed stream is cached. Yields nothing
+	when the model is unavailable; backend errors propagate to the consumer.
+	"""
+	if not llm_available():
+		return
+	cache = get_cache()
+	key = state_fingerprint(game_state, action_summary or recent_player_action, intent)
+	cached = cache.get(key)
+	if cached:
+		yield cached
+		return
+	if _backend() == "fake":
+		chunks = gemini_fallback.stream_fake(game_state, recent_player_action, action_summary)
+	else:
+		chunks = get_client().stream(_build_prompt(game_state, recent_player_action, action_summary), system=SYSTEM_INSTRUCTIONS)
+	parts = []
+	for chunk in chunks:
+		if chunk:
+			parts.append(chunk)
+			yield chunk
+	text = "".join(parts).strip()
+	if text:
+		cache.put(key, text)
+
+
+def generate_llm_narration(
+	game_state: Dict[str, Any],
+	recent_player_action: str = "",
+	action_summary: Optional[str] = None,
+	intent: Optional[str] = None,
+) -> Optional[str]:
+	"""
+	LLM-only narration: a cached or fresh model reply, or None when the model is
+	unavailable or fails. Replies are cached by situation (see src/ai/narration_cache.py).
 	"""
-	api_key = os.environ.get("GEMINI_API_KEY")
 	try:
-		if api_key:
-			prompt = (
-				f"{SYSTEM_INSTRUCTIONS}\n\n"
-				f"game_state: {game_state}\n\n"
-				f"action_summary: {action_summary or 'N/A'}\n\n"
-				f"recent_player_text: {recent_player_action}\n"
-			)
-			resp = _call_gemini_stub(prompt)
-			if resp and resp.strip():
-				return resp.strip()
+		text = "".join(stream_llm_narration(game_state, recent_player_action, action_summary, intent)).strip()
 	except Exception:
-		pass
+		return None
+	return text or None
+
 
+def generate_narration(
+	game_state: Dict[str, Any],
+	recent_player_action: str = "",
+	action_summary: Optional[str] = None,
+	intent: Optional[str] = None,
+) -> str:
+	"""
+	Generate a short DM paragraph. If GEMINI_API_KEY is missing or any error occurs,
+	falls back to deterministic narration (which is never cached).
+	"""
+	text = generate_llm_narration(game_state, recent_player_action, action_summary, intent)
+	if text:
+		return text
 	return gemini_fallback.generate_narration(
 		game_state=game_state,
 		recent_player_action=recent_player_action,
 		action_summary=action_summary,
 	)
-
-
@@ -1,5 +1,13 @@
+import os
 import random
-from typing import Any, Dict, Optional
+import re
+import time
+from typing import Any, Dict, Iterator, Optional
+
+
+# Latency profile of the fake streaming backend (NARRATION_BACKEND=fake)
+FAKE_FIRST_TOKEN_S = float(os.environ.get("FAKE_STREAM_FIRST_TOKEN_S", "0.4"))
+FAKE_TOKEN_S = float(os.environ.get("FAKE_STREAM_TOKEN_S", "0.04"))
 
 
 def _variation() -> str:
@@ -48,3 +56,21 @@ def generate_narration(
 	return " ".join(lines[: random.choice([2, 3, 4])])
 
 
+def stream_fake(
+	game_state: Dict[str, Any],
+	recent_player_action: str,
+	action_summary: Optional[str] = None,
+	first_token_delay: Optional[float] = None,
+	token_delay: Optional[float] = None,
+) -> Iterator[str]:
+	"""
+	Local stand-in for a streaming LLM: yields this narrator's text word by word,
+	with a time-to-first-token and per-token delay, so streaming can be exercised offline.
+	"""
+	text = generate_narration(game_state, recent_player_action, action_summary)
+	time.sleep(FAKE_FIRST_TOKEN_S if first_token_delay is None else first_token_delay)
+	delay = FAKE_TOKEN_S if token_delay is None else token_delay
+	for i, word in enumerate(re.findall(r"\S+\s*", text)):
+		if i and delay > 0:
+			time.sleep(delay)
+		yield word
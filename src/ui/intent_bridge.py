@@ -1,9 +1,12 @@
 import json
+import threading
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
 import joblib
 
+from src.ui.turn_timing import TurnTimer, phase
+
 # Lightweight, resilient glue that can operate without a trained classifier.
 #
 # Expected final API:
@@ -54,10 +57,10 @@ class _StubModel:
 		if not world.get("boss_active"):
 			return {"action": "idle", "detail": "No active encounter."}
 		
-		# Try to load trained monster behavior model
-		if MONSTER_BEHAVIOR_MODEL_PATH.exists():
+		# Try the trained monster behavior model
+		data = load_behavior_model()
+		if data is not None:
 			try:
-				data = joblib.load(MONSTER_BEHAVIOR_MODEL_PATH)
 				model = data["model"]
 				le_location = data["le_location"]
 				le_intent = data["le_intent"]
@@ -125,29 +128,48 @@ class _SklearnIntentModel(_StubModel):
 
 
 _MODEL: Optional[_StubModel] = None
+_BEHAVIOR: Optional[Any] = None  # False once loading failed, so a missing model costs nothing per turn
+_LOAD_LOCK = threading.Lock()
 
 
 def load_model():
 	# Prefer trained intent model; fall back to heuristics.
 	global _MODEL
-	if _MODEL is None:
-		if INTENT_MODEL_PATH.exists():
-			try:
-				pipeline = joblib.load(INTENT_MODEL_PATH)
-				_MODEL = _SklearnIntentModel(pipeline)
-			except Exception:
+	with _LOAD_LOCK:
+		if _MODEL is None:
+			if INTENT_MODEL_PATH.exists():
+				try:
+					pipeline = joblib.load(INTENT_MODEL_PATH)
+					_MODEL = _SklearnIntentModel(pipeline)
+				except Exception:
+					_MODEL = _StubModel()
+			else:
 				_MODEL = _StubModel()
-		else:
-			_MODEL = _StubModel()
-	return _MODEL
+		return _MODEL
+
+
+def load_behavior_model() -> Optional[Dict[str, Any]]:
+	# Loaded once per process and shared by every session
+	global _BEHAVIOR
+	with _LOAD_LOCK:
+		if _BEHAVIOR is None:
+			_BEHAVIOR = False
+			if MONSTER_BEHAVIOR_MODEL_PATH.exists():
+				try:
+					_BEHAVIOR = joblib.load(MONSTER_BEHAVIOR_MODEL_PATH)
+				except Exception:
+					pass
+		return _BEHAVIOR if _BEHAVIOR is not False else None
 
 
-def get_intent_and_monster(text: str, game_state: Dict[str, Any]) -> Tuple[str, float, Any]:
-	model = load_model()
-	label, conf = model.predict_intent(text, game_state)
+def get_intent_and_monster(text: str, game_state: Dict[str, Any], timer: Optional[TurnTimer] = None) -> Tuple[str, float, Any]:
+	with phase(timer, "intent"):
+		model = load_model()  # the first turn pays for loading it
+		label, conf = model.predict_intent(text, game_state)
 	# Store last intent in state for monster behavior prediction
 	game_state["last_intent"] = label
-	monster = model.predict_monster_behaviour(game_state)
+	with phase(timer, "monster"):
+		monster = model.predict_monster_behaviour(game_state)
 	return label, conf, monster
 
 
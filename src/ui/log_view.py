@@ -0,0 +1,81 @@
+import html
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+
+# Entries always shown (the latest), and how many more each "load older" click adds
+LOG_WINDOW = int(os.environ.get("LOG_WINDOW", "40"))
+LOG_PAGE = int(os.environ.get("LOG_PAGE", "40"))
+FRESH_ENTRIES = 2  # the newest turn (player line + DM line) fades in
+
+
+def entry_html(entry: str, fresh: bool = False) -> str:
+	css = " class='fade-in'" if fresh else ""
+	return f"<div{css}>{html.escape(entry)}</div>"
+
+
+class LogView:
+	"""Renders the story log as a few HTML blocks instead of one element per entry.
+
+	The log is cut into fixed pages of `page` entries counted from the start,
+	so a page's HTML never changes once the page is full and is cached as one
+	string. Only the tail (the last `window` entries, rounded down to a page
+	boundary) is assembled per render, from a per-entry cache keyed by index
+	and checked against the entry text (narrations replace their fallback
+	line in place). Older pages are added on request.
+	"""
+
+	def __init__(self, window: int = LOG_WINDOW, page: int = LOG_PAGE):
+		self.window = max(1, window)
+		self.page = max(1, page)
+		self._entries: Dict[int, Tuple[str, bool, str]] = {}
+		self._pages: Dict[int, Tuple[Tuple[str, ...], str]] = {}
+		self.stats = {"renders": 0, "entry_hits": 0, "entry_renders": 0, "page_hits": 0, "page_renders": 0}
+
+	def tail_start(self, total: int) -> int:
+		return max(0, total - self.window) // self.page * self.page
+
+	def first_shown(self, total: int, older_pages: int = 0) -> int:
+		return max(0, self.tail_start(total) - max(0, older_pages) * self.page)
+
+	def _entry(self, idx: int, entry: str, fresh: bool) -> str:
+		cached = self._entries.get(idx)
+		if cached is not None and cached[1] == fresh and cached[0] == entry:
+			self.stats["entry_hits"] += 1
+			return cached[2]
+		self.stats["entry_renders"] += 1
+		rendered = entry_html(entry, fresh)
+		self._entries[idx] = (entry, fresh, rendered)
+		return rendered
+
+	def _page(self, number: int, entries: Sequence[str]) -> str:
+		key = tuple(entries)
+		cached = self._pages.get(number)
+		if cached is not None and cached[0] == key:
+			self.stats["page_hits"] += 1
+			return cached[1]
+		self.stats["page_renders"] += 1
+		start = number * self.page
+		rendered = "".join(self._entry(start + i, entry, False) for i, entry in enumerate(entries))
+		self._pages[number] = (key, rendered)
+		return rendered
+
+	def render(self, log: Sequence[str], older_pages: int = 0, streaming: Optional[Dict[int, str]] = None) -> Tuple[str, int]:
+		"""HTML for the visible part of the log and how many older entries stay hidden.
+
+		`streaming` maps log indexes to partial narration text, drawn with a cursor
+		and never cached.
+		"""
+		self.stats["renders"] += 1
+		streaming = streaming or {}
+		total = len(log)
+		tail = self.tail_start(total)
+		first = self.first_shown(total, older_pages)
+		parts = [self._page(number, log[number * self.page:(number + 1) * self.page]) for number in range(first // self.page, tail // self.page)]
+		fresh_from = total - FRESH_ENTRIES
+		for idx in range(tail, total):
+			if idx in streaming:
+				parts.append(f"<div>{html.escape(streaming[idx])}▌</div>")
+			else:
+				parts.append(self._entry(idx, log[idx], idx >= fresh_from))
+		return "".join(parts), first
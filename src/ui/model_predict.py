@@ -1,9 +1,30 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import os
+import threading
 import joblib
 
+from src.game.bestiary import encounter_monster
 from src.ui.intent_bridge import get_intent_and_monster
 
+HOSTILITY_MODEL_PATH = os.path.join("reports", "artifacts", "hostility_model.joblib")
+
+_HOSTILITY: Optional[Any] = None  # False once loading failed
+_HOSTILITY_LOCK = threading.Lock()
+
+
+def load_hostility_model() -> Optional[Any]:
+	# Loaded once per process and shared by every session (was reloaded on each turn)
+	global _HOSTILITY
+	with _HOSTILITY_LOCK:
+		if _HOSTILITY is None:
+			_HOSTILITY = False
+			if os.path.exists(HOSTILITY_MODEL_PATH):
+				try:
+					_HOSTILITY = joblib.load(HOSTILITY_MODEL_PATH)  # this is a full pipeline
+				except Exception:
+					pass
+		return _HOSTILITY if _HOSTILITY is not False else None
+
 
 def predict(text: str, game_state: Dict[str, Any]) -> Dict[str, Any]:
 	"""
@@ -24,18 +45,21 @@ def predict(text: str, game_state: Dict[str, Any]) -> Dict[str, Any]:
 		else:
 			monster_str = monster_action if isinstance(monster_action, str) else str(monster_action)
 		# If hostility model exists, refine monster behavior label
-		hostility_path = os.path.join("reports", "artifacts", "hostility_model.joblib")
-		if os.path.exists(hostility_path):
+		model = load_hostility_model()
+		if model is not None:
 			try:
-				model = joblib.load(hostility_path)  # this is a full pipeline
-				# Build a minimal feature row from current game_state for prediction
+				import pandas as pd
+				# Feature row of the bestiary monster the story seed describes (real HP/AC/CR)
 				world = game_state.get("world", {}) or {}
-				name = (world.get("story_seed") or "creature").split(" ")[0]
-				size = "Medium"
-				hp = world.get("boss_hp") or 10
-				ac = 12
-				cr = 1.0
-				X = [{"name": name, "size": size, "hit_points": hp, "armor_class": ac, "challenge_rating_num": cr}]
+				monster = encounter_monster(world.get("story_seed") or "")
+				X = pd.DataFrame([{
+					"__text__": f"{monster.name} {monster.kind}",
+					"name": monster.name,
+					"size": monster.size,
+					"hit_points": monster.hit_points,
+					"armor_class": monster.armor_class,
+					"challenge_rating_num": monster.challenge_rating,
+				}])
 				host_label = model.predict(X)[0]
 				if str(host_label) == "hostile":
 					monster_str = "Aggressive (likely to attack)"
@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from . import gemini_fallback
+from .gemini_client import llm_available, stream_llm_narration
+
+
+# Seconds the LLM has to beat the fallback text; later answers are dropped
+NARRATION_BUDGET_S = float(os.environ.get("NARRATION_BUDGET_S", "3.0"))
+NARRATION_WORKERS = int(os.environ.get("NARRATION_WORKERS", "4"))
+# Once the first token beats the budget the stream is kept, up to this many seconds in total
+NARRATION_STREAM_TIMEOUT_S = float(os.environ.get("NARRATION_STREAM_TIMEOUT_S", "20"))
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+_STATS_LOCK = threading.Lock()
+_STATS: Dict[str, int] = {
+	"submitted": 0,
+	"on_time": 0,
+	"timeouts": 0,
+	"late": 0,
+	"failed": 0,
+	"streamed": 0,
+}
+
+
+def _executor() -> ThreadPoolExecutor:
+	global _EXECUTOR
+	with _EXECUTOR_LOCK:
+		if _EXECUTOR is None:
+			_EXECUTOR = ThreadPoolExecutor(max_workers=NARRATION_WORKERS, thread_name_prefix="narration")
+		return _EXECUTOR
+
+
+def _count(key: str) -> None:
+	with _STATS_LOCK:
+		_STATS[key] += 1
+
+
+def stats() -> Dict[str, int]:
+	with _STATS_LOCK:
+		return dict(_STATS)
+
+
+@dataclass
+class PendingNarration:
+	deadline: float
+	stream_deadline: float
+	fallback: str = ""
+	future: Optional[Future] = None
+	log_index: int = -1
+	partial: str = ""
+	first_token_at: Optional[float] = None
+	completed_at: Optional[float] = None
+	timed_out: bool = False
+	resolved: bool = False
+	lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+	def _consume(self, chunks: Iterator[str]) -> Optional[str]:
+		for chunk in chunks:
+			with self.lock:
+				if self.resolved:
+					break
+				if self.first_token_at is None:
+					self.first_token_at = time.monotonic()
+				self.partial += chunk
+		return self.partial.strip() or None
+
+	def _on_done(self, _future: Future) -> None:
+		with self.lock:
+			self.completed_at = time.monotonic()
+			if self.timed_out:
+				_count("late")
+
+	def _streaming(self) -> bool:
+		# First token arrived within budget: the stream is shown and allowed to finish
+		return self.first_token_at is not None and self.first_token_at <= self.deadline
+
+	def overdue(self) -> bool:
+		now = time.monotonic()
+		if self._streaming():
+			return now > self.stream_deadline
+		return now > self.deadline
+
+	def expire(self) -> None:
+		"""Give up on the LLM; a completion after this point is counted as late."""
+		with self.lock:
+			if self.resolved:
+				return
+			self.resolved = True
+			self.timed_out = True
+			late = self.completed_at is not None
+		_count("timeouts")
+		if late:
+			_count("late")
+
+	def take(self) -> Optional[str]:
+		"""The LLM text if it arrived within budget, else None (and the job is settled)."""
+		with self.lock:
+			if self.resolved or self.completed_at is None:
+				return None
+			limit = self.stream_deadline if self._streaming() else self.deadline
+			on_time = self.completed_at <= limit
+			if on_time:
+				self.resolved = True
+		if not on_time:
+			self.expire()
+			return None
+		try:
+			text = self.future.result()
+		except Exception:
+			text = None
+		if not text:
+			_count("failed")
+			return None
+		_count("on_time")
+		if self.first_token_at is not None and self.first_token_at < self.completed_at:
+			_count("streamed")
+		return text
+
+	def partial_text(self) -> Optional[str]:
+		"""Text streamed so far, while the stream is still running and within budget."""
+		with self.lock:
+			if self.resolved or not self.partial or not self._streaming():
+				return None
+			return self.partial
+
+	def remaining(self) -> float:
+		deadline = self.stream_deadline if self._streaming() else self.deadline
+		return max(0.0, deadline - time.monotonic())
+
+
+def start_narration(
+	game_state: Dict[str, Any],
+	recent_player_action: str,
+	action_summary: Optional[str],
+	intent: Optional[str] = None,
+	budget: Optional[float] = None,
+) -> Tuple[str, Optional[PendingNarration]]:
+	"""Return (text to show now, pending LLM job or None).
+
+	The deterministic fallback narration is returned immediately. When an LLM
+	is configured, it is streamed in the background; if its first token beats
+	the budget the partial text can be shown as it grows and the full reply
+	replaces the fallback (see GameSession.poll_narration).
+	"""
+	fallback = gemini_fallback.generate_narration(
+		game_state=game_state,
+		recent_player_action=recent_player_action,
+		action_summary=action_summary,
+	)
+	if not llm_available():
+		return fallback, None
+	budget = NARRATION_BUDGET_S if budget is None else budget
+	now = time.monotonic()
+	pending = PendingNarration(
+		deadline=now + budget,
+		stream_deadline=now + max(budget, NARRATION_STREAM_TIMEOUT_S),
+		fallback=fallback,
+	)
+	chunks = stream_llm_narration(game_state, recent_player_action, action_summary, intent)
+	pending.future = _executor().submit(pending._consume, chunks)
+	pending.future.add_done_callback(pending._on_done)
+	_count("submitted")
+	return fallback, pending
@@ -0,0 +1,182 @@
+import copy
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.game.state import GameState
+
+
+# The Streamlit quick actions; also the candidates for speculation
+QUICK_ACTIONS: Tuple[Tuple[str, str], ...] = (
+	("⚔️ Attack", "attack the threat"),
+	("🧭 Explore", "explore the area"),
+	("🗣️ Talk", "talk to the nearest NPC"),
+	("🎒 Inventory", "check inventory"),
+	("🏃 Run", "flee back to safety"),
+)
+
+SPECULATION_ENABLED = os.environ.get("SPECULATIVE_NARRATION", "0").lower() in ("1", "true", "yes", "on")
+SPECULATION_TOP_K = int(os.environ.get("SPECULATION_TOP_K", "3"))
+SPECULATION_WORKERS = int(os.environ.get("SPECULATION_WORKERS", "2"))
+# Below this hit rate (after a warm-up) only the single most likely action is pre-generated
+SPECULATION_MIN_HIT_RATE = float(os.environ.get("SPECULATION_MIN_HIT_RATE", "0.2"))
+SPECULATION_WARMUP = 10
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+	global _EXECUTOR
+	with _EXECUTOR_LOCK:
+		if _EXECUTOR is None:
+			_EXECUTOR = ThreadPoolExecutor(max_workers=SPECULATION_WORKERS, thread_name_prefix="speculation")
+		return _EXECUTOR
+
+
+@dataclass
+class SpeculativeTurn:
+	"""Outcome of a dry-run turn, ready to be applied to the live state."""
+	narration: str
+	panel: Dict[str, Any]
+	diff: Dict[str, Any]
+	pending: List[Any]
+	elapsed: float
+
+
+@dataclass
+class _Job:
+	version: int
+	actor: int
+	text: str
+	future: Future
+
+
+def _dry_run(state: GameState, actor: int, text: str, budget: Optional[float]) -> SpeculativeTurn:
+	# Imported here: game_session imports this module
+	from .game_session import GameSession
+
+	start = time.perf_counter()
+	log_start, dice_start = len(state.log), len(state.dice_log)
+	clone = GameSession(state, narration_budget=budget)
+	clone.timings.path = None  # dry runs are not turns; only a committed one is recorded
+	if actor == -1:
+		_, panel = clone.handle_group_action(list(range(len(state.players))), text)
+	else:
+		_, panel = clone.handle_player_action(actor, text)
+	clone.wait_for_narration(timeout=budget)
+	snap = state.snapshot()
+	diff = {
+		"players": snap["players"],
+		"world": snap["world"],
+		"log": {"start": log_start, "entries": list(state.log[log_start:])},
+		"dice_log": {"start": dice_start, "entries": list(state.dice_log[dice_start:])},
+	}
+	narration = state.log[-1].split(": ", 1)[-1] if state.log else ""
+	return SpeculativeTurn(narration, panel, diff, list(clone.pending), time.perf_counter() - start)
+
+
+class Speculator:
+	"""Pre-plays the likely next quick actions on copies of the state.
+
+	Jobs are keyed by (state version, actor, action). A job is only used when
+	the live state still has the version it was copied from, so the dry run is
+	exactly the turn that would have been played. Work for any other version
+	is cancelled if not started yet, otherwise counted as wasted.
+	"""
+
+	def __init__(self, actions: Tuple[str, ...] = tuple(text for _, text in QUICK_ACTIONS), top_k: int = SPECULATION_TOP_K):
+		self.actions = actions
+		self.top_k = max(1, top_k)
+		self.picks: Counter = Counter()
+		self.jobs: Dict[Tuple[int, int, str], _Job] = {}
+		# Re-entrant: a finished job's waste callback runs inline under the lock
+		self.lock = threading.RLock()
+		self.stats: Dict[str, float] = {
+			"launched": 0, "hits": 0, "misses": 0, "cancelled": 0, "wasted": 0,
+			"wasted_s": 0.0, "used_s": 0.0,
+		}
+
+	def ranked(self) -> List[str]:
+		order = {text: i for i, text in enumerate(self.actions)}
+		return sorted(self.actions, key=lambda text: (-self.picks[text], order[text]))
+
+	def effective_top_k(self) -> int:
+		launched = self.stats["launched"]
+		if launched >= SPECULATION_WARMUP and self.stats["hits"] / launched < SPECULATION_MIN_HIT_RATE:
+			return 1
+		return self.top_k
+
+	def _discard(self, keep_version: Optional[int]) -> None:
+		for key, job in list(self.jobs.items()):
+			if job.version == keep_version:
+				continue
+			del self.jobs[key]
+			if job.future.cancel():
+				self.stats["cancelled"] += 1
+			else:
+				self.stats["wasted"] += 1
+				job.future.add_done_callback(self._count_waste)
+
+	def _count_waste(self, future: Future) -> None:
+		try:
+			elapsed = future.result().elapsed
+		except Exception:
+			return
+		with self.lock:
+			self.stats["wasted_s"] += elapsed
+
+	def speculate(self, state: GameState, actor: int, budget: Optional[float] = None) -> int:
+		"""Launch dry runs for the most likely actions of `actor`; returns how many were started."""
+		version = state.version
+		started = 0
+		with self.lock:
+			self._discard(version)
+			for text in self.ranked()[: self.effective_top_k()]:
+				key = (version, actor, text)
+				if key in self.jobs:
+					continue
+				future = _executor().submit(_dry_run, copy.deepcopy(state), actor, text, budget)
+				self.jobs[key] = _Job(version, actor, text, future)
+				self.stats["launched"] += 1
+				started += 1
+		return started
+
+	def take(self, state: GameState, actor: int, text: str) -> Optional[SpeculativeTurn]:
+		"""The pre-played turn for this exact action and state, or None."""
+		with self.lock:
+			if text in self.actions:
+				self.picks[text] += 1
+			job = self.jobs.pop((state.version, actor, text), None)
+			self._discard(None)
+			if job is None:
+				if text in self.actions:
+					self.stats["misses"] += 1
+				return None
+		# A job still running is waited for: it is already doing this very turn
+		try:
+			result = job.future.result()
+		except Exception:
+			with self.lock:
+				self.stats["misses"] += 1
+			return None
+		with self.lock:
+			self.stats["hits"] += 1
+			self.stats["used_s"] += result.elapsed
+		return result
+
+	def cancel(self) -> None:
+		with self.lock:
+			self._discard(None)
+
+	def snapshot(self) -> Dict[str, Any]:
+		with self.lock:
+			data: Dict[str, Any] = dict(self.stats)
+			data["in_flight"] = sum(1 for job in self.jobs.values() if not job.future.done())
+		data["hit_rate"] = data["hits"] / data["launched"] if data["launched"] else 0.0
+		data["top_k"] = self.effective_top_k()
+		return data
@@ -1,5 +1,6 @@
-import base64
+import os
 import sys
+import time
 from pathlib import Path
 
 # Ensure project root on sys.path so `import src.*` works in Streamlit
@@ -9,129 +10,59 @@ if str(PROJECT_ROOT) not in sys.path:
 
 import streamlit as st
 from src.game.state import GameState
+from src.game.journal import JOURNAL_DIR, SessionJournal, is_valid_session_id, new_session_id, resume
+from src.game import savefile
 from src.ui.game_session import GameSession
-
-
-def _load_base64(path: Path) -> str:
-	try:
-		return base64.b64encode(path.read_bytes()).decode("utf-8")
-	except Exception:
-		return ""
-
-
-ASSETS_DIR = Path(__file__).resolve().parent
-MAIN_BG = _load_base64(ASSETS_DIR / "wp2770223-dd-wallpaper.jpg")
-STATS_BG = _load_base64(ASSETS_DIR / "wp2770226-dd-wallpaper.jpg")
+from src.ui.log_view import LogView
+from src.ui.theme import theme_css
+from src.ui.turn_timing import PHASES
+from src.ui.transcript_export import transcript_controls
+from src.ui.narrator import stats as narrator_stats
+from src.ui.speculation import QUICK_ACTIONS, SPECULATION_ENABLED, Speculator
+from src.ai.llm_client import get_client
+from src.rl.numpy_policy import load_policy
 
 
 st.set_page_config(page_title="AI Dungeon Master (Hybrid Prototype)", page_icon="🧙", layout="wide")
+_RUN_START = time.perf_counter()
 
-# Dark futuristic style with gentle fades + custom imagery
-DARK_CSS = f"""
-<style>
-  .stApp {{
-    background-image:
-      linear-gradient(135deg, rgba(5,7,11,0.88), rgba(7,10,16,0.92)),
-      url("data:image/jpeg;base64,{MAIN_BG}");
-    background-size: cover;
-    background-attachment: fixed;
-    background-position: center;
-    color: #e0e6ef;
-  }}
-  .block-container {{ padding-top: 1.25rem; }}
-  .panel {{
-    background: rgba(12, 15, 22, 0.82);
-    border: 1px solid #1f2530;
-    border-radius: 10px;
-    padding: 0.75rem 1rem;
-    box-shadow: 0 0 24px rgba(0,0,0,0.35);
-    backdrop-filter: blur(2px);
-  }}
-  .story-bg {{
-    background-image:
-      linear-gradient(135deg, rgba(9,12,18,0.88), rgba(10,14,21,0.75)),
-      url("data:image/jpeg;base64,{STATS_BG}");
-    background-size: cover;
-    background-position: center;
-  }}
-  .story-log {{ max-height: 60vh; overflow-y: auto; }}
-  .fade-in {{ animation: fadeIn 350ms ease-out; }}
-  @keyframes fadeIn {{
-    from {{ opacity: 0; transform: translateY(4px); }}
-    to {{ opacity: 1; transform: translateY(0); }}
-  }}
-  .card {{
-    border: 1px solid #263043;
-    border-radius: 8px;
-    padding: 0.5rem 0.75rem;
-    margin-bottom: 0.5rem;
-    background: rgba(16, 20, 30, 0.82);
-    backdrop-filter: blur(2px);
-  }}
-  .stats-card {{
-    background-image:
-      linear-gradient(180deg, rgba(7,10,16,0.82), rgba(6,9,14,0.92)),
-      url("data:image/jpeg;base64,{STATS_BG}");
-    background-size: cover;
-    background-position: center;
-    color: #dfe6f7;
-    box-shadow: 0 0 20px rgba(0,0,0,0.3);
-  }}
-  .accent {{ color: #6ad0ff; }}
-  .hint {{ color: #b8c7e0; font-size: 0.9rem; }}
-  .top-scene {{
-    background: linear-gradient(135deg, rgba(16,20,30,0.88), rgba(8,12,20,0.88));
-    border: 1px solid #1b2330;
-    border-radius: 10px;
-    padding: 0.75rem 1rem;
-    margin-bottom: 0.5rem;
-    box-shadow: 0 0 18px rgba(0,0,0,0.25);
-  }}
-  .badge {{
-    display: inline-block;
-    padding: 0.15rem 0.45rem;
-    border-radius: 999px;
-    font-size: 0.75rem;
-    margin-top: 0.35rem;
-    margin-right: 0.35rem;
-  }}
-  .badge-active {{
-    background: #43e18c;
-    color: #05131d;
-    font-weight: 600;
-  }}
-  .badge-muted {{
-    background: rgba(90, 111, 146, 0.6);
-    color: #d4ddf2;
-  }}
-  .model-banner {{
-    background: rgba(67, 225, 140, 0.12);
-    border: 1px solid rgba(67, 225, 140, 0.35);
-    color: #7bf3a3;
-    padding: 0.5rem 0.75rem;
-    border-radius: 8px;
-    margin-bottom: 0.75rem;
-    font-size: 0.92rem;
-    box-shadow: 0 0 20px rgba(0,0,0,0.25);
-  }}
-</style>
-"""
-st.markdown(DARK_CSS, unsafe_allow_html=True)
+# Dark futuristic style with gentle fades + custom imagery; built once per process (src/ui/theme.py)
+st.markdown(theme_css(bool(st.get_option("server.enableStaticServing"))), unsafe_allow_html=True)
 
 st.title("🧙 AI Dungeon Master — Hybrid Prototype")
 st.caption("Local model: intent/monster logic; Gemini: narration only.")
 
-if "game_state" not in st.session_state:
-	st.session_state.game_state = GameState()
-	st.session_state.started = False
-	st.session_state.ended = False
-	st.session_state.num_players = 1
-	st.session_state.player_names = []
+def _open_session(session_id: str) -> None:
+	# Rebuild the game from its journal when the browser session died (reload, server restart)
+	st.query_params["session"] = session_id
+	resumed = resume(session_id)
+	game_state, meta = resumed if resumed else (GameState(), {})
+	st.session_state.game_state = game_state
+	st.session_state.journal = SessionJournal(session_id)
+	st.session_state.started = bool(meta.get("started"))
+	st.session_state.ended = bool(meta.get("ended"))
+	st.session_state.num_players = len(game_state.players) if resumed else 1
+	st.session_state.player_names = [p.name for p in game_state.players] if resumed else []
 	st.session_state.last_panel = None
-	st.session_state.active_player_idx = 0
+	st.session_state.active_player_idx = (int(meta.get("last_actor", -1)) + 1) % max(1, len(game_state.players))
+
+
+if "game_state" not in st.session_state:
+	requested = st.query_params.get("session")
+	_open_session(requested if is_valid_session_id(requested) else new_session_id())
 
 state: GameState = st.session_state.game_state
-session = GameSession(state)
+# The session outlives reruns so narrations still in flight can land in the log
+session = st.session_state.get("session")
+if session is None or session.state is not state:
+	session = GameSession(state, journal=st.session_state.get("journal"))
+	st.session_state.session = session
+if "speculator" not in st.session_state:
+	st.session_state.speculator = Speculator()
+if "log_view" not in st.session_state:
+	st.session_state.log_view = LogView()
+	st.session_state.log_pages = 0
+session.poll_narration()
 
 with st.sidebar:
 	st.header("Party & World")
@@ -146,6 +77,13 @@ with st.sidebar:
 	else:
 		st.write("(no rolls)")
 
+	speculative = st.toggle("⚡ Speculative narration", value=SPECULATION_ENABLED, help="Pre-play likely quick actions while you read, so picking one answers instantly.")
+	if speculative:
+		session.speculator = st.session_state.speculator
+	elif session.speculator is not None:
+		session.speculator.cancel()
+		session.speculator = None
+
 	st.markdown("---")
 	st.subheader("Local Model Outputs")
 	panel = st.session_state.get('last_panel')
@@ -181,6 +119,16 @@ with st.container():
 		st.session_state.player_names = new_names
 	with col2:
 		if st.button("Start Game", type="primary"):
+			if st.session_state.started or state.log:
+				# A new game gets its own session id and journal, so history and transcripts never mix two games
+				num_players, player_names = st.session_state.num_players, list(st.session_state.player_names)
+				if st.session_state.get("journal") is not None:
+					st.session_state.journal.close()
+				_open_session(new_session_id())
+				st.session_state.num_players, st.session_state.player_names = num_players, player_names
+				state = st.session_state.game_state
+				session = GameSession(state, journal=st.session_state.journal)
+				st.session_state.session = session
 			state.reset(num_players=st.session_state.num_players)
 			state.world.story_seed = seed
 			# Set player names
@@ -192,6 +140,7 @@ with st.container():
 			st.session_state.active_player_idx = 0
 			party_names = ", ".join(p.name for p in state.players)
 			session.append_log("DM", f"{party_names} gather as dusk falls over the old road. A cold wind hints at secrets beyond the village.")
+			session.begin()
 			st.rerun()
 
 st.markdown("---")
@@ -220,19 +169,41 @@ with left:
 			format_func=_format,
 		)
 		st.session_state.active_player_idx = selected
-	log_box = st.container()
-	with log_box:
-		st.markdown('<div class="panel story-log story-bg">', unsafe_allow_html=True)
+	# While narration is in flight only this fragment reruns, so streamed tokens appear as they arrive
+	polling = session.has_pending_narration()
+
+	def _page_log(step: int) -> None:
+		st.session_state.log_pages = st.session_state.log_pages + 1 if step else 0
+
+	@st.fragment(run_every=0.2 if polling else None)
+	def _story_log():
+		# A settled narration changes the whole page (sidebar, panel), so hand back to a full rerun
+		if polling and (session.poll_narration() or not session.has_pending_narration()):
+			st.rerun()
+		streaming = session.streaming_narration()
 		if not session.story_log:
 			st.info("Press Start Game to begin.")
 		else:
-			for entry in session.story_log:
-				st.markdown(f"<div class='fade-in'>{entry}</div>", unsafe_allow_html=True)
-		st.markdown("</div>", unsafe_allow_html=True)
+			log_view: LogView = st.session_state.log_view
+			# Pager clicks rerun only this fragment
+			pager = st.columns(2)
+			hidden = log_view.first_shown(len(session.story_log), st.session_state.log_pages)
+			if hidden:
+				pager[0].button(f"⬆️ Load older ({hidden} hidden)", key="log_older", on_click=_page_log, args=(1,))
+			if st.session_state.log_pages:
+				pager[1].button("⬇️ Latest only", key="log_latest", on_click=_page_log, args=(0,))
+			# One element for the visible window; full older pages come from the view's HTML cache
+			body, _ = log_view.render(session.story_log, st.session_state.log_pages, streaming)
+			st.markdown(f'<div class="panel story-log story-bg"><div>{body}</div></div>', unsafe_allow_html=True)
+		if session.has_pending_narration() and not streaming:
+			st.caption("🪶 The DM is still weaving this scene…")
+
+	with st.container():
+		_story_log()
 
 	# Quick actions
 	st.markdown("Quick Actions")
-	qa1, qa2, qa3, qa4, qa5 = st.columns(5)
+	quick_cols = st.columns(len(QUICK_ACTIONS))
 	def submit_action(text: str):
 		if not st.session_state.started or st.session_state.ended:
 			return
@@ -254,16 +225,9 @@ with left:
 		if not st.session_state.ended and state.players:
 			st.session_state.active_player_idx = (idx + 1) % len(state.players)
 		st.rerun()
-	with qa1:
-		st.button("⚔️ Attack", on_click=lambda: submit_action("attack the threat"))
-	with qa2:
-		st.button("🧭 Explore", on_click=lambda: submit_action("explore the area"))
-	with qa3:
-		st.button("🗣️ Talk", on_click=lambda: submit_action("talk to the nearest NPC"))
-	with qa4:
-		st.button("🎒 Inventory", on_click=lambda: submit_action("check inventory"))
-	with qa5:
-		st.button("🏃 Run", on_click=lambda: submit_action("flee back to safety"))
+	for col, (label, action_text) in zip(quick_cols, QUICK_ACTIONS):
+		with col:
+			st.button(label, on_click=submit_action, args=(action_text,))
 
 	# Free-form input
 	col_in1, col_in2 = st.columns([5, 1])
@@ -319,19 +283,88 @@ with right:
 		monster_card_shown = True
 	if not monster_card_shown and panel:
 		st.markdown("<div class='card stats-card'><strong>Monster Behavior</strong><br/><span class='hint'>(no active encounter)</span></div>", unsafe_allow_html=True)
+	# Only evaluated when the panel renders (NumPy forward pass, cached per observation)
+	dm_policy = load_policy() if panel else None
+	if dm_policy is not None:
+		dm_intent = dm_policy.intent(state.world.location, state.world.danger_level, state.world.flags)
+		st.markdown("<div class='card stats-card'><strong>DM Policy (PPO)</strong><br/><span class='hint'>Next: {}</span></div>".format(dm_intent), unsafe_allow_html=True)
 
 	st.markdown("---")
 	st.markdown("**Controls**")
 	colA, colB = st.columns(2)
 	with colA:
 		if st.button("🔁 Restart"):
-			st.session_state.game_state = GameState()
-			st.session_state.started = False
-			st.session_state.ended = False
-			st.session_state.last_panel = None
+			if st.session_state.get("journal") is not None:
+				st.session_state.journal.close()
+			_open_session(new_session_id())
 			st.rerun()
 	with colB:
 		st.write(f"Turn: {state.world.turn}")
 		st.write(f"Flags: {state.world.flags}")
+		if panel.get('state_changes') is not None:
+			changed = ", ".join(panel['state_changes']) or "nothing"
+			st.caption(f"State v{panel.get('state_version', 0)} — changed: {changed}")
+		narration = narrator_stats()
+		if narration["submitted"]:
+			st.caption(f"Narration: {narration['on_time']} on time, {narration['timeouts']} fell back ({narration['late']} late)")
+		llm = get_client()
+		if llm is not None:
+			m = llm.metrics()
+			st.caption(f"LLM {m['backend']}: {m['in_flight']}/{m['max_concurrency']} in flight, {m['retries']} retries, breaker {m['breaker']['state']}")
+		if session.speculator is not None:
+			spec = session.speculator.snapshot()
+			instant = " — last reply was pre-played ⚡" if panel.get("speculative") else ""
+			st.caption(f"Speculation: {spec['hits']}/{spec['launched']} used, {spec['wasted']} wasted ({spec['wasted_s']:.1f}s), top {spec['top_k']}{instant}")
+
+	if st.toggle("⏱️ Phase timings", key="show_timings", help="Where each turn's time went: models, engine, narration, journal and the rerun that drew it."):
+		timings = session.timings
+		last = panel.get("timings") or timings.last
+		if last is None:
+			st.caption("(no turns timed yet)")
+		else:
+			summary = timings.percentiles()
+			rows = ["| phase | last ms | p50 | p95 | p99 |", "|---|---:|---:|---:|---:|"]
+			for name in [n for n in PHASES if n in summary] + ["total"]:
+				# The rerun drawing this turn is still running, so its own render time comes next run
+				ms = last["phases"].get(name) if name != "total" else last["total_ms"]
+				p = summary[name]
+				rows.append(f"| {name} | {'…' if ms is None else f'{ms:.1f}'} | {p['p50']:.1f} | {p['p95']:.1f} | {p['p99']:.1f} |")
+			st.markdown("\n".join(rows))
+			st.caption(f"Over the last {len(timings.records)} turns of this session")
+			st.download_button("⬇️ Timings (JSONL)", data=timings.to_jsonl(), file_name="turn_timings.jsonl", mime="application/x-ndjson")
+
+	transcript_controls(
+		session.story_log,
+		os.path.join(JOURNAL_DIR, st.query_params.get("session", "local"), "exports"),
+		journal=st.session_state.get("journal"),
+		title="AI Dungeon Master",
+	)
+	if st.session_state.started:
+		# Serialized only when clicked, not on every rerun
+		st.download_button("💾 Save game", data=lambda: savefile.dumps(state), file_name=f"game{savefile.SAVE_EXT}", mime="application/octet-stream")
+	uploaded = st.file_uploader("Load game", type=[savefile.SAVE_EXT.lstrip(".")])
+	if uploaded is not None and st.session_state.get("loaded_save") != uploaded.file_id:
+		try:
+			loaded = savefile.loads(uploaded.getvalue())
+		except savefile.SaveFormatError as e:
+			st.error(f"Could not load save: {e}")
+		else:
+			st.session_state.loaded_save = uploaded.file_id
+			if st.session_state.get("journal") is not None:
+				st.session_state.journal.close()
+			_open_session(new_session_id())
+			st.session_state.game_state = loaded
+			st.session_state.started = True
+			st.session_state.num_players = len(loaded.players)
+			st.session_state.player_names = [p.name for p in loaded.players]
+			GameSession(loaded, journal=st.session_state.journal).begin()
+			st.rerun()
 
+# This run displayed the latest turn: its duration is that turn's "render" phase
+last_timing = session.timings.last
+if last_timing is not None and "render" not in last_timing["phases"]:
+	session.timings.add_render((time.perf_counter() - _RUN_START) * 1000)
 
+# Idle time while the player reads: pre-play the likely next quick actions
+if st.session_state.started and not st.session_state.ended:
+	session.speculate(st.session_state.active_player_idx)
@@ -0,0 +1,193 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+	from PIL import Image
+except Exception:
+	Image = None
+
+
+UI_DIR = Path(__file__).resolve().parent
+STATIC_DIR = UI_DIR / "static"
+THEME_DIR = STATIC_DIR / "theme"  # generated; served at app/static/theme/ when static serving is on
+MANIFEST = THEME_DIR / "manifest.json"
+# Served URL prefix for files under STATIC_DIR (Streamlit's server.enableStaticServing)
+STATIC_URL = "app/static"
+
+# Both wallpapers sit under an 80-90% dark gradient, so they survive heavy downscaling and
+# compression: asset -> (source file next to this module, max width in px)
+THEME_IMAGES: Dict[str, Tuple[str, int]] = {
+	"main_bg": ("wp2770223-dd-wallpaper.jpg", int(os.environ.get("THEME_MAX_WIDTH", "1280"))),
+	"stats_bg": ("wp2770226-dd-wallpaper.jpg", 640),  # only behind the story panel and stat cards
+}
+THEME_JPEG_QUALITY = int(os.environ.get("THEME_JPEG_QUALITY", "55"))
+
+_BUILD_LOCK = threading.Lock()
+
+
+def _compress(data: bytes, max_width: int) -> bytes:
+	if Image is None:
+		return data
+	with Image.open(io.BytesIO(data)) as im:
+		im = im.convert("RGB")
+		if im.width > max_width:
+			im = im.resize((max_width, round(im.height * max_width / im.width)), Image.LANCZOS)
+		out = io.BytesIO()
+		im.save(out, "JPEG", quality=THEME_JPEG_QUALITY, optimize=True, progressive=True)
+	return out.getvalue() if out.tell() < len(data) else data
+
+
+def build_assets(force: bool = False) -> Dict[str, str]:
+	"""Resize and compress the theme images once; returns {asset: file name under THEME_DIR}.
+
+	Outputs are named by a hash of source and settings, so a changed wallpaper or
+	quality setting produces a new file and browsers never see a stale one.
+	"""
+	with _BUILD_LOCK:
+		manifest: Dict[str, Dict[str, str]] = {}
+		if MANIFEST.exists() and not force:
+			try:
+				manifest = json.loads(MANIFEST.read_text())
+			except ValueError:
+				manifest = {}
+		files: Dict[str, str] = {}
+		changed = False
+		for name, (source, max_width) in THEME_IMAGES.items():
+			src = UI_DIR / source
+			if not src.exists():
+				continue
+			data = src.read_bytes()
+			key = hashlib.sha1(data + f"{max_width}:{THEME_JPEG_QUALITY}:{Image is not None}".encode()).hexdigest()[:12]
+			entry = manifest.get(name)
+			if entry and entry.get("key") == key and (THEME_DIR / entry["file"]).exists():
+				files[name] = entry["file"]
+				continue
+			THEME_DIR.mkdir(parents=True, exist_ok=True)
+			out_name = f"{name}.{key}.jpg"
+			(THEME_DIR / out_name).write_bytes(_compress(data, max_width))
+			if entry and entry.get("file") != out_name:
+				(THEME_DIR / entry["file"]).unlink(missing_ok=True)
+			manifest[name] = {"key": key, "file": out_name, "source": source}
+			files[name] = out_name
+			changed = True
+		if changed:
+			MANIFEST.write_text(json.dumps(manifest, indent=2))
+		return files
+
+
+@lru_cache(maxsize=None)
+def asset_url(name: str, static_serving: bool) -> Optional[str]:
+	"""URL for a built asset: a static path when served, else a (compressed) data URI."""
+	files = build_assets()
+	if name not in files:
+		return None
+	if static_serving:
+		return f"{STATIC_URL}/theme/{files[name]}"
+	encoded = base64.b64encode((THEME_DIR / files[name]).read_bytes()).decode("ascii")
+	return f"data:image/jpeg;base64,{encoded}"
+
+
+THEME_CSS = """
+<style>
+  .stApp {{
+    background-image:
+      linear-gradient(135deg, rgba(5,7,11,0.88), rgba(7,10,16,0.92)),
+      url("{main_bg}");
+    background-size: cover;
+    background-attachment: fixed;
+    background-position: center;
+    color: #e0e6ef;
+  }}
+  .block-container {{ padding-top: 1.25rem; }}
+  .panel {{
+    background: rgba(12, 15, 22, 0.82);
+    border: 1px solid #1f2530;
+    border-radius: 10px;
+    padding: 0.75rem 1rem;
+    box-shadow: 0 0 24px rgba(0,0,0,0.35);
+    backdrop-filter: blur(2px);
+  }}
+  .story-bg {{
+    background-image:
+      linear-gradient(135deg, rgba(9,12,18,0.88), rgba(10,14,21,0.75)),
+      url("{stats_bg}");
+    background-size: cover;
+    background-position: center;
+  }}
+  /* column-reverse keeps the scroll position pinned to the newest entry */
+  .story-log {{ max-height: 60vh; overflow-y: auto; display: flex; flex-direction: column-reverse; }}
+  .fade-in {{ animation: fadeIn 350ms ease-out; }}
+  @keyframes fadeIn {{
+    from {{ opacity: 0; transform: translateY(4px); }}
+    to {{ opacity: 1; transform: translateY(0); }}
+  }}
+  .card {{
+    border: 1px solid #263043;
+    border-radius: 8px;
+    padding: 0.5rem 0.75rem;
+    margin-bottom: 0.5rem;
+    background: rgba(16, 20, 30, 0.82);
+    backdrop-filter: blur(2px);
+  }}
+  .stats-card {{
+    background-image:
+      linear-gradient(180deg, rgba(7,10,16,0.82), rgba(6,9,14,0.92)),
+      url("{stats_bg}");
+    background-size: cover;
+    background-position: center;
+    color: #dfe6f7;
+    box-shadow: 0 0 20px rgba(0,0,0,0.3);
+  }}
+  .accent {{ color: #6ad0ff; }}
+  .hint {{ color: #b8c7e0; font-size: 0.9rem; }}
+  .top-scene {{
+    background: linear-gradient(135deg, rgba(16,20,30,0.88), rgba(8,12,20,0.88));
+    border: 1px solid #1b2330;
+    border-radius: 10px;
+    padding: 0.75rem 1rem;
+    margin-bottom: 0.5rem;
+    box-shadow: 0 0 18px rgba(0,0,0,0.25);
+  }}
+  .badge {{
+    display: inline-block;
+    padding: 0.15rem 0.45rem;
+    border-radius: 999px;
+    font-size: 0.75rem;
+    margin-top: 0.35rem;
+    margin-right: 0.35rem;
+  }}
+  .badge-active {{
+    background: #43e18c;
+    color: #05131d;
+    font-weight: 600;
+  }}
+  .badge-muted {{
+    background: rgba(90, 111, 146, 0.6);
+    color: #d4ddf2;
+  }}
+  .model-banner {{
+    background: rgba(67, 225, 140, 0.12);
+    border: 1px solid rgba(67, 225, 140, 0.35);
+    color: #7bf3a3;
+    padding: 0.5rem 0.75rem;
+    border-radius: 8px;
+    margin-bottom: 0.75rem;
+    font-size: 0.92rem;
+    box-shadow: 0 0 20px rgba(0,0,0,0.25);
+  }}
+</style>
+"""
+
+
+@lru_cache(maxsize=None)
+def theme_css(static_serving: bool = False) -> str:
+	"""The app stylesheet, generated once per process (and serving mode)."""
+	# A missing image leaves an empty url(""), which browsers ignore
+	return THEME_CSS.format(**{name: asset_url(name, static_serving) or "" for name in THEME_IMAGES})
@@ -0,0 +1,50 @@
+import os
+from typing import Optional, Sequence
+
+import streamlit as st
+
+from src.game.journal import SessionJournal
+from src.game.transcript import EXPORT_FORMATS, TranscriptExport, export_transcript
+
+
+# Larger exports stay on disk (path shown) instead of being loaded for a browser download
+TRANSCRIPT_DOWNLOAD_MAX_MB = float(os.environ.get("TRANSCRIPT_DOWNLOAD_MAX_MB", "25"))
+MIME_TYPES = {"jsonl": "application/x-ndjson", "html": "text/html"}
+
+
+def transcript_controls(log: Sequence[str], export_dir: str, journal: Optional[SessionJournal] = None, title: str = "Transcript", key: str = "transcript") -> None:
+	"""Export buttons, then progress and download of the latest background export."""
+	cols = st.columns(len(EXPORT_FORMATS))
+	for col, fmt in zip(cols, EXPORT_FORMATS):
+		if col.button(f"📜 Export {fmt.upper()}", key=f"{key}_{fmt}", disabled=not log):
+			path = os.path.join(export_dir, f"transcript.{fmt}")
+			st.session_state[key] = export_transcript(path, fmt, log, journal=journal, title=title)
+	export: Optional[TranscriptExport] = st.session_state.get(key)
+	if export is None:
+		return
+	running = not export.done
+
+	@st.fragment(run_every=0.5 if running else None)
+	def _status():
+		if not export.done:
+			st.caption(f"Writing {export.fmt.upper()} in the background… {export.written / 1024:.0f} KB")
+			return
+		if running:
+			st.rerun()  # stop polling
+		if export.error:
+			st.error(f"Transcript export failed: {export.error}")
+			return
+		size_mb = os.path.getsize(export.path) / 1e6
+		if size_mb > TRANSCRIPT_DOWNLOAD_MAX_MB:
+			st.caption(f"Transcript saved to `{export.path}` ({size_mb:.1f} MB)")
+			return
+		with open(export.path, "rb") as f:
+			st.download_button(
+				f"⬇️ transcript.{export.fmt} ({max(1.0, size_mb * 1000):.0f} KB)",
+				data=f.read(),
+				file_name=os.path.basename(export.path),
+				mime=MIME_TYPES[export.fmt],
+				key=f"{key}_download",
+			)
+
+	_status()
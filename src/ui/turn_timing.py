@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+
+# Turns kept in memory per session for the Model Panel and the JSONL download
+TURN_TIMING_HISTORY = int(os.environ.get("TURN_TIMING_HISTORY", "500"))
+# When set, every turn's timings are also appended to this JSONL file (all sessions)
+TURN_TIMINGS_PATH = os.environ.get("TURN_TIMINGS_PATH")
+
+# Display order; "render" is the Streamlit rerun that shows the turn, added afterwards by the app
+PHASES = ("speculation", "state", "intent", "monster", "engine", "narration", "predictions", "journal", "apply", "render")
+
+_FILE_LOCK = threading.Lock()
+
+
+class TurnTimer:
+	"""Wall-clock milliseconds spent in each phase of one turn."""
+
+	def __init__(self):
+		self.start = time.perf_counter()
+		self.phases: Dict[str, float] = {}
+
+	@contextmanager
+	def phase(self, name: str) -> Iterator[None]:
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - start) * 1000.0
+
+	def elapsed_ms(self) -> float:
+		return (time.perf_counter() - self.start) * 1000.0
+
+
+def phase(timer: Optional[TurnTimer], name: str):
+	"""`timer.phase(name)`, or a no-op when the caller is not timing."""
+	return timer.phase(name) if timer is not None else nullcontext()
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+	if not sorted_values:
+		return 0.0
+	return sorted_values[min(len(sorted_values) - 1, int(p / 100.0 * len(sorted_values)))]
+
+
+class TurnTimings:
+	"""Bounded per-session history of turn timings, exportable as JSONL.
+
+	A record is written to `path` only once it is final: when the next turn
+	starts or its render time is added, so the file never holds a turn
+	twice.
+	"""
+
+	def __init__(self, history: int = TURN_TIMING_HISTORY, path: Optional[str] = TURN_TIMINGS_PATH):
+		self.records: Deque[Dict[str, Any]] = deque(maxlen=max(1, history))
+		self.path = path
+		self._unwritten: Optional[Dict[str, Any]] = None
+
+	def add(self, timer: TurnTimer, **meta: Any) -> Dict[str, Any]:
+		self._write_pending()
+		phases = {name: round(ms, 3) for name, ms in timer.phases.items()}
+		record = {"ts": round(time.time(), 3), **meta, "total_ms": round(timer.elapsed_ms(), 3), "phases": phases}
+		self.records.append(record)
+		self._unwritten = record
+		return record
+
+	def add_render(self, ms: float) -> None:
+		"""Attach the duration of the rerun that displayed the latest turn."""
+		if self._unwritten is None:
+			return
+		self._unwritten["phases"]["render"] = round(ms, 3)
+		self._unwritten["total_ms"] = round(self._unwritten["total_ms"] + ms, 3)
+		self._write_pending()
+
+	def flush(self) -> None:
+		"""Write the latest turn now instead of waiting for its render time (e.g. before dropping the session)."""
+		self._write_pending()
+
+	def _write_pending(self) -> None:
+		record, self._unwritten = self._unwritten, None
+		if record is None or not self.path:
+			return
+		line = json.dumps(record) + "\n"
+		with _FILE_LOCK:
+			os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+			with open(self.path, "a", encoding="utf-8") as f:
+				f.write(line)
+
+	@property
+	def last(self) -> Optional[Dict[str, Any]]:
+		return self.records[-1] if self.records else None
+
+	def to_jsonl(self) -> str:
+		return "".join(json.dumps(record) + "\n" for record in self.records)
+
+	def percentiles(self, ps=(50, 95, 99)) -> Dict[str, Dict[str, float]]:
+		"""{phase: {"p50": ms, ...}} over the kept history, plus "total"."""
+		series: Dict[str, List[float]] = {}
+		for record in self.records:
+			for name, ms in record["phases"].items():
+				series.setdefault(name, []).append(ms)
+			series.setdefault("total", []).append(record["total_ms"])
+		ordered = [name for name in PHASES if name in series] + [name for name in series if name not in PHASES]
+		return {name: {f"p{p}": _percentile(sorted(series[name]), p) for p in ps} for name in ordered}
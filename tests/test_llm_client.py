@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from src.ai.llm_client import CircuitBreaker, CircuitOpenError, LLMClient, TransientLLMError
+
+
+class FlakyBackend:
+    name = "flaky"
+
+    def __init__(self):
+        self.fail = True
+
+    def generate(self, prompt, timeout, system=None):
+        if self.fail:
+            raise TransientLLMError("down")
+        return "ok"
+
+    def stream(self, prompt, timeout, system=None):
+        if self.fail:
+            raise TransientLLMError("down")
+        yield "first "
+        yield "second"
+
+
+def test_abandoned_half_open_stream_does_not_wedge_the_breaker():
+    backend = FlakyBackend()
+    client = LLMClient(backend, max_retries=0, breaker=CircuitBreaker(threshold=1, cooldown=0.05))
+    with pytest.raises(TransientLLMError):
+        client.generate("p")
+    assert client.breaker.state == "open"
+
+    time.sleep(0.06)
+    backend.fail = False
+    stream = client.stream("p")
+    assert next(stream) == "first "
+    assert client.breaker.state == "half_open"
+    stream.close()  # the consumer stops reading mid-trial
+
+    assert "".join(client.stream("p")) == "first second"
+    assert client.breaker.state == "closed"
+    assert client.metrics()["in_flight"] == 0
+
+
+def test_open_breaker_still_rejects_before_the_cooldown():
+    client = LLMClient(FlakyBackend(), max_retries=0, breaker=CircuitBreaker(threshold=1, cooldown=60))
+    with pytest.raises(TransientLLMError):
+        client.generate("p")
+    with pytest.raises(CircuitOpenError):
+        "".join(client.stream("p"))
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.server.api import APIError
+from src.server.store import SessionStore
+
+
+def test_evicted_session_round_trips_through_sqlite_off_the_loop(monkeypatch):
+    async def scenario():
+        store = SessionStore(":memory:", hot_capacity=1)
+        loop_thread = threading.get_ident()
+        threads = set()
+        write, read = store._write, store._read
+
+        def spy(fn):
+            def wrapped(*args):
+                threads.add(threading.get_ident())
+                return fn(*args)
+            return wrapped
+
+        monkeypatch.setattr(store, "_write", spy(write))
+        monkeypatch.setattr(store, "_read", spy(read))
+        first = await store.create(2, ["Ann", "Bo"], "seed")
+        await store.create(1, ["Cy"])
+        # The second create pushed the first out; it is found again while or after it is written
+        again = await store.get(first.id)
+        assert again is not first and first.evicted
+        assert [p.name for p in again.game.state.players] == ["Ann", "Bo"]
+        assert store.stats["rehydrated"] == 1 and len(store) == 2
+        await store.close()
+        assert threads and loop_thread not in threads
+
+    asyncio.run(scenario())
+
+
+def test_corrupt_cold_row_is_dropped_and_counted_as_a_miss():
+    async def scenario():
+        store = SessionStore(":memory:", hot_capacity=1)
+        session = await store.create(1, ["Ann"])
+        assert await store.sweep(now=session.last_used + store.idle_s) == 1
+        store._io.submit(store._db.execute, "UPDATE sessions SET state = ?", (b"DMSV garbage",)).result()
+        with pytest.raises(APIError) as exc:
+            await store.get(session.id)
+        assert exc.value.status == 404
+        assert store.stats["misses"] == 1 and store.cold_count == 0
+        (rows,) = store._io.submit(lambda: store._db.execute("SELECT COUNT(*) FROM sessions").fetchone()).result()
+        assert rows == 0
+        await store.close()
+
+    asyncio.run(scenario())
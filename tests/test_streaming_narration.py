@@ -0,0 +1,44 @@
+import html
+import time
+
+from src.ai.narration_cache import NarrationCache
+from src.game.state import GameState
+from src.ui import gemini_client, gemini_fallback
+from src.ui.game_session import GameSession
+from src.ui.log_view import LogView
+
+
+def test_fake_backend_streams_partial_then_final_text_into_the_story_log(monkeypatch):
+    monkeypatch.setenv("NARRATION_BACKEND", "fake")
+    monkeypatch.setattr(gemini_fallback, "FAKE_FIRST_TOKEN_S", 0.05)
+    monkeypatch.setattr(gemini_fallback, "FAKE_TOKEN_S", 0.05)
+    fresh = NarrationCache(disk_dir=None)
+    monkeypatch.setattr(gemini_client, "get_cache", lambda: fresh)
+
+    state = GameState()
+    state.reset(num_players=1)
+    game = GameSession(state, narration_budget=2.0)
+    fallback, _ = game.handle_player_action(0, "look around")
+    assert game.has_pending_narration()
+    pending = game.pending[0]
+    index = pending.log_index
+    assert game.story_log[index] == f"DM: {fallback}"
+
+    view = LogView()
+    partials = []
+    deadline = time.monotonic() + 10
+    while game.has_pending_narration() and time.monotonic() < deadline:
+        streaming = game.streaming_narration()
+        if index in streaming and streaming[index] not in partials:
+            partials.append(streaming[index])
+            body, _ = view.render(game.story_log, streaming=streaming)
+            assert html.escape(streaming[index]) + "▌" in body
+        if game.poll_narration():
+            break
+        time.sleep(0.01)
+
+    final = game.story_log[index]
+    assert final == f"DM: {pending.partial.strip()}"
+    assert partials, "no partial narration was shown before the final text"
+    assert partials[0] != final and final.startswith(partials[0].rstrip())
+    assert not game.streaming_narration()